@@ -0,0 +1,270 @@
+"""
+Benchmark suite for the rasterizer. A fixed set of scenes (line fans, random triangles, thin slivers and huge
+triangles) is drawn through SketchBase in flat, smooth and texture mode, at several anti-aliasing levels and canvas
+sizes. Every run reports triangles/s and Mpixels/s, and compares its image pixel by pixel with a golden image saved by
+an earlier run. The report is written as JSON, so runs of different commits can be compared.
+First version Created on 10/18/2026
+
+Golden images of all scenes, modes and anti-aliasing levels at 256x256 are kept in the golden directory next to this
+file, for the scanline and the edge triangle engine with super sampled lines.
+
+Usage::
+
+    python Benchmark.py                                          # golden differences are listed
+    python Benchmark.py --engine edge --report bench.json
+    python Benchmark.py --sizes 256x256 1024x1024 --repeat 3     # larger sizes have no golden images
+    python Benchmark.py --update-golden                          # only when a change of the output is intended
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+from Point import Point
+from ColorType import ColorType
+from HeadlessSketch import HeadlessSketch
+
+try:
+    # From pip package "Pillow"
+    from PIL import Image
+except Exception:
+    print("Need to install PIL package. Pip package name is Pillow")
+    raise ImportError
+
+
+class Benchmark:
+    """
+    Scenes are lists of primitives, each primitive is a list of two Points for a line or three Points for a triangle.
+    They are generated from a fixed seed and scaled to the canvas, so the same arguments always draw the same image.
+    """
+
+    scenes = ["lineFan", "randomTriangles", "slivers", "hugeTriangles"]
+    modes = ["flat", "smooth", "texture"]
+    goldenDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+    @staticmethod
+    def makeScene(scene: str, width: int, height: int, seed: int = 0):
+        """
+        Generate the primitives of a scene for a width x height canvas
+
+        :param scene: one of Benchmark.scenes
+        :type scene: str
+        :param width: canvas width
+        :type width: int
+        :param height: canvas height
+        :type height: int
+        :param seed: random seed
+        :type seed: int
+        :rtype: list[list[Point]]
+        """
+        rng = np.random.default_rng(seed)
+
+        def point(x, y):
+            return Point((int(x), int(y)), ColorType(*rng.random(3)))
+
+        cx, cy = width // 2, height // 2
+        if scene == "lineFan":
+            radius = min(width, height) * 0.45
+            angles = np.linspace(0, 2 * np.pi, 512, endpoint=False)
+            return [[point(cx, cy), point(cx + np.sin(a) * radius, cy + np.cos(a) * radius)] for a in angles]
+        if scene == "randomTriangles":
+            # triangles of up to a tenth of the canvas, all inside it
+            size = min(width, height) // 10
+            centers = rng.integers([size, size], [width - size, height - size], (1000, 2))
+            return [[point(*(c + rng.integers(-size, size + 1, 2))) for _ in range(3)] for c in centers]
+        if scene == "slivers":
+            # long triangles one or two pixels wide
+            primitives = []
+            for _ in range(500):
+                x1, x2 = rng.integers(0, width, 2)
+                y1, y2 = rng.integers(0, height - 2, 2)
+                primitives.append([point(x1, y1), point(x2, y2), point(x2, y2 + rng.integers(1, 3))])
+            return primitives
+        if scene == "hugeTriangles":
+            # every triangle covers half the canvas
+            corners = [(0, 0), (width - 1, 0), (width - 1, height - 1), (0, height - 1)]
+            return [[point(*corners[i % 4]), point(*corners[(i + 1) % 4]), point(*corners[(i + 2) % 4])]
+                    for i in range(8)]
+        raise ValueError("Unknown benchmark scene: " + str(scene))
+
+    @staticmethod
+    def draw(sketch: HeadlessSketch, primitives, mode: str, aaLevel: int) -> None:
+        """
+        Draw primitives on sketch.buff with the drawing methods of the sketch
+
+        :param sketch: the sketch to draw with
+        :type sketch: HeadlessSketch
+        :param primitives: lines and triangles from makeScene
+        :type primitives: list[list[Point]]
+        :param mode: one of Benchmark.modes
+        :type mode: str
+        :param aaLevel: super sampling level, anti-aliasing is off for levels below 2
+        :type aaLevel: int
+        :rtype: None
+        """
+        doSmooth = mode != "flat"
+        doAA = aaLevel > 1
+        for primitive in primitives:
+            if len(primitive) == 2:
+                sketch.drawLine(sketch.buff, *primitive, doSmooth, doAA, aaLevel)
+            else:
+                sketch.drawTriangle(sketch.buff, *primitive, doSmooth, doAA, aaLevel, mode == "texture")
+
+    @staticmethod
+    def compareGolden(image: np.ndarray, filename: str):
+        """
+        Compare an image with the golden image in filename pixel by pixel
+
+        :param image: (height, width, 3) image, as given by Buff.getImageArray
+        :type image: numpy.ndarray
+        :param filename: path of the golden PNG
+        :type filename: str
+        :return: status "match", "differs" or "missing", with the number of different pixels, the largest channel \
+        difference and the bounding box [x0, x1, y0, y1) of different pixels in buff coordinates
+        :rtype: dict
+        """
+        if not os.path.isfile(filename):
+            return {"status": "missing"}
+        golden = np.array(Image.open(filename).convert("RGB"))
+        if golden.shape != image.shape:
+            return {"status": "differs", "shape": list(golden.shape)}
+        difference = np.abs(image.astype(np.int16) - golden).max(axis=2)
+        rows, columns = np.nonzero(difference)
+        if len(rows) == 0:
+            return {"status": "match", "pixels": 0}
+        # image rows go from top to bottom
+        height = image.shape[0]
+        return {"status": "differs", "pixels": len(rows), "maxDifference": int(difference.max()),
+                "box": [int(columns.min()), int(columns.max()) + 1,
+                        int(height - 1 - rows.max()), int(height - rows.min())]}
+
+    @staticmethod
+    def run(sizes, scenes=None, modes=None, aaLevels=(1, 2, 4), engine: str = "scanline", repeat: int = 3,
+            goldenDir: str = None, updateGolden: bool = False, diffDir: str = None, lineAAMode: str = "ssaa"):
+        """
+        Run every combination of canvas size, scene, mode and anti-aliasing level. Texture mode is not used for line
+        scenes. The fastest of repeat runs is reported. Golden images are named after scene, mode, level and size,
+        followed by the engine and the line anti-aliasing mode when they are not "scanline" and "ssaa".
+
+        :param sizes: list of (width, height) canvas sizes
+        :type sizes: list
+        :param scenes: scenes to run, all of Benchmark.scenes if None
+        :type scenes: list[str]
+        :param modes: modes to run, all of Benchmark.modes if None
+        :type modes: list[str]
+        :param aaLevels: super sampling levels to run, 1 for no anti-aliasing
+        :type aaLevels: list[int]
+        :param engine: triangle fill engine, "scanline" or "edge"
+        :type engine: str
+        :param repeat: number of runs of each combination
+        :type repeat: int
+        :param goldenDir: directory of the golden PNGs, Benchmark.goldenDir if None
+        :type goldenDir: str
+        :param updateGolden: write the images as new golden PNGs instead of comparing with them
+        :type updateGolden: bool
+        :param diffDir: directory to write an image of the different pixels for each differing run, None to skip
+        :type diffDir: str
+        :param lineAAMode: line anti-aliasing of the sketch, "ssaa" to super sample lines at each level or "wu"
+        :type lineAAMode: str
+        :return: one dict per combination
+        :rtype: list[dict]
+        """
+        goldenDir = goldenDir or Benchmark.goldenDir
+        suffix = "" if engine == "scanline" else "_" + engine
+        suffix += "" if lineAAMode == "ssaa" else "_" + lineAAMode
+        results = []
+        for width, height in sizes:
+            sketch = HeadlessSketch(width, height)
+            sketch.triangleMode = engine
+            sketch.lineAAMode = lineAAMode
+            for scene in scenes or Benchmark.scenes:
+                primitives = Benchmark.makeScene(scene, width, height)
+                for mode in modes or Benchmark.modes:
+                    if mode == "texture" and len(primitives[0]) == 2:
+                        continue
+                    for aaLevel in aaLevels:
+                        seconds = []
+                        for _ in range(repeat):
+                            sketch.clear()
+                            t1 = time.perf_counter()
+                            Benchmark.draw(sketch, primitives, mode, aaLevel)
+                            seconds.append(time.perf_counter() - t1)
+                        best = min(seconds)
+                        image = sketch.buff.getImageArray()
+                        covered = int(image.any(axis=2).sum())
+                        name = "{}_{}_aa{}_{}x{}{}".format(scene, mode, aaLevel, width, height, suffix)
+                        goldenFile = os.path.join(goldenDir, name + ".png")
+                        if updateGolden:
+                            os.makedirs(goldenDir, exist_ok=True)
+                            Image.fromarray(image).save(goldenFile)
+                            golden = {"status": "updated"}
+                        else:
+                            golden = Benchmark.compareGolden(image, goldenFile)
+                        if diffDir is not None and golden["status"] == "differs" and "pixels" in golden:
+                            os.makedirs(diffDir, exist_ok=True)
+                            reference = np.array(Image.open(goldenFile).convert("RGB"))
+                            mask = (image != reference).any(axis=2)
+                            Image.fromarray((mask * 255).astype(np.uint8)).save(os.path.join(diffDir, name + ".png"))
+                        result = {"name": name, "scene": scene, "mode": mode, "aaLevel": aaLevel, "width": width,
+                                  "height": height, "engine": engine, "lineAAMode": lineAAMode, "seconds": best,
+                                  "coveredPixels": covered, "mpixelsPerSecond": covered / best / 1e6,
+                                  "golden": golden}
+                        if len(primitives[0]) == 3:
+                            result["trianglesPerSecond"] = len(primitives) / best
+                        else:
+                            result["linesPerSecond"] = len(primitives) / best
+                        results.append(result)
+        return results
+
+    @staticmethod
+    def environment():
+        """
+        Describe where the benchmark ran: commit, python and numpy versions and machine
+
+        :rtype: dict
+        """
+        try:
+            commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                    cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+        except OSError:
+            commit = None
+        return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+                "machine": platform.machine(), "processor": platform.processor()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the rasterizer and compare it with golden images")
+    parser.add_argument("--sizes", nargs="+", default=["256x256"],
+                        help="canvas sizes as WIDTHxHEIGHT, golden images are kept at 256x256")
+    parser.add_argument("--scenes", nargs="+", choices=Benchmark.scenes, help="scenes to run, all if not given")
+    parser.add_argument("--modes", nargs="+", choices=Benchmark.modes, help="modes to run, all if not given")
+    parser.add_argument("--aa-levels", nargs="+", type=int, default=[1, 2, 4],
+                        help="super sampling levels, 1 for no anti-aliasing")
+    parser.add_argument("--engine", choices=["scanline", "edge"], default="scanline", help="triangle fill engine")
+    parser.add_argument("--line-aa", choices=["ssaa", "wu"], default="ssaa", help="line anti-aliasing mode")
+    parser.add_argument("--repeat", type=int, default=1, help="runs of each combination, the fastest is reported")
+    parser.add_argument("--golden", default=Benchmark.goldenDir, help="directory of the golden images")
+    parser.add_argument("--update-golden", action="store_true", help="save the images as the new golden images")
+    parser.add_argument("--diff", help="directory to write images of different pixels to")
+    parser.add_argument("--report", help="path of the JSON report")
+    args = parser.parse_args()
+
+    canvasSizes = [tuple(int(n) for n in size.split("x")) for size in args.sizes]
+    benchmarkResults = Benchmark.run(canvasSizes, args.scenes, args.modes, args.aa_levels, args.engine, args.repeat,
+                                     args.golden, args.update_golden, args.diff, args.line_aa)
+    for r in benchmarkResults:
+        rate = r.get("trianglesPerSecond", r.get("linesPerSecond"))
+        unit = "triangles/s" if "trianglesPerSecond" in r else "lines/s"
+        golden = r["golden"]["status"]
+        if r["golden"].get("pixels"):
+            golden += " ({} pixels, max {})".format(r["golden"]["pixels"], r["golden"]["maxDifference"])
+        print("{:45s} {:9.1f} ms {:12.0f} {:12s} {:7.2f} Mpixels/s  golden: {}".format(
+            r["name"], r["seconds"] * 1000, rate, unit, r["mpixelsPerSecond"], golden))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"environment": Benchmark.environment(), "results": benchmarkResults}, f, indent=2)
@@ -1,7 +1,16 @@
 """
 Defines Buff class to store canvas data. For a buff with size Width x Height, each entry will store a pixel color.
 Each pixel color will be represented in (R, G, B) format, where R, G, B are unsigned char in range [0, 255].
+The buff array is indexed as buff[x, y]. With rowMajor storage it is a view of a (height, width, 3) C-order array, which
+can be handed to the graphic card without any copy.
 This Buff class has a method to export all data to byte string to feed into graphic card.
+A float32 depth buffer with the same size can be kept alongside the colors, see clearDepth.
+Changed regions are tracked as dirty rectangles, so a display only needs to upload what changed, see markDirty.
+A texture buff keeps a mip pyramid of box filtered halvings for minified lookups, see generateMipmaps.
+With shared storage the pixels live in a multiprocessing.shared_memory block, which other processes can open with
+attachShared and draw into without copying, see view.
+Pixels are views of a backing array, storage, which can be larger than the buff. It grows geometrically when the buff is
+resized past its capacity, so most resizes while dragging a window edge neither allocate nor copy, see resize.
 
 First version Created on 09/27/2018
 
@@ -9,7 +18,10 @@ First version Created on 09/27/2018
 :version: 2021.2.1
 """
 
+import math
+
 import numpy as np
+from multiprocessing import shared_memory
 from typing import Union
 
 from Point import Point
@@ -21,13 +33,24 @@ class Buff:
     Buff class to store canvas color information
     """
     buff = None
+    pixels = None
+    storage = None
+    capacity = None
+    capacityGrowth = 1.5
+    rowMajor = False
+    shared = False
+    sharedMemory = None
+    depth = None
     buffPointArray = None
+    mipmaps = None
+    dirtyRects = None
+    maxDirtyRects = 16
     size = None
     width = None
     height = None
     background_color = None
 
-    def __init__(self, width=0, height=0, color=None):
+    def __init__(self, width=0, height=0, color=None, rowMajor=False, shared=False):
         """
         Use Width and Height to define a buff which has default black color at all entry.
         This default color can be replaced by setting a color as input argument.
@@ -38,6 +61,10 @@ class Buff:
         :type height: int
         :param color: the default color you want to set the buff to
         :type color: ColorType
+        :param rowMajor: store pixels in (height, width, 3) C-order, buff is then a transposed view of pixels
+        :type rowMajor: bool
+        :param shared: store pixels in a new shared memory block, which has to be freed with releaseShared
+        :type shared: bool
         :rtype: None
         """
         # Create a new Buff
@@ -56,7 +83,11 @@ class Buff:
         self.width = width
         self.height = height
         self.size = (width, height)
-        self.buff = np.zeros((self.width, self.height, 3), dtype=np.uint8)
+        self.rowMajor = rowMajor
+        self.shared = shared
+        self._allocate(width, height)
+        self._useStorage(width, height)
+        self.dirtyRects = []
         if isinstance(color, ColorType):
             self.background_color = ColorType(*color.getRGB())
             self.clear()
@@ -77,28 +108,70 @@ class Buff:
         self.buff[:, :, 0] = r
         self.buff[:, :, 1] = g
         self.buff[:, :, 2] = b
+        self.markDirty(0, self.width, 0, self.height)
+        if self.depth is not None:
+            self.depth.fill(np.inf)
+
+    def clearDepth(self):
+        """
+        Reset the depth buffer to be infinitely far away at all entries. The depth buffer is a float32 array with the
+        same width and height as buff. It is only allocated when depth testing is used for the first time.
+
+        :rtype: None
+        """
+        if self.depth is None or self.depth.shape != (self.width, self.height):
+            self.depth = np.empty((self.width, self.height), dtype=np.float32)
+        self.depth.fill(np.inf)
 
     def resize(self, width: int, height: int):
         """
-        Resize current buff to new size, data in buff will be kept as much as possible
+        Resize current buff to new size, data in buff will be kept as much as possible. Pixels which were not in the
+        buff before are black.
+        Within capacity, buff becomes a view of a different part of storage and nothing is copied. A buff resized past
+        its capacity gets a new storage, capacityGrowth times larger than the old one in every direction it outgrew,
+        and the common pixels are copied there. A shared buff always gets a new block of exactly the new size, because
+        the processes attached to it only know its width and height.
 
         :param width: the buff width
         :type width: int
         :param height: the buff height
         :type height: int
         """
-        w_min = min(self.width, width)
-        h_min = min(self.height, height)
-
-        # keep as much common pixels as possible, clip pixels outside canvas
-        tempbuff = self.buff
-        newbuff = np.zeros((width, height, 3), dtype=np.uint8)
-        newbuff[:w_min, :h_min, :] = tempbuff[:w_min, :h_min, :]
+        oldWidth, oldHeight = self.width, self.height
+        capacityWidth, capacityHeight = self.capacity
+        if self.shared or width > capacityWidth or height > capacityHeight:
+            if self.shared:
+                capacityWidth, capacityHeight = width, height
+            if width > capacityWidth:
+                capacityWidth = max(width, math.ceil(capacityWidth * self.capacityGrowth))
+            if height > capacityHeight:
+                capacityHeight = max(height, math.ceil(capacityHeight * self.capacityGrowth))
+            w_min = min(oldWidth, width)
+            h_min = min(oldHeight, height)
+
+            # keep as much common pixels as possible, clip pixels outside canvas
+            tempbuff = self.buff
+            oldMemory = self.sharedMemory
+            self._allocate(capacityWidth, capacityHeight)
+            self._useStorage(width, height)
+            self.buff[:w_min, :h_min, :] = tempbuff[:w_min, :h_min, :]
+            del tempbuff
+            if oldMemory is not None:
+                Buff._closeShared(oldMemory, True)
+        else:
+            self._useStorage(width, height)
+            # storage outside the old size still holds pixels from before an earlier shrink
+            self.buff[oldWidth:] = 0
+            self.buff[:oldWidth, oldHeight:] = 0
 
-        self.buff = newbuff
         self.size = (width, height)
         self.width = width
         self.height = height
+        self.markDirty(0, width, 0, height)
+        if self.depth is not None:
+            # depth of the old frame is meaningless after resize
+            self.clearDepth()
+        self.mipmaps = None
 
     def setBackground(self, color: ColorType) -> None:
         """
@@ -144,8 +217,75 @@ class Buff:
         self.buff[x, y, 0] = r
         self.buff[x, y, 1] = g
         self.buff[x, y, 2] = b
+        self.markDirty(x, x + 1, y, y + 1)
         return True
 
+    def markDirty(self, x0: int, x1: int, y0: int, y1: int) -> None:
+        """
+        Record that pixels in [x0, x1) x [y0, y1) have changed. Code writing to the buff array directly should call
+        this (or markDirtyPixels) after it. Overlapping or touching rectangles are merged, and if there are more than
+        maxDirtyRects of them they are merged into their bounding box.
+
+        :param x0: first changed column
+        :type x0: int
+        :param x1: one past the last changed column
+        :type x1: int
+        :param y0: first changed row
+        :type y0: int
+        :param y1: one past the last changed row
+        :type y1: int
+        :rtype: None
+        """
+        rect = [max(int(x0), 0), min(int(x1), self.width), max(int(y0), 0), min(int(y1), self.height)]
+        if rect[0] >= rect[1] or rect[2] >= rect[3]:
+            return
+        merged = True
+        while merged:
+            merged = False
+            for other in self.dirtyRects:
+                if other[0] <= rect[1] and rect[0] <= other[1] and other[2] <= rect[3] and rect[2] <= other[3]:
+                    self.dirtyRects.remove(other)
+                    rect = [min(rect[0], other[0]), max(rect[1], other[1]),
+                            min(rect[2], other[2]), max(rect[3], other[3])]
+                    merged = True
+                    break
+        self.dirtyRects.append(rect)
+        if len(self.dirtyRects) > self.maxDirtyRects:
+            rects = np.array(self.dirtyRects)
+            self.dirtyRects = [[rects[:, 0].min(), rects[:, 1].max(), rects[:, 2].min(), rects[:, 3].max()]]
+
+    def markDirtyPixels(self, xs, ys) -> None:
+        """
+        Record that the pixels at coordinates xs, ys have changed, by marking their bounding box as dirty
+
+        :param xs: x coordinates of changed pixels
+        :type xs: numpy.ndarray
+        :param ys: y coordinates of changed pixels
+        :type ys: numpy.ndarray
+        :rtype: None
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        if xs.size == 0:
+            return
+        x0, x1, y0, y1 = xs.min(), xs.max() + 1, ys.min(), ys.max() + 1
+        # negative indices wrap around to the other side of the buff
+        if x0 < 0:
+            x0, x1 = 0, self.width
+        if y0 < 0:
+            y0, y1 = 0, self.height
+        self.markDirty(x0, x1, y0, y1)
+
+    def takeDirtyRects(self):
+        """
+        Get all dirty rectangles recorded since the last call as [x0, x1, y0, y1] lists, and mark the buff clean
+
+        :rtype: list
+        """
+        rects = self.dirtyRects
+        self.dirtyRects = []
+        return rects
+
     def getPoint(self, x: int, y: int) -> Union[bool, Point]:
         """
         Get pixel information and return result in Point format
@@ -179,7 +319,10 @@ class Buff:
         :type buffArray: numpy.array(dtype=uint8)
         """
         self._setBuffArray(buffArray)
-        self.generatePointArray()
+        # The Point array is only built if getPointFromPointArray is called, texture lookups should use sampleTexture
+        self.buffPointArray = None
+        # The mip pyramid is only built when a minified lookup needs it
+        self.mipmaps = None
 
     def generatePointArray(self):
         """
@@ -208,6 +351,234 @@ class Buff:
             self.generatePointArray()
         return self.buffPointArray[x][y]
 
+    def generateMipmaps(self):
+        """
+        use current buff to generate a mip pyramid. Level 0 is buff itself, every next level halves width and height
+        of the previous one with a 2x2 box filter, until the last level has a single texel. Each level is a contiguous
+        uint8 array in the same (width, height, 3) layout as buff. For an odd size the last texel row or column is
+        left out of the average.
+        This pyramid won't update with buff. If buff updated, then this function need to be called again
+        This is only recommended to texture buff
+        """
+        level = np.ascontiguousarray(self.buff)
+        self.mipmaps = [level]
+        while level.shape[0] > 1 or level.shape[1] > 1:
+            width = max(level.shape[0] // 2, 1)
+            height = max(level.shape[1] // 2, 1)
+            # a side of length 1 is repeated to keep the 2x2 filter
+            texels = level if level.shape[0] > 1 else np.repeat(level, 2, axis=0)
+            texels = texels if level.shape[1] > 1 else np.repeat(texels, 2, axis=1)
+            texels = texels[:width * 2, :height * 2].astype(np.uint16)
+            texels = (texels[0::2, 0::2] + texels[1::2, 0::2] + texels[0::2, 1::2] + texels[1::2, 1::2] + 2) // 4
+            level = np.ascontiguousarray(texels, dtype=np.uint8)
+            self.mipmaps.append(level)
+
+    def mipmapLevel(self, dudx, dvdx, dudy, dvdy):
+        """
+        Choose a level of detail from screen space derivatives of normalized texture coordinates. The footprint of a
+        screen pixel is measured in texels of level 0, and every doubling of it moves one level down the pyramid.
+
+        :param dudx: derivative of u along screen x
+        :param dvdx: derivative of v along screen x
+        :param dudy: derivative of u along screen y
+        :param dvdy: derivative of v along screen y
+        :return: level of detail, 0 when the texture is magnified
+        :rtype: float or numpy.ndarray
+        """
+        footprint = np.maximum(np.hypot(np.multiply(dudx, self.width), np.multiply(dvdx, self.height)),
+                               np.hypot(np.multiply(dudy, self.width), np.multiply(dvdy, self.height)))
+        with np.errstate(divide="ignore"):
+            return np.maximum(np.log2(footprint), 0)
+
+    def sampleTexture(self, u, v, filterMode: str = "nearest", wrapMode: str = "repeat", lod=None):
+        """
+        Sample this buff as a texture at normalized coordinates, reading straight from the uint8 buff array.
+        (0, 0) is the bottom left corner of the texture and (1, 1) the top right corner. u and v can be scalars or
+        arrays of the same shape, all queries are answered at once.
+        If a level of detail is given, queries are answered from the closest level of the mip pyramid, which is
+        generated the first time it is needed.
+
+        :param u: horizontal texture coordinates
+        :type u: float or numpy.ndarray
+        :param v: vertical texture coordinates
+        :type v: float or numpy.ndarray
+        :param filterMode: "nearest" to take the closest texel, "bilinear" to interpolate the four closest texels
+        :type filterMode: str
+        :param wrapMode: "repeat" to tile the texture, "clamp" to extend its border texels
+        :type wrapMode: str
+        :param lod: level of detail, a scalar or an array with the shape of u, see mipmapLevel. None to sample buff
+        :type lod: float or numpy.ndarray
+        :return: colors with shape u.shape + (3,), e.g. (N, 3) for N queries
+        :rtype: numpy.array[type=uint8]
+        """
+        if lod is None:
+            return self._sampleLevel(self.buff, u, v, filterMode, wrapMode)
+        if self.mipmaps is None:
+            self.generateMipmaps()
+        levels = np.clip(np.floor(np.asarray(lod) + 0.5), 0, len(self.mipmaps) - 1).astype(np.int64)
+        if levels.ndim == 0:
+            return self._sampleLevel(self.mipmaps[levels], u, v, filterMode, wrapMode)
+        u, v, levels = np.broadcast_arrays(u, v, levels)
+        colors = np.empty(levels.shape + (3,), dtype=np.uint8)
+        for level in np.unique(levels):
+            selected = levels == level
+            colors[selected] = self._sampleLevel(self.mipmaps[level], u[selected], v[selected], filterMode, wrapMode)
+        return colors
+
+    @staticmethod
+    def _sampleLevel(texels, u, v, filterMode, wrapMode):
+        """
+        In class usage only
+        """
+        width, height = texels.shape[:2]
+        x = np.asarray(u, dtype=np.float64) * width
+        y = np.asarray(v, dtype=np.float64) * height
+        if filterMode == "nearest":
+            i = Buff._wrapTexel(np.floor(x).astype(np.int64), width, wrapMode)
+            j = Buff._wrapTexel(np.floor(y).astype(np.int64), height, wrapMode)
+            return texels[i, j]
+        if filterMode == "bilinear":
+            # texel centers are at half integers
+            x = x - 0.5
+            y = y - 0.5
+            x0 = np.floor(x)
+            y0 = np.floor(y)
+            fx = (x - x0)[..., None]
+            fy = (y - y0)[..., None]
+            x0 = x0.astype(np.int64)
+            y0 = y0.astype(np.int64)
+            i0 = Buff._wrapTexel(x0, width, wrapMode)
+            i1 = Buff._wrapTexel(x0 + 1, width, wrapMode)
+            j0 = Buff._wrapTexel(y0, height, wrapMode)
+            j1 = Buff._wrapTexel(y0 + 1, height, wrapMode)
+            color = (texels[i0, j0] * ((1 - fx) * (1 - fy)) + texels[i1, j0] * (fx * (1 - fy))
+                     + texels[i0, j1] * ((1 - fx) * fy) + texels[i1, j1] * (fx * fy))
+            return np.rint(color).astype(np.uint8)
+        raise ValueError("Unknown texture filter mode: " + str(filterMode))
+
+    @staticmethod
+    def _wrapTexel(index, size, wrapMode):
+        """
+        In class usage only
+        """
+        if wrapMode == "repeat":
+            return np.mod(index, size)
+        if wrapMode == "clamp":
+            return np.clip(index, 0, size - 1)
+        raise ValueError("Unknown texture wrap mode: " + str(wrapMode))
+
+    def _allocate(self, width, height):
+        """
+        In class usage only. New storage with capacity width x height, pixels are not set up, see _useStorage
+        """
+        if self.shared:
+            self.sharedMemory = shared_memory.SharedMemory(create=True, size=width * height * 3)
+            self._useSharedMemory(width, height)
+            self.buff.fill(0)
+        elif self.rowMajor:
+            self.storage = np.zeros((height, width, 3), dtype=np.uint8)
+        else:
+            self.storage = np.zeros((width, height, 3), dtype=np.uint8)
+        self.capacity = (width, height)
+
+    def _useSharedMemory(self, width, height):
+        """
+        In class usage only
+        """
+        if self.rowMajor:
+            self.storage = np.ndarray((height, width, 3), dtype=np.uint8, buffer=self.sharedMemory.buf)
+        else:
+            self.storage = np.ndarray((width, height, 3), dtype=np.uint8, buffer=self.sharedMemory.buf)
+        self._useStorage(width, height)
+
+    def _useStorage(self, width, height):
+        """
+        In class usage only. Point buff and pixels at the first width x height pixels of storage
+        """
+        if self.rowMajor:
+            self.pixels = self.storage[:height, :width]
+            self.buff = self.pixels.transpose((1, 0, 2))
+        else:
+            self.pixels = None
+            self.buff = self.storage[:width, :height]
+
+    @staticmethod
+    def _closeShared(memory, unlink):
+        """
+        In class usage only
+        """
+        try:
+            memory.close()
+        except BufferError:
+            # views of the block are still alive, the mapping goes away with the last of them
+            pass
+        if unlink:
+            memory.unlink()
+
+    @staticmethod
+    def attachShared(name: str, width: int, height: int, rowMajor: bool = False):
+        """
+        Open the shared memory block of a buff created with shared=True, usually in another process. Both buffs work
+        on the same pixels. The returned buff does not own the block, its releaseShared only closes it.
+
+        :param name: name of the block, sharedMemory.name of the buff that created it
+        :type name: str
+        :param width: width of that buff
+        :type width: int
+        :param height: height of that buff
+        :type height: int
+        :param rowMajor: rowMajor of that buff
+        :type rowMajor: bool
+        :rtype: Buff
+        """
+        attached = Buff(1, 1, rowMajor=rowMajor)
+        attached.sharedMemory = shared_memory.SharedMemory(name=name)
+        attached._useSharedMemory(width, height)
+        attached.capacity = (width, height)
+        attached.width = width
+        attached.height = height
+        attached.size = (width, height)
+        return attached
+
+    def releaseShared(self):
+        """
+        Close the shared memory block of this buff, and free it if this buff created it. The buff must not be used
+        afterwards.
+
+        :rtype: None
+        """
+        if self.sharedMemory is None:
+            return
+        self.buff = None
+        self.pixels = None
+        self.storage = None
+        Buff._closeShared(self.sharedMemory, self.shared)
+        self.sharedMemory = None
+
+    def view(self, x0: int, x1: int, y0: int, y1: int):
+        """
+        Get a Buff of the pixels in [x0, x1) x [y0, y1) sharing memory with this buff, pixel (x, y) of the view is
+        pixel (x0 + x, y0 + y) of this buff. Drawing on the view is clipped to the rectangle. Dirty rectangles of the
+        view are kept in the view, in its own coordinates.
+
+        :param x0: first column
+        :type x0: int
+        :param x1: one past the last column
+        :type x1: int
+        :param y0: first row
+        :type y0: int
+        :param y1: one past the last row
+        :type y1: int
+        :rtype: Buff
+        """
+        region = Buff(1, 1, self.background_color)
+        region.buff = self.buff[x0:x1, y0:y1]
+        region.storage = region.buff
+        region.width, region.height = region.buff.shape[:2]
+        region.size = (region.width, region.height)
+        region.capacity = region.size
+        return region
+
     def _setBuffArray(self, buffarray):
         """
         In class usage only
@@ -216,25 +587,75 @@ class Buff:
             raise TypeError("buffarray can be ndarray only")
         if self.width * self.height * 3 != buffarray.size:
             raise TypeError("You are copying buffarray with incorrect shape to this buff")
-        self.buff = buffarray.reshape((self.width, self.height, 3)).copy()
+        if self.shared:
+            self.buff[...] = buffarray.reshape((self.width, self.height, 3))
+        elif self.rowMajor:
+            self._allocate(self.width, self.height)
+            self._useStorage(self.width, self.height)
+            self.buff[...] = buffarray.reshape((self.width, self.height, 3))
+        else:
+            self.storage = buffarray.reshape((self.width, self.height, 3)).copy()
+            self.capacity = self.size
+            self._useStorage(self.width, self.height)
+        self.markDirty(0, self.width, 0, self.height)
 
-    def getBytes(self):
+    def getBytes(self, rect=None):
         """
         Turn buff to bytes, which is a copy of raw data memory content in C-order, to feed into graphic card.
+        With rowMajor storage the whole buff is returned as a memoryview of pixels instead, without any copy, unless
+        the buff is smaller than its capacity. Use getRowSpan to read it in place then.
 
-        :rtype: bytes
+        :param rect: [x0, x1, y0, y1] to turn only the pixels in [x0, x1) x [y0, y1) to bytes, whole buff if None
+        :type rect: list
+        :rtype: bytes or memoryview
+        """
+        if rect is None and self.rowMajor and self.pixels.flags.c_contiguous:
+            return memoryview(self.pixels)
+        if rect is None and self.rowMajor:
+            return self.pixels.tobytes()
+        if rect is None:
+            # flip width and height to generate bytes correctly
+            return np.transpose(self.buff, (1, 0, 2)).tobytes()
+        x0, x1, y0, y1 = rect
+        return np.transpose(self.buff[x0:x1, y0:y1], (1, 0, 2)).tobytes()
+
+    def getRowSpan(self, rect):
+        """
+        Get the memory of a rowMajor buff from pixel (x0, y0) up to pixel (x1 - 1, y1 - 1) as a memoryview, without
+        any copy. It holds the rectangle [x0, x1) x [y0, y1) with rows capacity[0] pixels apart, which is what the
+        graphic card reads with GL_UNPACK_ROW_LENGTH set to capacity[0].
+
+        :param rect: [x0, x1, y0, y1]
+        :type rect: list
+        :rtype: memoryview
+        """
+        if not self.rowMajor:
+            raise TypeError("getRowSpan needs a buff with rowMajor storage")
+        x0, x1, y0, y1 = rect
+        rowLength = self.capacity[0]
+        start = (y0 * rowLength + x0) * 3
+        end = ((y1 - 1) * rowLength + x1) * 3
+        return memoryview(self.storage.reshape(-1))[start:end]
+
+    def getImageArray(self):
         """
-        # flip width and height to generate bytes correctly
-        return np.transpose(self.buff, (1, 0, 2)).tobytes()
+        Get buff as an image array in (height, width, 3) layout with the top row first, which is what image libraries
+        like PIL expect. Buff has its origin at the bottom left, so rows are flipped.
+
+        :rtype: numpy.array[type=uint8]
+        """
+        return np.flip(np.transpose(self.buff, (1, 0, 2)), axis=0)
 
     def copy(self):
         """
-        A deep copy of current buff object
+        A deep copy of current buff object, in private memory also if this buff is shared
 
         :rtype: Buff
         """
-        newBuff = Buff(self.width, self.height, self.background_color)
+        newBuff = Buff(self.width, self.height, self.background_color, self.rowMajor)
         newBuff._setBuffArray(self.buff)
+        if self.depth is not None:
+            newBuff.depth = self.depth.copy()
         return newBuff
 
 
@@ -287,3 +708,97 @@ if __name__ == "__main__":
     e.resize(2, 2)
     print(e)
     print(e.getBytes())
+
+    # Texture lookup: Point array against sampling from the buff array
+    import time
+    import tracemalloc
+
+    texture = Buff(300, 158)
+    texture.setStaticBuffArray(np.random.default_rng(0).integers(0, 256, (300, 158, 3), dtype=np.uint8))
+    tracemalloc.start()
+    t1 = time.perf_counter()
+    texture.generatePointArray()
+    t2 = time.perf_counter()
+    pointArrayMemory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print("generatePointArray: {:.1f} ms, {:.1f} MB".format((t2 - t1) * 1000, pointArrayMemory / 1e6))
+    texture.buffPointArray = None
+    print("texture array: {:.3f} MB".format(texture.buff.nbytes / 1e6))
+
+    uv = np.random.default_rng(1).random((2, 1000000)) * 3 - 1
+    for filterMode in ["nearest", "bilinear"]:
+        for wrapMode in ["repeat", "clamp"]:
+            t1 = time.perf_counter()
+            colors = texture.sampleTexture(uv[0], uv[1], filterMode, wrapMode)
+            t2 = time.perf_counter()
+            print("sampleTexture {} {} of {} coordinates: {:.1f} ms".format(
+                filterMode, wrapMode, len(colors), (t2 - t1) * 1000))
+
+    t1 = time.perf_counter()
+    texture.generateMipmaps()
+    t2 = time.perf_counter()
+    print("generateMipmaps: {:.2f} ms, levels {}".format((t2 - t1) * 1000,
+                                                        [level.shape[:2] for level in texture.mipmaps]))
+    for lod in [0, 2, 4]:
+        t1 = time.perf_counter()
+        colors = texture.sampleTexture(uv[0], uv[1], "nearest", "repeat", lod)
+        t2 = time.perf_counter()
+        print("sampleTexture nearest repeat at level {}: {:.1f} ms".format(lod, (t2 - t1) * 1000))
+
+    # Per frame cost at 1920x1080: full copy and full bytes against copying and turning only dirty rectangles to bytes
+    frame = Buff(1920, 1080)
+    frameLast = frame.copy()
+    frame.takeDirtyRects()
+    t1 = time.perf_counter()
+    for _ in range(20):
+        frameLast = frame.copy()
+        frame.getBytes()
+    t2 = time.perf_counter()
+    print("full copy and getBytes at 1920x1080: {:.2f} ms per frame".format((t2 - t1) / 20 * 1000))
+    t1 = time.perf_counter()
+    for i in range(20):
+        frame.setPixel(i * 7, i * 5, 255, 255, 255)
+        frame.markDirty(400, 464, 300, 364)
+        for rect in frame.takeDirtyRects():
+            x0, x1, y0, y1 = rect
+            frameLast.buff[x0:x1, y0:y1] = frame.buff[x0:x1, y0:y1]
+            frame.getBytes(rect)
+    t2 = time.perf_counter()
+    print("dirty rectangles at 1920x1080: {:.3f} ms per frame".format((t2 - t1) / 20 * 1000))
+
+    # Per frame allocation of getBytes, for the default storage and for rowMajor storage
+    for rowMajor in [False, True]:
+        frame = Buff(1920, 1080, rowMajor=rowMajor)
+        tracemalloc.start()
+        t1 = time.perf_counter()
+        for _ in range(20):
+            data = frame.getBytes()
+            del data
+        t2 = time.perf_counter()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("getBytes at 1920x1080, rowMajor {}: {:.3f} ms and {:.1f} MB allocated per frame".format(
+            rowMajor, (t2 - t1) / 20 * 1000, peak / 1e6))
+
+    # Resizes of a window edge dragged around 1920x1080, with storage growing past capacity against a new exact
+    # size array and a copy at every resize
+    rng = np.random.default_rng(2)
+    sizes = [(int(w), int(h)) for w, h in zip(1920 + np.cumsum(rng.integers(-40, 41, 200)),
+                                              1080 + np.cumsum(rng.integers(-20, 21, 200)))]
+    for rowMajor in [False, True]:
+        frame = Buff(1920, 1080, rowMajor=rowMajor)
+        t1 = time.perf_counter()
+        for width, height in sizes:
+            frame.resize(width, height)
+        t2 = time.perf_counter()
+        resized = np.zeros((1920, 1080, 3), dtype=np.uint8)
+        t3 = time.perf_counter()
+        for width, height in sizes:
+            previous = resized
+            resized = np.zeros((width, height, 3), dtype=np.uint8)
+            w_min, h_min = min(width, previous.shape[0]), min(height, previous.shape[1])
+            resized[:w_min, :h_min] = previous[:w_min, :h_min]
+        t4 = time.perf_counter()
+        print("{} resizes around 1920x1080, rowMajor {}: {:.3f} ms per resize with capacity {}, {:.3f} ms per resize "
+              "copying to an exact size array".format(len(sizes), rowMajor, (t2 - t1) / len(sizes) * 1000,
+                                                      frame.capacity, (t4 - t3) / len(sizes) * 1000))
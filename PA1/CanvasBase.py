@@ -44,6 +44,8 @@ except ImportError:
 
 from Buff import Buff
 from ColorType import ColorType
+from FrameHistory import FrameHistory
+from LayerStack import LayerStack
 
 # -------------------------- System Checking --------------------------
 WX_MINIMUM_REQUIRED = "3.0.0"
@@ -76,7 +78,8 @@ class CanvasBase(glcanvas.GLCanvas):
     points_l = []
 
     buff = Buff()
-    buff_last = Buff()
+    history = None
+    layers = None
 
     def __init__(self, parent):
         """
@@ -89,11 +92,15 @@ class CanvasBase(glcanvas.GLCanvas):
         self.init = False
         self.context = glcanvas.GLContext(self)
         self.size = None
+        # size of the texture allocated on graphic card, which is the capacity of buff
+        # the whole buff is uploaded when it changes
+        self.textureSize = None
 
         self.Bind(wx.EVT_PAINT, self.OnPaint)
         self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
         self.Bind(wx.EVT_LEFT_UP, self.OnMouseLeft)
         self.Bind(wx.EVT_RIGHT_UP, self.OnMouseRight)
+        self.Bind(wx.EVT_MIDDLE_UP, self.OnMouseMiddle)
         self.Bind(wx.EVT_CHAR, self.OnKeyDown)
         self.Bind(wx.EVT_SIZE, self.OnResize)
 
@@ -105,12 +112,22 @@ class CanvasBase(glcanvas.GLCanvas):
     def getPixelScale(self):
         return self.__pixelScale
 
+    @property
+    def buff_last(self):
+        """
+        Last frame displayed, kept by history
+        """
+        return self.history.last
+
     def clear(self):
         """
-        clear display buff, but save last frame to buff_last
+        clear display buff and its layers, the last frame stays in history and clearing can be undone
         """
-        self.buff_last = self.buff.copy()
-        self.buff.clear()
+        if self.layers is None:
+            self.buff.clear()
+        else:
+            self.layers.clear()
+            self.layers.composite()
         self.points_l.clear()
         self.points_r.clear()
 
@@ -119,7 +136,7 @@ class CanvasBase(glcanvas.GLCanvas):
         This method handles onresize event.
         """
 
-        self.context = glcanvas.GLContext(self)
+        # the context and its texture are kept, the texture only changes when the capacity of buff does
         self.size = self.GetClientSize()
         self.SetCurrent(self.context)
 
@@ -128,9 +145,11 @@ class CanvasBase(glcanvas.GLCanvas):
         gl.glLoadIdentity()
         glu.gluOrtho2D(0, self.size.width, 0, self.size.height)
 
-        # Create new buffer for display and store last frame buffer to buff_last
-        self.buff_last = self.buff.copy()
+        # Resize buffer for display, without copying within its capacity. History starts again from the resized frame
+        # at the next draw
         self.buff.resize(self.size.width, self.size.height)
+        if self.layers is not None:
+            self.layers.composite()
 
         # Update screen and display
         self.Refresh(eraseBackground=True)
@@ -160,9 +179,12 @@ class CanvasBase(glcanvas.GLCanvas):
         glu.gluOrtho2D(0, self.size.width, 0, self.size.height)
 
         # load buff as Texture
-        # Create new buffer for display and store last frame buffer to buff_last
-        self.buff_last = self.buff.copy()
-        self.buff = Buff(self.size.width, self.size.height, ColorType(0, 0, 0))
+        # Create new buffer for display, row major storage goes to the texture without copy
+        self.buff = Buff(self.size.width, self.size.height, ColorType(0, 0, 0), rowMajor=True)
+        # test cases are drawn on the scene layer, mouse edits on the edits layer above it
+        self.layers = LayerStack(self.buff, ["scene", "edits"], opaqueBottom=True)
+        # layers are kept in history with buff, so undo does not come back at the next composite
+        self.history = FrameHistory(self.buff, layers=self.layers)
 
         gl.glClearColor(0., 0., 0., 0.)
         gl.glClearDepth(1.0)
@@ -184,8 +206,10 @@ class CanvasBase(glcanvas.GLCanvas):
         gl.glLoadIdentity()
         # Set coordinate system, origin at left-bottom
         glu.gluOrtho2D(0, self.size.width, 0, self.size.height)
-        # Save current frame to last frame in case you need it
-        self.buff_last = self.buff.copy()
+        # Only the dirty rectangles of buff changed since the last frame. Their changes are committed to history as
+        # a compressed delta, which also brings buff_last up to date, and only they are uploaded to the texture
+        dirtyRects = self.buff.takeDirtyRects()
+        self.history.commit(dirtyRects)
 
         # The core part for display: generate a rectangle which covers the whole canvas and map texture to it. \
         # Texture is the content we want to display on canvas
@@ -196,17 +220,37 @@ class CanvasBase(glcanvas.GLCanvas):
         gl.glTexParameter(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
         gl.glTexParameter(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
         gl.glTexEnvf(gl.GL_TEXTURE_ENV, gl.GL_TEXTURE_ENV_MODE, gl.GL_MODULATE)
-        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGB, self.size.width, self.size.height, 0, gl.GL_RGB,
-                        gl.GL_UNSIGNED_BYTE, self.buff.getBytes())
+        if self.textureSize != self.buff.capacity:
+            # the texture has the capacity of buff, a resize within it only uploads the pixels of the new size
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGB, self.buff.capacity[0], self.buff.capacity[1], 0, gl.GL_RGB,
+                            gl.GL_UNSIGNED_BYTE, None)
+            self.textureSize = self.buff.capacity
+            dirtyRects = [[0, self.buff.width, 0, self.buff.height]]
+        if self.buff.rowMajor:
+            # rows of a dirty rectangle are read from storage in place, capacity width pixels apart
+            gl.glPixelStorei(gl.GL_UNPACK_ROW_LENGTH, self.buff.capacity[0])
+            for rect in dirtyRects:
+                x0, x1, y0, y1 = rect
+                gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, x0, y0, x1 - x0, y1 - y0, gl.GL_RGB, gl.GL_UNSIGNED_BYTE,
+                                   self.buff.getRowSpan(rect))
+            gl.glPixelStorei(gl.GL_UNPACK_ROW_LENGTH, 0)
+        else:
+            for rect in dirtyRects:
+                x0, x1, y0, y1 = rect
+                gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, x0, y0, x1 - x0, y1 - y0, gl.GL_RGB, gl.GL_UNSIGNED_BYTE,
+                                   self.buff.getBytes(rect))
         gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        # only the part of the texture covered by buff is mapped to the canvas
+        u = self.buff.width / self.textureSize[0]
+        v = self.buff.height / self.textureSize[1]
         gl.glBegin(gl.GL_QUADS)
-        gl.glTexCoord2f(1.0, 0.0)
+        gl.glTexCoord2f(u, 0.0)
         gl.glVertex2i(self.buff.width, 0)
         gl.glTexCoord2f(0.0, 0.0)
         gl.glVertex2i(0, 0)
-        gl.glTexCoord2f(0.0, 1.0)
+        gl.glTexCoord2f(0.0, v)
         gl.glVertex2i(0, self.buff.height)
-        gl.glTexCoord2f(1.0, 1.0)
+        gl.glTexCoord2f(u, v)
         gl.glVertex2i(self.buff.width, self.buff.height)
         gl.glEnd()
 
@@ -231,6 +275,15 @@ class CanvasBase(glcanvas.GLCanvas):
         self.Interrupt_MouseR(x, self.size.height - y)
         self.Refresh(True)
 
+    def OnMouseMiddle(self, event):
+        """
+        Record middle mouse click event and feed coordinates to Interrupt_MouseM
+        """
+        x = event.GetX()
+        y = event.GetY()
+        self.Interrupt_MouseM(x, self.size.height - y)
+        self.Refresh(True)
+
     def OnKeyDown(self, event):
         """
         Record the key down event and feed the key to Interrupt_MouseL
@@ -245,6 +298,9 @@ class CanvasBase(glcanvas.GLCanvas):
     def Interrupt_MouseR(self, x, y):
         raise NotImplementedError("Mouse Right interrupt not implemented yet")
 
+    def Interrupt_MouseM(self, x, y):
+        raise NotImplementedError("Mouse Middle interrupt not implemented yet")
+
     def Interrupt_Keyboard(self, keycode):
         raise NotImplementedError("keyboard interrupt not implemented yet")
 
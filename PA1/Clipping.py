@@ -0,0 +1,212 @@
+"""
+Clipping stage in front of the rasterizers. Lines are clipped with Cohen-Sutherland outcodes for the trivial cases and
+Liang-Barsky for the rest, triangles are clipped with Sutherland-Hodgman. Geometry is clipped against the Buff
+rectangle before any pixel is generated, so primitives that are mostly off the canvas cost in proportion to their
+visible part.
+First version Created on 10/18/2026
+
+Clipped lines are not cut at new end points. Instead the range of Bresenham steps that can land on the canvas is
+computed, so the pixels that are drawn are exactly the ones the unclipped line would draw, with the same colors.
+"""
+
+import math
+
+import numpy as np
+
+
+class Clipping:
+    """
+    A collection of static clipping methods. Rectangles are given as xMin, yMin, xMax, yMax, all inclusive.
+    """
+
+    INSIDE = 0
+    LEFT = 1
+    RIGHT = 2
+    BOTTOM = 4
+    TOP = 8
+
+    @staticmethod
+    def outCode(x, y, xMin, yMin, xMax, yMax) -> int:
+        """
+        Cohen-Sutherland outcode of a point, a bit is set for every side of the rectangle the point is beyond
+
+        :rtype: int
+        """
+        code = Clipping.INSIDE
+        if x < xMin:
+            code |= Clipping.LEFT
+        elif x > xMax:
+            code |= Clipping.RIGHT
+        if y < yMin:
+            code |= Clipping.BOTTOM
+        elif y > yMax:
+            code |= Clipping.TOP
+        return code
+
+    @staticmethod
+    def clipLine(x1, y1, x2, y2, xMin, yMin, xMax, yMax):
+        """
+        Clip the segment from (x1, y1) to (x2, y2) against a rectangle. Segments with both ends inside or both ends
+        beyond the same side are decided by their outcodes, the others with Liang-Barsky.
+
+        :return: the parameters t0 <= t1 in [0, 1] of the visible part, with (x, y) = (x1, y1) + t * (x2 - x1, y2 - y1),\
+         or None if nothing is visible
+        :rtype: tuple[float] or None
+        """
+        code1 = Clipping.outCode(x1, y1, xMin, yMin, xMax, yMax)
+        code2 = Clipping.outCode(x2, y2, xMin, yMin, xMax, yMax)
+        if code1 == Clipping.INSIDE and code2 == Clipping.INSIDE:
+            return 0.0, 1.0
+        if code1 & code2:
+            return None
+        t0, t1 = 0.0, 1.0
+        dx = x2 - x1
+        dy = y2 - y1
+        for p, q in ((-dx, x1 - xMin), (dx, xMax - x1), (-dy, y1 - yMin), (dy, yMax - y1)):
+            if p == 0:
+                if q < 0:
+                    return None
+            elif p < 0:
+                t0 = max(t0, q / p)
+            else:
+                t1 = min(t1, q / p)
+        if t0 > t1:
+            return None
+        return t0, t1
+
+    @staticmethod
+    def clipLines(starts, ends, xMin, yMin, xMax, yMax):
+        """
+        Batch version of clipLine with Liang-Barsky for all segments at once
+
+        :param starts: (N, 2) start points of the segments
+        :type starts: numpy.ndarray
+        :param ends: (N, 2) end points of the segments
+        :type ends: numpy.ndarray
+        :return: t0 and t1 of every segment, t0 > t1 if nothing is visible
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        delta = ends - starts
+        t0 = np.zeros(len(starts))
+        t1 = np.ones(len(starts))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for p, q in ((-delta[:, 0], starts[:, 0] - xMin), (delta[:, 0], xMax - starts[:, 0]),
+                         (-delta[:, 1], starts[:, 1] - yMin), (delta[:, 1], yMax - starts[:, 1])):
+                t = q / p
+                t0 = np.where(p < 0, np.maximum(t0, t), t0)
+                t1 = np.where(p > 0, np.minimum(t1, t), t1)
+                # parallel to this side and beyond it
+                t0 = np.where((p == 0) & (q < 0), 2.0, t0)
+        return t0, t1
+
+    @staticmethod
+    def lineStepRange(x1: int, y1: int, x2: int, y2: int, width: int, height: int, margin: int = 1,
+                      clipX: bool = True):
+        """
+        Range of Bresenham steps of the line from (x1, y1) to (x2, y2) that can land on a width x height canvas.
+        A Bresenham pixel is less than one pixel away from the exact line along the minor axis, so the line is
+        clipped against the canvas grown by margin pixels and the steps are rounded outwards.
+
+        :param margin: pixels added around the canvas, at least 1
+        :type margin: int
+        :param clipX: clip against the left and right sides of the canvas too, otherwise only against the bottom and \
+        the top
+        :type clipX: bool
+        :return: first and last step, or None if no step lands on the canvas
+        :rtype: tuple[int] or None
+        """
+        xMin, xMax = (-margin, width - 1 + margin) if clipX else (-math.inf, math.inf)
+        clipped = Clipping.clipLine(x1, y1, x2, y2, xMin, -margin, xMax, height - 1 + margin)
+        if clipped is None:
+            return None
+        major = max(abs(x2 - x1), abs(y2 - y1))
+        return max(math.floor(clipped[0] * major) - 1, 0), min(math.ceil(clipped[1] * major) + 1, major)
+
+    @staticmethod
+    def linesStepRanges(starts, ends, width: int, height: int, margin: int = 1, clipX: bool = True):
+        """
+        Batch version of lineStepRange
+
+        :return: first and last step of every line, first > last if no step lands on the canvas
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2)
+        xMin, xMax = (-margin, width - 1 + margin) if clipX else (-np.inf, np.inf)
+        t0, t1 = Clipping.clipLines(starts, ends, xMin, -margin, xMax, height - 1 + margin)
+        major = np.abs(ends - starts).max(axis=1)
+        first = np.maximum(np.floor(t0 * major).astype(np.int64) - 1, 0)
+        last = np.minimum(np.ceil(t1 * major).astype(np.int64) + 1, major)
+        last = np.where(t0 > t1, -1, last)
+        return first, last
+
+    @staticmethod
+    def clipPolygon(vertices, xMin, yMin, xMax, yMax):
+        """
+        Sutherland-Hodgman clipping of a convex or concave polygon against a rectangle, one side at a time
+
+        :param vertices: polygon vertices in order
+        :type vertices: list[tuple]
+        :return: vertices of the clipped polygon, empty if nothing is visible
+        :rtype: list[tuple[float]]
+        """
+        polygon = [(float(x), float(y)) for x, y in vertices]
+        # each side keeps the points where inside(x, y) holds, and cuts edges at the side
+        for axis, bound, keepBelow in ((0, xMin, False), (0, xMax, True), (1, yMin, False), (1, yMax, True)):
+            if len(polygon) == 0:
+                break
+            clipped = []
+            previous = polygon[-1]
+            for current in polygon:
+                currentInside = current[axis] <= bound if keepBelow else current[axis] >= bound
+                previousInside = previous[axis] <= bound if keepBelow else previous[axis] >= bound
+                if currentInside != previousInside:
+                    t = (bound - previous[axis]) / (current[axis] - previous[axis])
+                    cut = (previous[0] + t * (current[0] - previous[0]), previous[1] + t * (current[1] - previous[1]))
+                    clipped.append(cut)
+                if currentInside:
+                    clipped.append(current)
+                previous = current
+            polygon = clipped
+        return polygon
+
+    @staticmethod
+    def triangleBounds(v1, v2, v3, width: int, height: int, margin: int = 0):
+        """
+        Bounding box of the part of a triangle on a width x height canvas, found by clipping it with
+        Sutherland-Hodgman. A thin triangle crossing a corner of the canvas gets a much smaller box than its own
+        bounding box clipped to the canvas.
+
+        :param margin: pixels added around the canvas, for pixels that are affected by the triangle up to margin \
+        pixels away from them
+        :type margin: int
+        :return: xMin, xMax, yMin, yMax of the integer points the box contains, up to margin pixels outside the \
+        canvas, or None if the triangle is not on the canvas
+        :rtype: tuple[int] or None
+        """
+        vertices = [v1, v2, v3]
+        xs = [v[0] for v in vertices]
+        ys = [v[1] for v in vertices]
+        low, right, top = -margin, width - 1 + margin, height - 1 + margin
+        if min(xs) >= low and max(xs) <= right and min(ys) >= low and max(ys) <= top:
+            return int(math.floor(min(xs))), int(math.ceil(max(xs))), int(math.floor(min(ys))), int(math.ceil(max(ys)))
+        polygon = Clipping.clipPolygon(vertices, low, low, right, top)
+        if len(polygon) == 0:
+            return None
+        # cut points are rounded outwards, so no covered pixel is lost to rounding errors
+        xs = [p[0] for p in polygon]
+        ys = [p[1] for p in polygon]
+        return (max(int(math.floor(min(xs))), low), min(int(math.ceil(max(xs))), right),
+                max(int(math.floor(min(ys))), low), min(int(math.ceil(max(ys))), top))
+
+
+if __name__ == "__main__":
+    print(Clipping.clipLine(-10, 5, 20, 5, 0, 0, 9, 9))
+    print(Clipping.clipLine(-10, -5, 20, -5, 0, 0, 9, 9))
+    print(Clipping.clipLines([(-10, 5), (-10, -5)], [(20, 5), (20, -5)], 0, 0, 9, 9))
+    print(Clipping.clipPolygon([(-5, -5), (20, 0), (0, 20)], 0, 0, 9, 9))
+    # a sliver crossing the bottom left corner only touches a few pixels of the canvas
+    print(Clipping.triangleBounds((-960, 1000), (1000, -960), (1002, -960), 500, 500))
+    print(Clipping.triangleBounds((-1000, 0), (-500, 0), (-700, 300), 500, 500))
@@ -0,0 +1,357 @@
+"""
+A CommandList class is defined here, which records draw calls instead of rasterizing them. Drawing methods of
+SketchBase given a CommandList as buff append one command per point, line, triangle or rectangle to it, with its
+vertices, colors and flags stored in numpy arrays. The commands can then be replayed into any Buff, at any size and with other
+anti-aliasing or smoothing flags, without running the code which generated them again. Command lists can be saved to
+and loaded from .npz files.
+First version Created on 10/18/2026
+
+Usage::
+
+    python CommandList.py commands --n-steps 192      # record and save the test cases, time replay against them
+    python CommandList.py --load commands/*.npz --size 1000 1000 --aa
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from Point import Point
+from ColorType import ColorType
+from PointBatch import PointBatch
+
+
+class CommandList:
+    """
+    Properties:
+        width, height: size of the canvas the commands are recorded for, test cases read them like on a Buff
+        kinds: (N,) int8 array, POINT, LINE, TRIANGLE or RECTANGLE
+        coords: (N, 3, 2) int32 array, vertex coordinates. Points, lines and rectangles repeat their last vertex
+        colors: (N, 3, 3) float64 array, vertex colors in range [0, 1]
+        textures: (N, 3, 2) float64 array, texture coordinates, NaN for vertices without them
+        flags: (N,) uint8 array, bits SMOOTH, AA and TEXTURE
+        aaLevels: (N,) uint8 array, anti-aliasing super sampling levels
+    """
+
+    POINT = 1
+    LINE = 2
+    TRIANGLE = 3
+    RECTANGLE = 4
+
+    SMOOTH = 1
+    AA = 2
+    TEXTURE = 4
+
+    fields = ["kinds", "coords", "colors", "textures", "flags", "aaLevels"]
+
+    def __init__(self, width: int, height: int) -> None:
+        """
+        Create an empty command list for a width x height canvas
+
+        :param width: canvas width
+        :type width: int
+        :param height: canvas height
+        :type height: int
+        :rtype: None
+        """
+        self.width = width
+        self.height = height
+        self.size = (width, height)
+        self.clear()
+
+    def __len__(self):
+        self._flush()
+        return len(self.kinds)
+
+    def __repr__(self):
+        return "CommandList of " + str(len(self)) + " commands for " + str(self.width) + "x" + str(self.height)
+
+    def clear(self) -> None:
+        """
+        Remove all commands
+
+        :rtype: None
+        """
+        self.kinds = np.zeros(0, dtype=np.int8)
+        self.coords = np.zeros((0, 3, 2), dtype=np.int32)
+        self.colors = np.zeros((0, 3, 3), dtype=np.float64)
+        self.textures = np.zeros((0, 3, 2), dtype=np.float64)
+        self.flags = np.zeros(0, dtype=np.uint8)
+        self.aaLevels = np.zeros(0, dtype=np.uint8)
+        self._chunks = []
+        self._rows = []
+
+    def _flushRows(self) -> None:
+        """
+        In class usage only. Commands of single Points are kept as rows of python values, which become one chunk.
+        """
+        if len(self._rows) == 0:
+            return
+        kinds, coords, colors, textures, flags, levels = zip(*self._rows)
+        self._chunks.append((np.array(kinds, dtype=np.int8), np.array(coords, dtype=np.int32),
+                             np.array(colors, dtype=np.float64), np.array(textures, dtype=np.float64),
+                             np.array(flags, dtype=np.uint8), np.array(levels, dtype=np.uint8)))
+        self._rows = []
+
+    def _flush(self) -> None:
+        """
+        In class usage only. Commands are appended in chunks, which are concatenated when the arrays are read.
+        """
+        self._flushRows()
+        if len(self._chunks) == 0:
+            return
+        columns = list(zip(*self._chunks))
+        for i, name in enumerate(self.fields):
+            setattr(self, name, np.concatenate((getattr(self, name),) + columns[i]))
+        self._chunks = []
+
+    def _append(self, kind: int, vertices, doSmooth: bool, doAA: bool, doAAlevel: int, doTexture: bool) -> None:
+        """
+        In class usage only. Append one command per entry of the vertices.
+
+        :param vertices: one Point per vertex of a primitive, or one PointBatch per vertex of many primitives
+        :type vertices: list[Point] or list[PointBatch]
+        """
+        flags = (self.SMOOTH if doSmooth else 0) | (self.AA if doAA else 0) | (self.TEXTURE if doTexture else 0)
+        vertices = vertices + [vertices[-1]] * (3 - len(vertices))
+        if not isinstance(vertices[0], PointBatch):
+            self._rows.append((kind, [p.coords for p in vertices],
+                               [(0, 0, 0) if p.color is None else p.color.getRGB() for p in vertices],
+                               [(np.nan, np.nan) if p.texture is None else p.texture for p in vertices],
+                               flags, doAAlevel))
+            return
+        self._flushRows()
+        n = len(vertices[0])
+        coords = np.stack([v.coords for v in vertices], axis=1).astype(np.int32)
+        colors = np.stack([v.colors for v in vertices], axis=1)
+        textures = np.stack([np.full((n, 2), np.nan) if v.textures is None else v.textures for v in vertices], axis=1)
+        self._chunks.append((np.full(n, kind, dtype=np.int8), coords, colors, textures,
+                             np.full(n, flags, dtype=np.uint8), np.full(n, doAAlevel, dtype=np.uint8)))
+
+    def addPoints(self, point) -> None:
+        """
+        Record drawPoint
+
+        :param point: a point, or a batch of points
+        :type point: Point or PointBatch
+        :rtype: None
+        """
+        self._append(self.POINT, [point], False, False, 4, False)
+
+    def addLines(self, p1, p2, doSmooth: bool = True, doAA: bool = False, doAAlevel: int = 4) -> None:
+        """
+        Record drawLine
+
+        :param p1: One end point of the line, or the first end points of a batch of lines
+        :type p1: Point or PointBatch
+        :param p2: Another end point of the line, or the other end points of a batch of lines
+        :type p2: Point or PointBatch
+        :rtype: None
+        """
+        self._append(self.LINE, [p1, p2], doSmooth, doAA, doAAlevel, False)
+
+    def addLineArrays(self, starts, ends, colors, doSmooth: bool = True, doAAlevel: int = 4) -> None:
+        """
+        Record drawLines. Lines with a single color are recorded without smoothing, which draws the same pixels. They
+        are recorded without anti-aliasing, with doAAlevel for a replay which turns it on.
+
+        :param starts: (N, 2) integer start points of the lines
+        :type starts: numpy.ndarray or list
+        :param ends: (N, 2) integer end points of the lines
+        :type ends: numpy.ndarray or list
+        :param colors: (N, 2, 3) start and end colors of every line, or (N, 3) for a single color per line
+        :type colors: numpy.ndarray or list
+        :rtype: None
+        """
+        colors = np.asarray(colors, dtype=np.float64)
+        if colors.ndim == 2:
+            colors = np.stack((colors, colors), axis=1)
+            doSmooth = False
+        self._append(self.LINE, [PointBatch(starts, colors[:, 0]), PointBatch(ends, colors[:, 1])],
+                     doSmooth, False, doAAlevel, False)
+
+    def addTriangles(self, p1, p2, p3, doSmooth: bool = True, doAA: bool = False, doAAlevel: int = 4,
+                     doTexture: bool = False) -> None:
+        """
+        Record drawTriangle. The fill engine is not recorded, the one of the sketch replaying the commands is used.
+
+        :param p1: First triangle vertex, or first vertices of a batch of triangles
+        :param p2: Second triangle vertex, or second vertices of a batch of triangles
+        :param p3: Third triangle vertex, or third vertices of a batch of triangles
+        :type p1: Point or PointBatch
+        :type p2: Point or PointBatch
+        :type p3: Point or PointBatch
+        :rtype: None
+        """
+        self._append(self.TRIANGLE, [p1, p2, p3],
+                     doSmooth, doAA, doAAlevel, doTexture)
+
+    def addRectangles(self, p1, p2) -> None:
+        """
+        Record drawRectangle
+
+        :param p1: One corner of the rectangle, it gives the fill color
+        :type p1: Point
+        :param p2: The opposite corner of the rectangle
+        :type p2: Point
+        :rtype: None
+        """
+        self._append(self.RECTANGLE, [p1, p2], False, False, 4, False)
+
+    def withColor(self, color) -> "CommandList":
+        """
+        A copy of the commands with every vertex in one color. The other arrays are shared with this list.
+
+        :param color: the color, values in range [0, 1]
+        :type color: tuple[float]
+        :rtype: CommandList
+        """
+        self._flush()
+        commands = CommandList(self.width, self.height)
+        for name in self.fields:
+            setattr(commands, name, getattr(self, name))
+        commands.colors = np.broadcast_to(np.asarray(color, dtype=np.float64), self.colors.shape)
+        return commands
+
+    def replay(self, sketch, buff, doSmooth: bool = None, doAA: bool = None, doAAlevel: int = None,
+               doTexture: bool = None) -> None:
+        """
+        Draw the commands on buff with the drawing methods of sketch, in the order they were recorded. On a buff of
+        another size the coordinates are scaled to it. Runs of commands of the same kind with the same flags are
+        drawn with one call, lines without anti-aliasing with drawLines. A flag given here replaces the recorded one
+        of every command.
+
+        :param sketch: the sketch to draw with, its fill engine, line anti-aliasing mode and texture are used
+        :type sketch: SketchBase
+        :param buff: The buff to draw on
+        :type buff: Buff
+        :param doSmooth: Color smooth interpolation control flag, recorded flags if None
+        :type doSmooth: bool
+        :param doAA: Anti-aliasing control flag, recorded flags if None
+        :type doAA: bool
+        :param doAAlevel: Anti-aliasing super sampling level, recorded levels if None. Recorded levels of 0, from lists
+            saved by older versions, use the level of sketch
+        :type doAAlevel: int
+        :param doTexture: Texture mapping control flag of triangles, recorded flags if None
+        :type doTexture: bool
+        :rtype: None
+        """
+        self._flush()
+        n = len(self.kinds)
+        if n == 0:
+            return
+        coords = self.coords.astype(np.int64)
+        if (buff.width, buff.height) != (self.width, self.height):
+            scale = np.array([buff.width / self.width, buff.height / self.height])
+            coords = np.floor(coords * scale + 0.5).astype(np.int64)
+        smooth = (self.flags & self.SMOOTH) > 0 if doSmooth is None else np.full(n, doSmooth)
+        aa = (self.flags & self.AA) > 0 if doAA is None else np.full(n, doAA)
+        if doAAlevel is None:
+            levels = self.aaLevels.astype(np.int64)
+            levels[levels == 0] = sketch.doAAlevel
+        else:
+            levels = np.full(n, doAAlevel)
+        texture = (self.flags & self.TEXTURE) > 0 if doTexture is None else np.full(n, doTexture)
+        texture &= self.kinds == self.TRIANGLE
+
+        runKeys = np.stack((self.kinds, smooth, aa, levels, texture), axis=1)
+        breaks = np.flatnonzero((runKeys[1:] != runKeys[:-1]).any(axis=1)) + 1
+        for start, end in zip(np.concatenate(([0], breaks)).tolist(), np.concatenate((breaks, [n])).tolist()):
+            kind = int(self.kinds[start])
+            runSmooth, runAA, runLevel = bool(smooth[start]), bool(aa[start]), int(levels[start])
+            runCoords = coords[start:end]
+            runColors = self.colors[start:end]
+            if kind == self.POINT:
+                sketch.drawPoint(buff, PointBatch(runCoords[:, 0], runColors[:, 0]))
+            elif kind == self.LINE and not runAA:
+                sketch.drawLines(buff, runCoords[:, 0], runCoords[:, 1], runColors[:, :2], runSmooth)
+            elif kind == self.LINE:
+                sketch.drawLine(buff, PointBatch(runCoords[:, 0], runColors[:, 0]),
+                                PointBatch(runCoords[:, 1], runColors[:, 1]), runSmooth, runAA, runLevel)
+            elif kind == self.RECTANGLE:
+                for i in range(end - start):
+                    sketch.drawRectangle(buff, Point(tuple(runCoords[i, 0].tolist()),
+                                                     ColorType(*runColors[i, 0].tolist())),
+                                         Point(tuple(runCoords[i, 1].tolist())))
+            else:
+                textures = [None] * 3
+                if texture[start]:
+                    # vertices without texture coordinates are mapped by their position on buff
+                    canvas = runCoords / np.array([buff.width, buff.height])
+                    runTextures = self.textures[start:end]
+                    textures = [np.where(np.isnan(runTextures[:, i]), canvas[:, i], runTextures[:, i])
+                                for i in range(3)]
+                vertices = [PointBatch(runCoords[:, i], runColors[:, i], textures[i]) for i in range(3)]
+                sketch.drawTriangle(buff, *vertices, runSmooth, runAA, runLevel, bool(texture[start]))
+
+    def save(self, filename: str) -> None:
+        """
+        Save the commands to a compressed .npz file
+
+        :param filename: path of the file to write
+        :type filename: str
+        :rtype: None
+        """
+        self._flush()
+        np.savez_compressed(filename, width=self.width, height=self.height,
+                            **{name: getattr(self, name) for name in self.fields})
+
+    @staticmethod
+    def load(filename: str) -> "CommandList":
+        """
+        Load commands saved by save
+
+        :param filename: path of the .npz file
+        :type filename: str
+        :rtype: CommandList
+        """
+        with np.load(filename) as data:
+            commands = CommandList(int(data["width"]), int(data["height"]))
+            for name in CommandList.fields:
+                setattr(commands, name, data[name])
+        return commands
+
+
+if __name__ == "__main__":
+    from Buff import Buff
+    from HeadlessSketch import HeadlessSketch
+
+    parser = argparse.ArgumentParser(description="Record the Sketch test cases as command lists and replay them")
+    parser.add_argument("output", nargs="?", help="directory to save the recorded command lists to")
+    parser.add_argument("--size", type=int, nargs=2, default=[500, 500], metavar=("WIDTH", "HEIGHT"),
+                        help="width and height of the buff")
+    parser.add_argument("--n-steps", type=int, default=HeadlessSketch.n_steps, help="n_steps of the test cases")
+    parser.add_argument("--load", nargs="+", help="replay saved command lists instead of recording the test cases")
+    parser.add_argument("--aa", action="store_true", help="replay with anti-aliasing")
+    parser.add_argument("--aa-level", type=int, default=HeadlessSketch.doAAlevel, help="super sampling level")
+    args = parser.parse_args()
+
+    sketch = HeadlessSketch(*args.size)
+    if args.load:
+        for filename in args.load:
+            commandList = CommandList.load(filename)
+            target = Buff(*args.size)
+            t1 = time.perf_counter()
+            commandList.replay(sketch, target, doAA=args.aa or None, doAAlevel=args.aa_level)
+            print("{}: {} commands, replay {:.1f} ms".format(filename, len(commandList),
+                                                             (time.perf_counter() - t1) * 1000))
+    else:
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+        for index, name in enumerate(sketch.testCaseNames(), 1):
+            seconds = sketch.renderTestCase(name, args.n_steps)
+            direct = sketch.buff.buff.copy()
+            t1 = time.perf_counter()
+            commandList = sketch.recordTestCase(index, args.n_steps)
+            recordSeconds = time.perf_counter() - t1
+            sketch.clear()
+            t1 = time.perf_counter()
+            commandList.replay(sketch, sketch.buff)
+            replaySeconds = time.perf_counter() - t1
+            print("{}: {} commands, generate and draw {:.1f} ms, record {:.1f} ms, replay {:.1f} ms, same {}".format(
+                name, len(commandList), seconds * 1000, recordSeconds * 1000, replaySeconds * 1000,
+                np.array_equal(direct, sketch.buff.buff)))
+            if args.output:
+                commandList.save(os.path.join(args.output, "{}_{}.npz".format(name, args.n_steps)))
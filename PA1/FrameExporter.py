@@ -0,0 +1,249 @@
+"""
+A FrameExporter class is defined here, which streams successive Buff frames to a file or a pipe as raw video, either
+YUV4MPEG2 (.y4m, read by ffmpeg and most players) or a stream of binary PPM images (ffmpeg reads it with
+-f image2pipe -c:v ppm). Frames are copied out of the Buff when they are written, and converted and written to disk on
+a background thread, so rendering the next frame is not blocked by disk I/O.
+First version Created on 10/18/2026
+
+Frame copies live in a fixed pool of arrays which are reused once the writer thread is done with them. When the writer
+falls behind, writeFrame waits for a free array, so memory stays the same for any number of frames.
+
+Usage::
+
+    python FrameExporter.py sweep.y4m --frames 500 --size 500 500
+    ffmpeg -i sweep.y4m sweep.mp4
+"""
+
+import argparse
+import queue
+import threading
+import time
+
+import numpy as np
+
+from Buff import Buff
+
+
+class FrameExporter:
+    """
+    Properties:
+        width, height: frame size, every frame written must have it
+        format: "y4m" or "ppm"
+        fps: frame rate written to the y4m header
+        chroma: chroma subsampling of y4m, "444" or "420"
+        frames: number of frames written so far
+    """
+
+    formats = ["y4m", "ppm"]
+
+    def __init__(self, target, width: int, height: int, format: str = "y4m", fps: int = 30, chroma: str = "444",
+                 queueFrames: int = 8, bufferSize: int = 1 << 20) -> None:
+        """
+        Open the target and start the writer thread
+
+        :param target: path of the file to write, or a binary file object like the stdin of a subprocess
+        :type target: str or file
+        :param width: frame width
+        :type width: int
+        :param height: frame height
+        :type height: int
+        :param format: "y4m" or "ppm"
+        :type format: str
+        :param fps: frames per second, for y4m
+        :type fps: int
+        :param chroma: "444" for full resolution chroma, "420" for chroma at half resolution in x and y, for y4m
+        :type chroma: str
+        :param queueFrames: number of frames which can wait for the writer thread
+        :type queueFrames: int
+        :param bufferSize: write buffer size in bytes, when target is a path
+        :type bufferSize: int
+        :rtype: None
+        """
+        if format not in self.formats:
+            raise ValueError("Unknown frame export format: " + str(format))
+        if chroma not in ["444", "420"]:
+            raise ValueError("Unknown y4m chroma subsampling: " + str(chroma))
+        self.width = width
+        self.height = height
+        self.format = format
+        self.fps = fps
+        self.chroma = chroma
+        self.frames = 0
+        self.error = None
+        if isinstance(target, str):
+            self.file = open(target, "wb", buffering=bufferSize)
+            self.ownsFile = True
+        else:
+            self.file = target
+            self.ownsFile = False
+
+        # frame copies go from free to pending in writeFrame, and back to free in the writer thread
+        self.free = queue.Queue()
+        for _ in range(queueFrames + 1):
+            self.free.put(np.empty((height, width, 3), dtype=np.uint8))
+        self.pending = queue.Queue()
+        if format == "y4m":
+            self.file.write("YUV4MPEG2 W{} H{} F{}:1 Ip A1:1 C{}\n".format(
+                width, height, fps, "444" if chroma == "444" else "420jpeg").encode("ascii"))
+        self.thread = threading.Thread(target=self._writeLoop, daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def writeFrame(self, buff: Buff) -> None:
+        """
+        Copy the current content of buff as the next frame. Waits only if queueFrames frames are already waiting for
+        the writer thread.
+
+        :param buff: the frame, with size width x height
+        :type buff: Buff
+        :rtype: None
+        """
+        if self.error is not None:
+            raise self.error
+        if buff.size != (self.width, self.height):
+            raise ValueError("Frame of size {} written to an export of size {}".format(
+                buff.size, (self.width, self.height)))
+        frame = self.free.get()
+        np.copyto(frame, buff.getImageArray())
+        self.pending.put(frame)
+        self.frames += 1
+
+    def close(self) -> None:
+        """
+        Write the waiting frames, stop the writer thread and flush the target. The target is closed if it was opened
+        from a path.
+
+        :rtype: None
+        """
+        if self.thread is None:
+            return
+        self.pending.put(None)
+        self.thread.join()
+        self.thread = None
+        self.file.flush()
+        if self.ownsFile:
+            self.file.close()
+        if self.error is not None:
+            raise self.error
+
+    def _writeLoop(self) -> None:
+        """
+        In class usage only. Runs on the writer thread.
+        """
+        while True:
+            frame = self.pending.get()
+            if frame is None:
+                return
+            try:
+                if self.error is None:
+                    if self.format == "ppm":
+                        self.file.write("P6\n{} {}\n255\n".format(self.width, self.height).encode("ascii"))
+                        self.file.write(frame.data)
+                    else:
+                        self.file.write(b"FRAME\n")
+                        for plane in FrameExporter.rgbToYUV(frame, self.chroma):
+                            self.file.write(plane.data)
+            except Exception as e:
+                # reported by the next writeFrame or close
+                self.error = e
+            self.free.put(frame)
+
+    @staticmethod
+    def rgbToYUV(image: np.ndarray, chroma: str = "444"):
+        """
+        Convert an RGB image to Y, U and V planes with the ITU-R BT.601 integer formulas, in studio range
+
+        :param image: (height, width, 3) uint8 RGB image
+        :type image: numpy.ndarray
+        :param chroma: "444" for full resolution U and V, "420" for U and V averaged over 2 x 2 pixels
+        :type chroma: str
+        :return: Y, U and V planes as C-order uint8 arrays
+        :rtype: tuple[numpy.ndarray]
+        """
+        r = image[:, :, 0].astype(np.int32)
+        g = image[:, :, 1].astype(np.int32)
+        b = image[:, :, 2].astype(np.int32)
+        y = (((66 * r + 129 * g + 25 * b + 128) >> 8) + 16).astype(np.uint8)
+        if chroma == "420":
+            # odd sizes repeat the last row and column, chroma planes round up
+            height, width = r.shape
+            pad = ((0, height % 2), (0, width % 2))
+            r, g, b = (np.pad(c, pad, mode="edge") for c in (r, g, b))
+            r, g, b = ((c[0::2, 0::2] + c[1::2, 0::2] + c[0::2, 1::2] + c[1::2, 1::2] + 2) >> 2 for c in (r, g, b))
+        u = (((-38 * r - 74 * g + 112 * b + 128) >> 8) + 128).astype(np.uint8)
+        v = (((112 * r - 94 * g - 18 * b + 128) >> 8) + 128).astype(np.uint8)
+        return y, u, v
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import tracemalloc
+
+    from Point import Point
+    from ColorType import ColorType
+    from Rasterizer import Rasterizer
+
+    try:
+        # From pip package "Pillow"
+        from PIL import Image
+    except Exception:
+        print("Need to install PIL package. Pip package name is Pillow")
+        raise ImportError
+
+    parser = argparse.ArgumentParser(description="Stream rendered frames to a raw video and time it against PNGs")
+    parser.add_argument("output", help="path of the video to write")
+    parser.add_argument("--frames", type=int, default=200, help="number of frames")
+    parser.add_argument("--size", type=int, nargs=2, default=[500, 500], metavar=("WIDTH", "HEIGHT"),
+                        help="frame size")
+    parser.add_argument("--format", choices=FrameExporter.formats, default="y4m", help="video format")
+    parser.add_argument("--chroma", choices=["444", "420"], default="444", help="y4m chroma subsampling")
+    args = parser.parse_args()
+
+    width, height = args.size
+    frameBuff = Buff(width, height)
+    rng = np.random.default_rng(0)
+
+    def renderFrame(i):
+        Rasterizer.drawTriangleEdge(frameBuff, *[Point((int(x), int(y)), ColorType(*rng.random(3)))
+                                                  for x, y in rng.integers(0, [width, height], (3, 2))])
+
+    t1 = time.perf_counter()
+    for i in range(args.frames):
+        renderFrame(i)
+    renderSeconds = time.perf_counter() - t1
+
+    with tempfile.TemporaryDirectory() as directory:
+        pngFrames = min(args.frames, 50)
+        t1 = time.perf_counter()
+        for i in range(pngFrames):
+            renderFrame(i)
+            Image.fromarray(frameBuff.getImageArray()).save(os.path.join(directory, "{:05d}.png".format(i)))
+        pngSeconds = (time.perf_counter() - t1) / pngFrames
+
+    tracemalloc.start()
+    t1 = time.perf_counter()
+    with FrameExporter(args.output, width, height, args.format, chroma=args.chroma) as exporter:
+        for i in range(args.frames):
+            renderFrame(i)
+            exporter.writeFrame(frameBuff)
+            if i == 99:
+                memory100 = tracemalloc.get_traced_memory()[0]
+        queued = time.perf_counter() - t1
+    t2 = time.perf_counter()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print("render only: {:.2f} ms per frame".format(renderSeconds / args.frames * 1000))
+    print("render and save PNG with PIL: {:.2f} ms per frame".format(pngSeconds * 1000))
+    print("render and stream {}: {:.2f} ms per frame while rendering, {:.2f} ms per frame until written".format(
+        args.format, queued / args.frames * 1000, (t2 - t1) / args.frames * 1000))
+    if args.frames > 100:
+        print("traced memory after 100 frames {:.2f} MB, after {} frames {:.2f} MB".format(
+            memory100 / 1e6, args.frames, memory / 1e6))
+    print("{} frames, {:.1f} MB written to {}".format(exporter.frames, os.path.getsize(args.output) / 1e6,
+                                                     args.output))
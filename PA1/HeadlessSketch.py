@@ -0,0 +1,136 @@
+"""
+Offscreen renderer for the Sketch test cases. The test cases of SketchBase are drawn into a Buff of any size and saved
+as PNG images, so they can be rendered and timed on machines with no display. Neither wxPython nor OpenGL is needed.
+First version Created on 10/18/2026
+
+Usage::
+
+    python HeadlessSketch.py out --size 500 500 --n-steps 192 --cases testCaseTri01 testCaseTriTexture01 --aa
+    python HeadlessSketch.py out --video sweep.y4m --sweep
+"""
+
+import argparse
+import os
+import time
+
+from Buff import Buff
+from ColorType import ColorType
+from FrameExporter import FrameExporter
+from SketchBase import SketchBase
+
+try:
+    # From pip package "Pillow"
+    from PIL import Image
+except Exception:
+    print("Need to install PIL package. Pip package name is Pillow")
+    raise ImportError
+
+
+class HeadlessSketch(SketchBase):
+    """
+    SketchBase drawing into an offscreen Buff instead of a display window
+    """
+
+    def __init__(self, width: int = 500, height: int = 500):
+        """
+        Create the offscreen buff, load texture file to Buff, and load test cases.
+
+        :param width: the buff width
+        :type width: int
+        :param height: the buff height
+        :type height: int
+        """
+        self.buff = Buff(width, height, ColorType(0, 0, 0))
+        self.loadTestCases()
+        self.loadTexture()
+
+    def testCaseNames(self):
+        """
+        Names of the test cases in test_case_list, the clearing entry is left out
+
+        :rtype: list[str]
+        """
+        return [testCase.__name__ for testCase in self.test_case_list[1:]]
+
+    def renderTestCase(self, name: str, n_steps: int) -> float:
+        """
+        Clear buff and draw one test case on it
+
+        :param name: the test case method name, e.g. "testCaseLine01"
+        :type name: str
+        :param n_steps: n_steps passed to the test case
+        :type n_steps: int
+        :return: wall time of drawing in seconds
+        :rtype: float
+        """
+        if name not in self.testCaseNames():
+            raise ValueError("Unknown test case: " + str(name))
+        self.clear()
+        t1 = time.perf_counter()
+        getattr(self, name)(n_steps)
+        return time.perf_counter() - t1
+
+    def saveImage(self, filename: str) -> None:
+        """
+        Save buff as an image file, format is decided by the file extension
+
+        :param filename: path of the image to write
+        :type filename: str
+        :rtype: None
+        """
+        Image.fromarray(self.buff.getImageArray()).save(filename)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the Sketch test cases to PNGs or a raw video without a display")
+    parser.add_argument("output", help="directory to write the PNGs to")
+    parser.add_argument("--size", type=int, nargs=2, default=[500, 500], metavar=("WIDTH", "HEIGHT"),
+                        help="width and height of the buff")
+    parser.add_argument("--n-steps", type=int, default=SketchBase.n_steps, help="n_steps passed to every test case")
+    parser.add_argument("--cases", nargs="+", help="test case names, all test cases if not given")
+    parser.add_argument("--aa", action="store_true", help="turn on anti-aliasing")
+    parser.add_argument("--aa-level", type=int, default=SketchBase.doAAlevel, help="super sampling level")
+    parser.add_argument("--mode", choices=["scanline", "edge"], default=SketchBase.triangleMode,
+                        help="triangle fill engine")
+    parser.add_argument("--filter", choices=["nearest", "bilinear"], default=SketchBase.textureFilter,
+                        help="texture filter")
+    parser.add_argument("--video", help="stream every frame to this .y4m or .ppm file instead of writing PNGs")
+    parser.add_argument("--sweep", action="store_true",
+                        help="render every test case at every n_steps from MIN_N_STEPS to MAX_N_STEPS")
+    args = parser.parse_args()
+
+    sketch = HeadlessSketch(*args.size)
+    sketch.doAA = args.aa
+    sketch.doAAlevel = args.aa_level
+    sketch.triangleMode = args.mode
+    sketch.textureFilter = args.filter
+    os.makedirs(args.output, exist_ok=True)
+
+    exporter = None
+    if args.video:
+        exporter = FrameExporter(os.path.join(args.output, args.video), *args.size,
+                                 format="ppm" if args.video.endswith(".ppm") else "y4m")
+    if args.sweep:
+        stepsList = range(SketchBase.MIN_N_STEPS, SketchBase.MAX_N_STEPS + 1)
+    else:
+        stepsList = [args.n_steps]
+
+    pixels = sketch.buff.width * sketch.buff.height
+    for name in args.cases or sketch.testCaseNames():
+        totalSeconds = 0
+        for n_steps in stepsList:
+            seconds = sketch.renderTestCase(name, n_steps)
+            totalSeconds += seconds
+            if exporter is not None:
+                exporter.writeFrame(sketch.buff)
+                continue
+            filename = os.path.join(args.output, "{}_{}.png".format(name, n_steps))
+            sketch.saveImage(filename)
+            print("{}: {:.1f} ms, {:.2f} Mpixels/s -> {}".format(name, seconds * 1000, pixels / seconds / 1e6,
+                                                                 filename))
+        if exporter is not None:
+            print("{}: {} frames, {:.1f} ms per frame".format(name, len(stepsList),
+                                                              totalSeconds / len(stepsList) * 1000))
+    if exporter is not None:
+        exporter.close()
+        print("{} frames -> {}".format(exporter.frames, os.path.join(args.output, args.video)))
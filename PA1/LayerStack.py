@@ -0,0 +1,404 @@
+"""
+Layer and LayerStack classes are defined here. A LayerStack keeps named RGBA layers of the size of a display Buff, and
+composites them in order with premultiplied alpha into it. Layers are redrawn independently, and only the rectangles
+changed in some layer since the last composite are composited again, so an edit on one layer neither destroys what is
+under it nor needs the other layers drawn again.
+First version Created on 10/18/2026
+
+The rasterizers only write RGB, so a layer keeps two Buffs: its colors, premultiplied by alpha, and its coverage. Draw
+calls are recorded into a CommandList and replayed twice, once into the colors over transparent black, and once in white
+into the coverage. Opaque pixels get their color and a coverage of 255. Anti-aliased pixels are blended over the layer by
+the rasterizers as color * a + below * (1 - a), which on both Buffs is exactly the premultiplied "over" operator, so soft
+edges keep their alpha.
+
+An opaque layer, usually the bottom one, has no coverage. It is cleared to the background color of the display, drawn
+with a single replay and copied as it is, and the layers under it are never composited.
+"""
+
+import time
+
+import numpy as np
+
+from Buff import Buff
+from ColorType import ColorType
+from CommandList import CommandList
+from Rasterizer import Rasterizer
+
+
+class Layer:
+    """
+    Properties:
+        name: layer name
+        color: Buff, colors premultiplied by alpha, black where the layer is transparent
+        coverage: Buff, alpha of the layer in every channel. None for an opaque layer
+        visible: whether the layer is composited
+        opacity: alpha of the whole layer, in range [0, 1]
+    """
+
+    def __init__(self, name: str, width: int, height: int, rowMajor: bool = False,
+                 background: ColorType = None) -> None:
+        """
+        Create a transparent layer, or an opaque layer filled with background
+
+        :param name: layer name
+        :type name: str
+        :param width: layer width
+        :type width: int
+        :param height: layer height
+        :type height: int
+        :param rowMajor: store the pixels like a rowMajor Buff
+        :type rowMajor: bool
+        :param background: color of an opaque layer, the layer is transparent if None
+        :type background: ColorType
+        :rtype: None
+        """
+        self.name = name
+        self.opaque = background is not None
+        self.color = Buff(width, height, background if self.opaque else ColorType(0, 0, 0), rowMajor=rowMajor)
+        self.coverage = None if self.opaque else Buff(width, height, ColorType(0, 0, 0), rowMajor=rowMajor)
+        self.visible = True
+        self.opacity = 1.0
+
+    def __repr__(self):
+        return "Layer " + self.name
+
+    @property
+    def alpha(self) -> np.ndarray:
+        """
+        (width, height) uint8 alpha of the layer, indexed [x, y]
+
+        :rtype: numpy.ndarray
+        """
+        if self.opaque:
+            return np.full(self.color.size, 255, dtype=np.uint8)
+        return self.coverage.buff[:, :, 0]
+
+    def clear(self) -> None:
+        """
+        Make the whole layer transparent, or fill an opaque layer with its background color
+
+        :rtype: None
+        """
+        self.color.clear()
+        if not self.opaque:
+            self.coverage.clear()
+
+    def resize(self, width: int, height: int) -> None:
+        """
+        Resize the layer, its content is kept as much as possible and new pixels are transparent, or have the
+        background color of an opaque layer
+
+        :rtype: None
+        """
+        oldWidth, oldHeight = self.color.size
+        self.color.resize(width, height)
+        if self.opaque:
+            self.color.buff[oldWidth:] = self.color.background_color.getRGB_8bit()
+            self.color.buff[:, oldHeight:] = self.color.background_color.getRGB_8bit()
+        else:
+            self.coverage.resize(width, height)
+
+    def draw(self, sketch, commands: CommandList, doSmooth: bool = None, doAA: bool = None, doAAlevel: int = None,
+             doTexture: bool = None) -> None:
+        """
+        Draw recorded commands over the layer with the drawing methods of sketch. The flags are passed to
+        CommandList.replay.
+
+        :param sketch: the sketch to draw with
+        :type sketch: SketchBase
+        :param commands: the draw calls
+        :type commands: CommandList
+        :rtype: None
+        """
+        commands.replay(sketch, self.color, doSmooth, doAA, doAAlevel, doTexture)
+        if not self.opaque:
+            commands.withColor((1, 1, 1)).replay(sketch, self.coverage, doSmooth, doAA, doAAlevel, False)
+
+    def drawMask(self, x0: int, x1: int, y0: int, y1: int, mask: np.ndarray, color) -> None:
+        """
+        Write one opaque color to the pixels of a mask, see Rasterizer.drawMask
+
+        :rtype: None
+        """
+        Rasterizer.drawMask(self.color, x0, x1, y0, y1, mask, color)
+        if not self.opaque:
+            Rasterizer.drawMask(self.coverage, x0, x1, y0, y1, mask, (1, 1, 1))
+
+    def takeDirtyRects(self):
+        """
+        Rectangles of the layer changed since the last call, see Buff.takeDirtyRects
+
+        :rtype: list
+        """
+        if not self.opaque:
+            for rect in self.coverage.takeDirtyRects():
+                self.color.markDirty(*rect)
+        return self.color.takeDirtyRects()
+
+
+class LayerStack:
+    """
+    Properties:
+        buff: the display Buff the layers are composited into, its background color is under all layers
+        layers: list of Layer, bottom first
+        bandPixels: number of pixels composited together
+    """
+
+    bandPixels = 1 << 14
+
+    def __init__(self, buff: Buff, names=("scene",), opaqueBottom: bool = False) -> None:
+        """
+        Create a stack of layers of the size of buff
+
+        :param buff: the display Buff
+        :type buff: Buff
+        :param names: names of the layers to create, bottom first
+        :type names: list[str]
+        :param opaqueBottom: make the bottom layer opaque, with the background color of buff
+        :type opaqueBottom: bool
+        :rtype: None
+        """
+        self.buff = buff
+        self.layers = []
+        self.fullDirty = True
+        for i, name in enumerate(names):
+            self.addLayer(name, opaque=opaqueBottom and i == 0)
+
+    def __len__(self):
+        return len(self.layers)
+
+    def __repr__(self):
+        return "LayerStack of " + str([layer.name for layer in self.layers])
+
+    def addLayer(self, name: str, index: int = None, opaque: bool = False) -> Layer:
+        """
+        Add a transparent layer
+
+        :param name: name of the new layer, must not be used by another layer
+        :type name: str
+        :param index: position of the new layer, 0 is the bottom. On top of all layers if None
+        :type index: int
+        :param opaque: fill the layer with the background color of buff instead, it hides all layers under it
+        :type opaque: bool
+        :rtype: Layer
+        """
+        if name in [layer.name for layer in self.layers]:
+            raise ValueError("Layer already exists: " + str(name))
+        layer = Layer(name, self.buff.width, self.buff.height, self.buff.rowMajor,
+                      self.buff.background_color if opaque else None)
+        layer.takeDirtyRects()
+        self.layers.insert(len(self.layers) if index is None else index, layer)
+        return layer
+
+    def getLayer(self, name: str) -> Layer:
+        """
+        :param name: layer name
+        :type name: str
+        :rtype: Layer
+        """
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        raise ValueError("Unknown layer: " + str(name))
+
+    def removeLayer(self, name: str) -> None:
+        """
+        Remove a layer, the whole buff is composited again at the next composite
+
+        :rtype: None
+        """
+        self.layers.remove(self.getLayer(name))
+        self.fullDirty = True
+
+    def moveLayer(self, name: str, index: int) -> None:
+        """
+        Move a layer to a new position, 0 is the bottom
+
+        :rtype: None
+        """
+        layer = self.getLayer(name)
+        self.layers.remove(layer)
+        self.layers.insert(index, layer)
+        self.fullDirty = True
+
+    def setVisible(self, name: str, visible: bool) -> None:
+        """
+        Show or hide a layer
+
+        :rtype: None
+        """
+        self.getLayer(name).visible = visible
+        self.fullDirty = True
+
+    def setOpacity(self, name: str, opacity: float) -> None:
+        """
+        Set the alpha of a whole layer
+
+        :param opacity: in range [0, 1]
+        :type opacity: float
+        :rtype: None
+        """
+        self.getLayer(name).opacity = min(max(opacity, 0.0), 1.0)
+        self.fullDirty = True
+
+    def clear(self, name: str = None) -> None:
+        """
+        Make one layer, or all layers, transparent
+
+        :param name: layer to clear, all layers if None
+        :type name: str
+        :rtype: None
+        """
+        for layer in self.layers if name is None else [self.getLayer(name)]:
+            layer.clear()
+
+    def draw(self, name: str, sketch, commands: CommandList, doSmooth: bool = None, doAA: bool = None,
+             doAAlevel: int = None, doTexture: bool = None) -> None:
+        """
+        Draw recorded commands over a layer, see Layer.draw. Nothing is composited until composite is called.
+
+        :rtype: None
+        """
+        self.getLayer(name).draw(sketch, commands, doSmooth, doAA, doAAlevel, doTexture)
+
+    def drawMask(self, name: str, x0: int, x1: int, y0: int, y1: int, mask: np.ndarray, color) -> None:
+        """
+        Write one opaque color to the pixels of a mask on a layer, see Rasterizer.drawMask. Nothing is composited
+        until composite is called.
+
+        :rtype: None
+        """
+        self.getLayer(name).drawMask(x0, x1, y0, y1, mask, color)
+
+    @staticmethod
+    def _region(buff: Buff, rect) -> np.ndarray:
+        """
+        In class usage only. The pixels of rect in memory order, indexed [y, x] for a rowMajor buff.
+        """
+        x0, x1, y0, y1 = rect
+        region = buff.buff[x0:x1, y0:y1]
+        return region.transpose(1, 0, 2) if buff.rowMajor else region
+
+    @staticmethod
+    def _divide255(values: np.ndarray) -> np.ndarray:
+        """
+        In class usage only. values / 255 rounded to the nearest integer, exact for uint16 values up to 255 * 255.
+        """
+        values += 128
+        values += values >> 8
+        values >>= 8
+        return values
+
+    def composite(self):
+        """
+        Composite the visible layers bottom up over the background color of buff, in the rectangles changed since the
+        last composite. Changed rectangles of buff are marked dirty.
+
+        :return: the [x0, x1, y0, y1] rectangles composited
+        :rtype: list
+        """
+        if any(layer.color.size != self.buff.size for layer in self.layers):
+            for layer in self.layers:
+                layer.resize(self.buff.width, self.buff.height)
+            self.fullDirty = True
+        rects = [layer.takeDirtyRects() for layer in self.layers]
+        if self.fullDirty or len(self.layers) == 0:
+            rects = [[0, self.buff.width, 0, self.buff.height]]
+            self.fullDirty = False
+        else:
+            # the rectangles of all layers are merged by the dirty tracking of the bottom layer
+            bottom = self.layers[0].color
+            for layerRects in rects[1:]:
+                for rect in layerRects:
+                    bottom.markDirty(*rect)
+            rects = rects[0] + bottom.takeDirtyRects()
+
+        background = np.array(self.buff.background_color.getRGB_8bit(), dtype=np.uint16)
+        visible = [layer for layer in self.layers if layer.visible and layer.opacity > 0]
+        for i in range(len(visible) - 1, -1, -1):
+            if visible[i].opaque and visible[i].opacity == 1:
+                visible = visible[i:]
+                break
+        for rect in rects:
+            target = self._region(self.buff, rect)
+            # bands of rows in memory order, small enough to stay in cache between the passes over them
+            step = max(1, self.bandPixels // target.shape[1])
+            for start in range(0, target.shape[0], step):
+                band = target[start:start + step]
+                # result is None while band holds the composite so far, which is the background until written
+                result = None
+                written = False
+                for layer in visible:
+                    color = self._region(layer.color, rect)[start:start + step]
+                    if layer.opaque:
+                        alpha = np.full(color.shape[:2] + (1,), 255, dtype=np.uint8)
+                    else:
+                        alpha = self._region(layer.coverage, rect)[start:start + step, :, :1]
+                        if not alpha.any():
+                            continue
+                    if layer.opacity == 1 and (layer.opaque or alpha.min() == 255):
+                        # opaque, nothing under it shows through
+                        band[...] = color
+                        result = None
+                        written = True
+                        continue
+                    if result is None:
+                        result = band.astype(np.uint16) if written else np.tile(background, (band.shape[1], 1))
+                    color = color.astype(np.uint16)
+                    alpha = alpha.astype(np.uint16)
+                    if layer.opacity < 1:
+                        scale = int(round(layer.opacity * 255))
+                        color = self._divide255(color * scale)
+                        alpha = self._divide255(alpha * scale)
+                    # premultiplied over: result = color + result * (1 - alpha)
+                    result = result * (255 - alpha)
+                    result = self._divide255(result)
+                    result += color
+                if result is not None:
+                    band[...] = result
+                elif not written:
+                    band[...] = np.tile(background, (band.shape[1], 1))
+            self.buff.markDirty(*rect)
+        return rects
+
+
+if __name__ == "__main__":
+    from Point import Point
+    from HeadlessSketch import HeadlessSketch
+
+    width, height = 1920, 1080
+    sketch = HeadlessSketch(width, height)
+    display = Buff(width, height, rowMajor=True)
+    stack = LayerStack(display, ["scene", "guides", "edits"], opaqueBottom=True)
+
+    sketch.test_case_index = sketch.testCaseNames().index("testCaseTri01") + 1
+    sketch.n_steps = 64
+    commands = sketch.recordTestCase(sketch.test_case_index, sketch.n_steps)
+    t1 = time.perf_counter()
+    stack.draw("scene", sketch, commands)
+    guides = CommandList(width, height)
+    sketch.drawLines(guides, [[x, 0] for x in range(0, width, 64)], [[x, height - 1] for x in range(0, width, 64)],
+                     np.full((len(range(0, width, 64)), 3), 0.5))
+    stack.draw("guides", sketch, guides)
+    stack.setOpacity("guides", 0.5)
+    stack.composite()
+    t2 = time.perf_counter()
+    print("scene, guides and first composite at {}x{}: {:.1f} ms".format(width, height, (t2 - t1) * 1000))
+
+    rng = np.random.default_rng(0)
+    t1 = time.perf_counter()
+    for _ in range(100):
+        edit = CommandList(width, height)
+        x, y = (int(v) for v in rng.integers(0, [width - 100, height - 100]))
+        sketch.drawLine(edit, Point((x, y), ColorType(1, 0, 0)), Point((x + 100, y + 60), ColorType(0, 1, 0)))
+        stack.draw("edits", sketch, edit, doAA=True)
+        stack.composite()
+    t2 = time.perf_counter()
+    print("anti-aliased line on the edits layer and composite: {:.2f} ms per edit".format((t2 - t1) / 100 * 1000))
+
+    t1 = time.perf_counter()
+    for _ in range(5):
+        sketch.showTestCase()
+        sketch.drawLine(sketch.buff, Point((10, 10), ColorType(1, 0, 0)), Point((110, 70), ColorType(0, 1, 0)))
+    t2 = time.perf_counter()
+    print("redrawing the scene for every edit without layers: {:.2f} ms per edit".format((t2 - t1) / 5 * 1000))
@@ -0,0 +1,133 @@
+"""
+Headless reference renderer for Collada meshes, such as the ones in the PA2 assets folder. The mesh is projected
+orthographically, shaded with one directional light per vertex and rasterized by Rasterizer.drawMesh with a depth
+buffer. Neither wxPython nor OpenGL is needed.
+First version Created on 10/18/2026
+
+Usage::
+
+    python MeshRender.py ../PA2_Fall2024/assets/sphere0.dae sphere.png --size 512 --yaw 30 --pitch 20
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from Buff import Buff
+from ColorType import ColorType
+from Rasterizer import Rasterizer
+
+try:
+    # From pip package "Pillow"
+    from PIL import Image
+except Exception:
+    print("Need to install PIL package. Pip package name is Pillow")
+    raise ImportError
+
+
+class MeshRender:
+    """
+    Load a Collada mesh and render it into a Buff with the software rasterizer
+    """
+
+    @staticmethod
+    def loadCollada(filename: str):
+        """
+        Load all triangles of a Collada file into one indexed triangle list
+
+        :param filename: path of the .dae file
+        :type filename: str
+        :return: (N, 3) vertex positions and (M, 3) vertex indices of the triangles
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        try:
+            # From pip package "pycollada"
+            import collada
+        except ImportError:
+            raise ImportError("Need to install pycollada package to load .dae files")
+
+        vertices = []
+        indices = []
+        offset = 0
+        for geometry in collada.Collada(filename).geometries:
+            for primitive in geometry.primitives:
+                if not isinstance(primitive, collada.triangleset.TriangleSet):
+                    continue
+                vertices.append(np.asarray(primitive.vertex, dtype=np.float64))
+                indices.append(np.asarray(primitive.vertex_index, dtype=np.int64) + offset)
+                offset += len(primitive.vertex)
+        if offset == 0:
+            raise TypeError("No triangles found in " + filename)
+        return np.concatenate(vertices), np.concatenate(indices)
+
+    @staticmethod
+    def vertexNormals(vertices: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """
+        Vertex normals as the normalized sum of the normals of all faces sharing a vertex
+
+        :rtype: numpy.ndarray
+        """
+        triangles = vertices[indices]
+        faceNormals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        normals = np.zeros_like(vertices)
+        for i in range(3):
+            np.add.at(normals, indices[:, i], faceNormals)
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        return normals / np.where(lengths > 0, lengths, 1)
+
+    @staticmethod
+    def render(buff: Buff, vertices: np.ndarray, indices: np.ndarray, color: ColorType, yaw: float = 30,
+               pitch: float = 20, doSmooth: bool = True) -> None:
+        """
+        Rotate the mesh by yaw and pitch (in degrees), fit it into buff, shade it and draw it
+
+        :rtype: None
+        """
+        yaw = math.radians(yaw)
+        pitch = math.radians(pitch)
+        rotateY = np.array([[math.cos(yaw), 0, math.sin(yaw)], [0, 1, 0], [-math.sin(yaw), 0, math.cos(yaw)]])
+        rotateX = np.array([[1, 0, 0], [0, math.cos(pitch), -math.sin(pitch)], [0, math.sin(pitch), math.cos(pitch)]])
+        rotation = rotateX @ rotateY
+        view = (vertices - vertices.mean(axis=0)) @ rotation.T
+        normals = MeshRender.vertexNormals(vertices, indices) @ rotation.T
+
+        extent = max(np.ptp(view[:, 0]), np.ptp(view[:, 1]), 1e-9)
+        scale = 0.9 * min(buff.width, buff.height) / extent
+        screen = np.empty_like(view)
+        screen[:, 0] = view[:, 0] * scale + buff.width / 2
+        screen[:, 1] = view[:, 1] * scale + buff.height / 2
+        # the camera looks down -z, so a larger z is nearer
+        screen[:, 2] = -view[:, 2]
+
+        light = np.array([0.3, 0.5, 1.0])
+        light /= np.linalg.norm(light)
+        intensity = 0.2 + 0.8 * np.clip(normals @ light, 0, 1)
+        colors = np.outer(intensity, color.getRGB())
+        Rasterizer.drawMesh(buff, screen, indices, colors, doSmooth)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a Collada mesh to a PNG without a display")
+    parser.add_argument("mesh", help="path of the .dae file")
+    parser.add_argument("output", help="path of the PNG to write")
+    parser.add_argument("--size", type=int, default=512, help="width and height of the image")
+    parser.add_argument("--yaw", type=float, default=30, help="rotation around y in degrees")
+    parser.add_argument("--pitch", type=float, default=20, help="rotation around x in degrees")
+    parser.add_argument("--flat", action="store_true", help="use flat shading")
+    args = parser.parse_args()
+
+    t1 = time.perf_counter()
+    meshVertices, meshIndices = MeshRender.loadCollada(args.mesh)
+    t2 = time.perf_counter()
+    canvas = Buff(args.size, args.size, ColorType(0, 0, 0))
+    MeshRender.render(canvas, meshVertices, meshIndices, ColorType(1, 0.8, 0.2), args.yaw, args.pitch, not args.flat)
+    t3 = time.perf_counter()
+    Image.fromarray(canvas.getImageArray()).save(args.output)
+
+    covered = int(np.isfinite(canvas.depth).sum())
+    print("{}: {} vertices, {} triangles, loaded in {:.1f} ms".format(
+        args.mesh, len(meshVertices), len(meshIndices), (t2 - t1) * 1000))
+    print("rendered {} pixels in {:.1f} ms ({:.2f} Mpixels/s)".format(
+        covered, (t3 - t2) * 1000, covered / (t3 - t2) / 1e6))
@@ -0,0 +1,303 @@
+"""
+Parallel backend of the rasterizer. The canvas is split into square screen tiles, lines and triangles are binned to the
+tiles they touch, and the tiles are rasterized in a pool of processes. The pixels stay in the shared
+memory block of a Buff created with shared=True: every worker opens the block once and draws into views of its tiles,
+so only the primitives are sent to the workers and only dirty rectangles come back.
+First version Created on 10/18/2026
+
+Every tile draws its primitives in the order they were given, with the drawing methods of SketchBase, clipped to the
+tile. Tiles do not overlap, and the rasterizer interpolates relative to the first vertex of a primitive, so the image
+is exactly the one drawing all primitives on the whole canvas in one process gives.
+
+Usage::
+
+    python ParallelRasterizer.py --sizes 1024x1024 --workers 1 2 4 8 --report scaling.json
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from Buff import Buff
+from Point import Point
+from ColorType import ColorType
+from Rasterizer import Rasterizer
+from SketchBase import SketchBase
+
+
+class ParallelRasterizer:
+    """
+    A pool of worker processes drawing lines and triangles on a Buff with shared storage. The flags of sketch
+    (triangleMode, lineAAMode, tileSize, textureFilter, doMipmap) and its texture are used by the workers.
+
+    Properties:
+        buff: the shared Buff to draw on
+        sketch: SketchBase giving the drawing flags and the texture
+        workers: number of worker processes
+        tileSize: size of the square screen tiles, or None to split the canvas into tilesPerWorker tiles per worker
+        tilesPerWorker: tiles per worker when tileSize is None
+        margin: pixels a primitive may draw outside the bounding box of its vertices
+    """
+
+    settings = ["triangleMode", "lineAAMode", "tileSize", "textureFilter", "doMipmap"]
+    tilesPerWorker = 4
+    margin = 2
+
+    # state of a worker process, set by _initWorker
+    _workerBuff = None
+    _workerSketch = None
+
+    def __init__(self, buff: Buff, sketch: SketchBase, workers: int = None, tileSize: int = None):
+        """
+        :param buff: the buff to draw on, created with shared=True
+        :type buff: Buff
+        :param sketch: the sketch giving the drawing flags and the texture
+        :type sketch: SketchBase
+        :param workers: number of worker processes, the number of CPUs if None
+        :type workers: int
+        :param tileSize: size of the square screen tiles, chosen from the number of workers if None. Every tile a \
+        primitive touches pays its setup again, so tiles should be few but enough to keep all workers busy
+        :type tileSize: int
+        """
+        if buff.sharedMemory is None:
+            raise TypeError("ParallelRasterizer needs a Buff created with shared=True")
+        self.buff = buff
+        self.sketch = sketch
+        self.workers = workers or os.cpu_count()
+        self.tileSize = tileSize
+        self.pool = None
+        self.poolKey = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop the worker processes
+
+        :rtype: None
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+        self.pool = None
+        self.poolKey = None
+
+    def _startPool(self) -> None:
+        """
+        In class usage only. The pool is restarted when the buff was resized or the texture was changed, because the
+        workers hold both of them.
+        """
+        key = (self.buff.sharedMemory.name, self.buff.width, self.buff.height, id(self.sketch.texture))
+        if self.pool is not None and self.poolKey == key:
+            return
+        self.close()
+        self.pool = multiprocessing.Pool(self.workers, ParallelRasterizer._initWorker,
+                                         (self.buff.sharedMemory.name, self.buff.width, self.buff.height,
+                                          self.buff.rowMajor, self.sketch.texture))
+        self.poolKey = key
+
+    @staticmethod
+    def _initWorker(name, width, height, rowMajor, texture):
+        """
+        In class usage only, runs in every worker process
+        """
+        ParallelRasterizer._workerBuff = Buff.attachShared(name, width, height, rowMajor)
+        ParallelRasterizer._workerSketch = SketchBase()
+        ParallelRasterizer._workerSketch.texture = texture
+
+    @staticmethod
+    def _drawTile(task):
+        """
+        In class usage only, runs in a worker process. Draws the primitives of one tile on a view of the tile, with
+        coordinates moved to the tile origin.
+
+        :return: dirty rectangles in canvas coordinates
+        :rtype: list
+        """
+        (x0, x1, y0, y1), kinds, coords, colors, textures, flags, settings = task
+        tile = ParallelRasterizer._workerBuff.view(x0, x1, y0, y1)
+        sketch = ParallelRasterizer._workerSketch
+        for key, value in settings.items():
+            setattr(sketch, key, value)
+        doSmooth, doAA, doAAlevel, doTexture = flags
+        coords = coords - (x0, y0)
+        for kind, vertexCoords, vertexColors, vertexTextures in zip(kinds.tolist(), coords.tolist(), colors.tolist(),
+                                                                   textures.tolist()):
+            points = [Point(tuple(c), ColorType(*rgb), None if math.isnan(t[0]) else tuple(t))
+                      for c, rgb, t in zip(vertexCoords[:kind], vertexColors, vertexTextures)]
+            if kind == 2:
+                sketch.drawLine(tile, *points, doSmooth, doAA, doAAlevel)
+            else:
+                sketch.drawTriangle(tile, *points, doSmooth, doAA, doAAlevel, doTexture)
+        return [[rx0 + x0, rx1 + x0, ry0 + y0, ry1 + y0] for rx0, rx1, ry0, ry1 in tile.takeDirtyRects()]
+
+    def currentTileSize(self) -> int:
+        """
+        Size of the screen tiles for the current size of buff
+
+        :rtype: int
+        """
+        if self.tileSize is not None:
+            return self.tileSize
+        tiles = self.workers * self.tilesPerWorker
+        return max(16, math.ceil(math.sqrt(self.buff.width * self.buff.height / tiles) / 16) * 16)
+
+    def binPrimitives(self, kinds: np.ndarray, coords: np.ndarray):
+        """
+        Bin primitives to the screen tiles they touch. Tiles are grown by margin and tested against the bounding box
+        of a primitive and against its edges, like triangleTiles does: a tile is skipped if it is fully outside an
+        edge of a triangle, or fully on one side of a line. Long thin primitives only go to the tiles along them.
+
+        :param kinds: (N,) number of vertices of every primitive, 2 for lines and 3 for triangles
+        :type kinds: numpy.ndarray
+        :param coords: (N, 3, 2) vertex coordinates, lines repeat their last vertex
+        :type coords: numpy.ndarray
+        :return: the rectangle [x0, x1, y0, y1) of every tile with primitives, and the indices of its primitives in \
+        the order they were given
+        :rtype: list[tuple[list, numpy.ndarray]]
+        """
+        width, height = self.buff.width, self.buff.height
+        tileSize = self.currentTileSize()
+        tileXs = np.arange(0, width, tileSize)
+        tileYs = np.arange(0, height, tileSize)
+        lowX = tileXs - self.margin
+        highX = np.minimum(tileXs + tileSize, width) - 1 + self.margin
+        lowY = tileYs - self.margin
+        highY = np.minimum(tileYs + tileSize, height) - 1 + self.margin
+
+        xs, ys = coords[:, :, 0], coords[:, :, 1]
+        touches = (((xs.min(axis=1)[:, None] <= highX) & (xs.max(axis=1)[:, None] >= lowX))[:, :, None]
+                   & ((ys.min(axis=1)[:, None] <= highY) & (ys.max(axis=1)[:, None] >= lowY))[:, None, :])
+
+        # edge functions E(x, y) = a * x + b * y + c of the edges from vertex i to vertex i + 1
+        a = -(np.roll(ys, -1, axis=1) - ys)
+        b = np.roll(xs, -1, axis=1) - xs
+        c = -(a * xs + b * ys)
+        area = (xs[:, 1] - xs[:, 0]) * (ys[:, 2] - ys[:, 0]) - (ys[:, 1] - ys[:, 0]) * (xs[:, 2] - xs[:, 0])
+        for i in range(3):
+            ea, eb, ec = a[:, i, None, None], b[:, i, None, None], c[:, i, None, None]
+            highest = (np.maximum(ea * lowX[:, None], ea * highX[:, None])
+                       + np.maximum(eb * lowY[None, :], eb * highY[None, :]) + ec)
+            lowest = (np.minimum(ea * lowX[:, None], ea * highX[:, None])
+                      + np.minimum(eb * lowY[None, :], eb * highY[None, :]) + ec)
+            # triangles are positive inside after flipping by the sign of the area, zero area ones keep the box test
+            isTriangle = ((kinds == 3) & (area != 0))[:, None, None]
+            sign = np.sign(area)[:, None, None]
+            touches &= ~(isTriangle & (np.where(sign > 0, highest, -lowest) < 0))
+            if i == 0:
+                isLine = (kinds == 2)[:, None, None]
+                touches &= ~(isLine & ((highest < 0) | (lowest > 0)))
+
+        bins = []
+        for tx, ty in np.argwhere(touches.any(axis=0)).tolist():
+            x0, y0 = int(tileXs[tx]), int(tileYs[ty])
+            bins.append(([x0, min(x0 + tileSize, width), y0, min(y0 + tileSize, height)],
+                         np.flatnonzero(touches[:, tx, ty])))
+        return bins
+
+    def drawPrimitives(self, primitives, doSmooth=True, doAA=False, doAAlevel=4, doTexture=False) -> None:
+        """
+        Draw lines and triangles on buff with the worker processes. The result is the same as calling
+        sketch.drawLine and sketch.drawTriangle on buff for every primitive in order.
+
+        :param primitives: lists of two Points for lines and three Points for triangles
+        :type primitives: list[list[Point]]
+        :param doSmooth: Color smooth filling control flag
+        :type doSmooth: bool
+        :param doAA: Anti-aliasing control flag
+        :type doAA: bool
+        :param doAAlevel: Anti-aliasing super sampling level
+        :type doAAlevel: int
+        :param doTexture: Draw triangles with texture control flag
+        :type doTexture: bool
+        :rtype: None
+        """
+        if len(primitives) == 0:
+            return
+        width, height = self.buff.width, self.buff.height
+        kinds = np.array([len(p) for p in primitives], dtype=np.int64)
+        coords = np.array([[p.coords for p in primitive] + [primitive[-1].coords] * (3 - len(primitive))
+                           for primitive in primitives], dtype=np.int64)
+        colors = np.array([[p.color.getRGB() for p in primitive] + [(0, 0, 0)] * (3 - len(primitive))
+                           for primitive in primitives], dtype=np.float64)
+        # texture coordinates from the position on the whole canvas, the tiles only know their own size
+        textures = np.full((len(primitives), 3, 2), np.nan)
+        if doTexture:
+            for i, primitive in enumerate(primitives):
+                if len(primitive) == 3:
+                    textures[i] = [Rasterizer.textureCoords(p, width, height) for p in primitive]
+
+        flags = (doSmooth, doAA, doAAlevel, doTexture)
+        settings = {key: getattr(self.sketch, key) for key in self.settings}
+        tasks = [(rect, kinds[indices], coords[indices], colors[indices], textures[indices], flags, settings)
+                 for rect, indices in self.binPrimitives(kinds, coords)]
+        self._startPool()
+        for rects in self.pool.imap_unordered(ParallelRasterizer._drawTile, tasks):
+            for rect in rects:
+                self.buff.markDirty(*rect)
+
+
+if __name__ == "__main__":
+    from Benchmark import Benchmark
+
+    parser = argparse.ArgumentParser(description="Scaling of the parallel rasterizer with the number of workers")
+    parser.add_argument("--sizes", nargs="+", default=["1024x1024"], help="canvas sizes as WIDTHxHEIGHT")
+    parser.add_argument("--scenes", nargs="+", choices=Benchmark.scenes, default=Benchmark.scenes,
+                        help="scenes to run")
+    parser.add_argument("--modes", nargs="+", choices=Benchmark.modes, default=["smooth"], help="modes to run")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8], help="numbers of workers")
+    parser.add_argument("--tile-size", type=int, help="size of the screen tiles, chosen from the workers if not given")
+    parser.add_argument("--report", help="path of the JSON report")
+    args = parser.parse_args()
+
+    sketch = SketchBase()
+    sketch.loadTexture()
+    results = []
+    for size in args.sizes:
+        width, height = (int(n) for n in size.split("x"))
+        sharedBuff = Buff(width, height, shared=True)
+        rasterizers = {n: ParallelRasterizer(sharedBuff, sketch, n, args.tile_size) for n in args.workers}
+        for scene in args.scenes:
+            primitives = Benchmark.makeScene(scene, width, height)
+            for mode in args.modes:
+                if mode == "texture" and len(primitives[0]) == 2:
+                    continue
+                doSmooth, doTexture = mode != "flat", mode == "texture"
+                reference = Buff(width, height)
+                t1 = time.perf_counter()
+                for primitive in primitives:
+                    if len(primitive) == 2:
+                        sketch.drawLine(reference, *primitive, doSmooth)
+                    else:
+                        sketch.drawTriangle(reference, *primitive, doSmooth, doTexture=doTexture)
+                single = time.perf_counter() - t1
+                print("{} {} {}x{}: single process {:.1f} ms".format(scene, mode, width, height, single * 1000))
+                for n, rasterizer in rasterizers.items():
+                    # the first call starts the pool, it is not timed
+                    rasterizer.drawPrimitives(primitives[:1], doSmooth, doTexture=doTexture)
+                    sharedBuff.clear()
+                    t1 = time.perf_counter()
+                    rasterizer.drawPrimitives(primitives, doSmooth, doTexture=doTexture)
+                    seconds = time.perf_counter() - t1
+                    exact = bool(np.array_equal(sharedBuff.buff, reference.buff))
+                    print("    {} workers: {:.1f} ms, speedup {:.2f}, exact {}".format(
+                        n, seconds * 1000, single / seconds, exact))
+                    results.append({"scene": scene, "mode": mode, "width": width, "height": height, "workers": n,
+                                    "tileSize": rasterizer.currentTileSize(), "seconds": seconds,
+                                    "singleSeconds": single, "speedup": single / seconds, "exact": exact})
+        for rasterizer in rasterizers.values():
+            rasterizer.close()
+        sharedBuff.releaseShared()
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"environment": Benchmark.environment(), "cpus": os.cpu_count(), "results": results}, f,
+                      indent=2)
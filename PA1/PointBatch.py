@@ -0,0 +1,107 @@
+"""
+A PointBatch class is defined here, which stores many points as a struct of arrays: coordinates, colors and texture
+coordinates each in one numpy array. Drawing methods of SketchBase accept a PointBatch wherever they accept a Point, and
+then draw one primitive per entry of the batch.
+First version Created on 10/18/2026
+"""
+
+import time
+
+import numpy as np
+
+from Point import Point
+from ColorType import ColorType
+
+
+class PointBatch:
+    """
+    Properties:
+        coords: (N, 2) int64 array
+        colors: (N, 3) float64 array, values in [0, 1]
+        textures: (N, 2) float64 array or None
+    """
+
+    __slots__ = ["coords", "colors", "textures"]
+
+    def __init__(self, coords, colors=None, textureCoords=None) -> None:
+        """
+        init PointBatch with arrays of coordinates, colors and texture coordinates.
+        Missing colors are set to black, missing texture coordinates are left as None.
+
+        :param coords: (N, 2) integer coordinates
+        :type coords: numpy.ndarray or list
+        :param colors: (N, 3) colors in range [0, 1]
+        :type colors: numpy.ndarray or list
+        :param textureCoords: (N, 2) corresponding positions in texture
+        :type textureCoords: numpy.ndarray or list
+        :rtype: None
+        """
+        self.coords = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        if colors is None:
+            self.colors = np.zeros((len(self.coords), 3), dtype=np.float64)
+        else:
+            self.colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        if textureCoords is None:
+            self.textures = None
+        else:
+            self.textures = np.asarray(textureCoords, dtype=np.float64).reshape(-1, 2)
+        if len(self.colors) != len(self.coords) or (self.textures is not None
+                                                    and len(self.textures) != len(self.coords)):
+            raise TypeError("coords, colors and textureCoords of PointBatch must have the same length")
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __repr__(self):
+        return "PointBatch of " + str(len(self)) + " points"
+
+    def __getitem__(self, i) -> Point:
+        """
+        Get entry i as a new Point
+
+        :param i: entry index
+        :type i: int
+        :rtype: Point
+        """
+        texture = None if self.textures is None else tuple(self.textures[i].tolist())
+        return Point(tuple(self.coords[i].tolist()), ColorType(*self.colors[i].tolist()), texture)
+
+    @staticmethod
+    def fromPoints(points) -> "PointBatch":
+        """
+        Collect a list of Points into a PointBatch. Texture coordinates are kept only if all points have them.
+
+        :param points: the points to collect
+        :type points: list[Point]
+        :rtype: PointBatch
+        """
+        coords = [p.coords for p in points]
+        colors = [(0, 0, 0) if p.color is None else p.color.getRGB() for p in points]
+        textures = None
+        if len(points) > 0 and all(p.texture is not None for p in points):
+            textures = [p.texture for p in points]
+        return PointBatch(coords, colors, textures)
+
+    def toPoints(self):
+        """
+        Turn every entry into a Point
+
+        :rtype: list[Point]
+        """
+        return [self[i] for i in range(len(self))]
+
+
+if __name__ == "__main__":
+    batch = PointBatch([(1, 2), (3, 4)], [(1, 0, 0), (0, 1, 0)])
+    print(batch, batch.coords.tolist(), batch[1])
+    print(PointBatch.fromPoints(batch.toPoints()).colors)
+
+    rng = np.random.default_rng(0)
+    n = 500 * 500
+    t1 = time.time()
+    points = [Point((int(x), int(y)), ColorType(r, g, b))
+              for (x, y), (r, g, b) in zip(rng.integers(0, 500, (n, 2)).tolist(), rng.random((n, 3)).tolist())]
+    print("{} Points: {:.3f} s".format(n, time.time() - t1))
+    t1 = time.time()
+    batch = PointBatch(rng.integers(0, 500, (n, 2)), rng.random((n, 3)))
+    print("PointBatch of {} points: {:.3f} s".format(n, time.time() - t1))
@@ -0,0 +1,1637 @@
+"""
+Vectorized rasterization routines for the software canvas. Instead of walking a primitive pixel by pixel and
+creating a Point and a ColorType for each one, these routines compute all pixel coordinates and colors of a
+primitive as NumPy arrays and write them into Buff.buff with a single fancy-indexed assignment.
+
+Nothing in here depends on wxPython or OpenGL, so it can be used on machines without a display.
+First version Created on 10/18/2026
+
+Performance Suggestions:
+
+* Pixel coordinates are produced by a closed form of the Bresenham decision sequence used in Sketch.drawLine, so the
+  output is pixel-exact with the per-pixel implementation (drawLineReference) while costing O(1) Python calls per line.
+* For large triangles drawTriangleEdge is faster than drawTriangleScanline, because fully covered tiles are written
+  with slice assignments and never tested pixel by pixel.
+* Everything is clipped to the buff by the Clipping stage before pixels are generated, so primitives that are mostly
+  off the canvas cost in proportion to their visible part.
+"""
+
+import numpy as np
+
+from Buff import Buff
+from Point import Point
+from ColorType import ColorType
+from Clipping import Clipping
+
+
+class Rasterizer:
+    """
+    A collection of static rasterization methods working directly on Buff.buff
+    """
+
+    @staticmethod
+    def linePixels(x1: int, y1: int, x2: int, y2: int, first: int = 0, last: int = None):
+        """
+        Compute all integer pixel coordinates of a line from (x1, y1) to (x2, y2), in drawing order. Only steps first
+        to last are computed if they are given, see Clipping.lineStepRange.
+
+        The decision parameter of Bresenham's algorithm grows by 2 * minor every step and drops by 2 * major every time
+        the minor coordinate moves, so the number of minor moves after k steps is a floor division. The initial
+        decision follows the per-pixel implementation exactly, including its tie-break on the direction of y. Like the
+        per-pixel version, a line whose minor delta is exactly half of its major delta can end one pixel past (x2, y2)
+        along the minor axis.
+
+        :param x1: x coordinate of the start point
+        :type x1: int
+        :param y1: y coordinate of the start point
+        :type y1: int
+        :param x2: x coordinate of the end point
+        :type x2: int
+        :param y2: y coordinate of the end point
+        :type y2: int
+        :param first: first step to compute
+        :type first: int
+        :param last: last step to compute, the last step of the line if None
+        :type last: int
+        :return: x coordinates, y coordinates and the number of steps of the line
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, int]
+        """
+        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+        dx = abs(x2 - x1)
+        dy = abs(y2 - y1)
+        sx = (x1 < x2) - (x1 > x2)
+        sy = (y1 < y2) - (y1 > y2)
+        major = max(dx, dy)
+        minor = min(dx, dy)
+
+        k = np.arange(first, major + 1 if last is None else last + 1, dtype=np.int64)
+        if major == 0:
+            minorSteps = k
+        else:
+            p0 = 2 * minor - major
+            # the per-pixel version starts with "p0 > 0" when y goes up and "p0 >= 0" when y goes down
+            inc0 = int(p0 >= 0) if sy == -1 else int(p0 > 0)
+            minorSteps = (p0 - 2 * major * inc0 + 2 * minor * k) // (2 * major) + 1
+            if first == 0 and len(k) > 0:
+                minorSteps[0] = 0
+
+        if dx >= dy:
+            xs = x1 + sx * k
+            ys = y1 + sy * minorSteps
+        else:
+            xs = x1 + sx * minorSteps
+            ys = y1 + sy * k
+        return xs, ys, major
+
+    @staticmethod
+    def lineColors(c1: ColorType, c2: ColorType, steps: int, doSmooth: bool = True, first: int = 0,
+                   last: int = None) -> np.ndarray:
+        """
+        Compute the 8 bit colors of a line with steps + 1 pixels. Colors are linearly interpolated from c1 to c2 when
+        doSmooth is set, otherwise the whole line uses c1. Only steps first to last are computed if they are given.
+
+        :param c1: color at the start point
+        :type c1: ColorType
+        :param c2: color at the end point
+        :type c2: ColorType
+        :param steps: number of steps of the line
+        :type steps: int
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :param first: first step to compute
+        :type first: int
+        :param last: last step to compute, steps if None
+        :type last: int
+        :return: (last - first + 1, 3) colors if doSmooth, otherwise a single (3,) color
+        :rtype: numpy.ndarray[type=uint8]
+        """
+        start = np.array(c1.getRGB(), dtype=np.float64)
+        if not doSmooth or steps == 0:
+            return (start * 255).astype(np.uint8)
+        end = np.array(c2.getRGB(), dtype=np.float64)
+        t = (np.arange(first, steps + 1 if last is None else last + 1) / steps)[:, None]
+        return ((start * (1 - t) + end * t) * 255).astype(np.uint8)
+
+    @staticmethod
+    def drawLine(buff: Buff, p1: Point, p2: Point, doSmooth: bool = True) -> None:
+        """
+        Draw a line between p1 and p2 on buff, with one array write for the whole line. Only the steps of the line
+        that can land on buff are computed, the pixels outside of buff are dropped.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: One end point of the line
+        :type p1: Point
+        :param p2: Another end point of the line
+        :type p2: Point
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :rtype: None
+        """
+        stepRange = Clipping.lineStepRange(*p1.coords, *p2.coords, buff.width, buff.height)
+        if stepRange is None:
+            return
+        xs, ys, steps = Rasterizer.linePixels(*p1.coords, *p2.coords, *stepRange)
+        colors = Rasterizer.lineColors(p1.color, p2.color, steps, doSmooth, *stepRange)
+        inside = (xs >= 0) & (xs < buff.width) & (ys >= 0) & (ys < buff.height)
+        if not inside.all():
+            xs, ys = xs[inside], ys[inside]
+            colors = colors[inside] if colors.ndim == 2 else colors
+        buff.buff[xs, ys] = colors
+        buff.markDirtyPixels(xs, ys)
+
+    @staticmethod
+    def drawPoints(buff: Buff, coords: np.ndarray, colors: np.ndarray) -> None:
+        """
+        Draw many points on buff in one call, points outside of buff are dropped
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param coords: (N, 2) integer coordinates of the points
+        :type coords: numpy.ndarray
+        :param colors: (N, 3) colors of the points, values should be in range [0, 1]
+        :type colors: numpy.ndarray
+        :rtype: None
+        """
+        coords = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        inside = ((coords[:, 0] >= 0) & (coords[:, 0] < buff.width) & (coords[:, 1] >= 0)
+                  & (coords[:, 1] < buff.height))
+        coords, colors = coords[inside], colors[inside]
+        buff.buff[coords[:, 0], coords[:, 1]] = (colors * 255).astype(np.uint8)
+        buff.markDirtyPixels(coords[:, 0], coords[:, 1])
+
+    @staticmethod
+    def linesPixels(starts: np.ndarray, ends: np.ndarray, first: np.ndarray = None, last: np.ndarray = None):
+        """
+        Batch version of linePixels. Compute the pixel coordinates of many lines at once and concatenate them, line
+        after line, in drawing order. Only steps first to last of every line are computed if they are given, see
+        Clipping.linesStepRanges.
+
+        :param starts: (N, 2) integer start points of the lines
+        :type starts: numpy.ndarray
+        :param ends: (N, 2) integer end points of the lines
+        :type ends: numpy.ndarray
+        :param first: first step to compute of every line
+        :type first: numpy.ndarray
+        :param last: last step to compute of every line, nothing is computed for a line if it is below first
+        :type last: numpy.ndarray
+        :return: x coordinates, y coordinates, the line index and the step index of every pixel, and the number of \
+        steps of every line
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2)
+        x1, y1 = starts[:, 0], starts[:, 1]
+        dx = np.abs(ends[:, 0] - x1)
+        dy = np.abs(ends[:, 1] - y1)
+        sx = np.sign(ends[:, 0] - x1)
+        sy = np.sign(ends[:, 1] - y1)
+        major = np.maximum(dx, dy)
+        minor = np.minimum(dx, dy)
+
+        if first is None:
+            first = np.zeros(len(starts), dtype=np.int64)
+        if last is None:
+            last = major
+        lengths = np.maximum(last - first + 1, 0)
+        line = np.repeat(np.arange(len(starts)), lengths)
+        k = np.arange(line.size, dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths - first, lengths)
+
+        # same closed form as linePixels, evaluated with per line parameters
+        p0 = 2 * minor - major
+        inc0 = np.where(sy == -1, p0 >= 0, p0 > 0).astype(np.int64)
+        c = p0 - 2 * major * inc0
+        minorSteps = (c[line] + 2 * minor[line] * k) // np.maximum(2 * major, 1)[line] + 1
+        minorSteps[k == 0] = 0
+
+        shallow = (dx >= dy)[line]
+        xs = x1[line] + sx[line] * np.where(shallow, k, minorSteps)
+        ys = y1[line] + sy[line] * np.where(shallow, minorSteps, k)
+        return xs, ys, line, k, major
+
+    @staticmethod
+    def linesColors(colors: np.ndarray, line: np.ndarray, k: np.ndarray, steps: np.ndarray,
+                    doSmooth: bool = True) -> np.ndarray:
+        """
+        Batch version of lineColors, computes the 8 bit color of every pixel returned by linesPixels
+
+        :param colors: (N, 2, 3) start and end colors of every line, or (N, 3) colors for a single color per line. \
+        Values should be in range [0, 1]
+        :type colors: numpy.ndarray
+        :param line: the line index of every pixel
+        :type line: numpy.ndarray
+        :param k: the step index of every pixel
+        :type k: numpy.ndarray
+        :param steps: the number of steps of every line
+        :type steps: numpy.ndarray
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :rtype: numpy.ndarray[type=uint8]
+        """
+        colors = np.asarray(colors, dtype=np.float64)
+        if colors.ndim == 2:
+            colors = colors[:, None, :]
+        if not doSmooth or colors.shape[1] == 1:
+            return (colors[:, 0, :] * 255).astype(np.uint8)[line]
+        stepsOfPixel = steps[line]
+        t = np.zeros(k.shape, dtype=np.float64)
+        np.divide(k, stepsOfPixel, out=t, where=stepsOfPixel > 0)
+        u = 1 - t
+        # one channel at a time keeps the temporaries small, the arithmetic is the same as lineColors
+        result = np.empty((k.size, 3), dtype=np.uint8)
+        channel = np.empty(k.size, dtype=np.float64)
+        temp = np.empty(k.size, dtype=np.float64)
+        for i in range(3):
+            np.multiply(np.ascontiguousarray(colors[:, 0, i])[line], u, out=channel)
+            np.multiply(np.ascontiguousarray(colors[:, 1, i])[line], t, out=temp)
+            channel += temp
+            channel *= 255
+            result[:, i] = channel
+        return result
+
+    @staticmethod
+    def drawLines(buff: Buff, starts: np.ndarray, ends: np.ndarray, colors: np.ndarray, doSmooth: bool = True) -> None:
+        """
+        Draw many lines on buff in one pass. The result is the same as calling drawLine for every line in order,
+        where later lines overwrite the pixels they share with earlier ones. Lines are clipped like in drawLine.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param starts: (N, 2) integer start points of the lines
+        :type starts: numpy.ndarray
+        :param ends: (N, 2) integer end points of the lines
+        :type ends: numpy.ndarray
+        :param colors: (N, 2, 3) start and end colors of every line, or (N, 3) colors for a single color per line. \
+        Values should be in range [0, 1]
+        :type colors: numpy.ndarray
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :rtype: None
+        """
+        first, last = Clipping.linesStepRanges(starts, ends, buff.width, buff.height)
+        xs, ys, line, k, steps = Rasterizer.linesPixels(starts, ends, first, last)
+        inside = (xs >= 0) & (xs < buff.width) & (ys >= 0) & (ys < buff.height)
+        if not inside.all():
+            xs, ys, line, k = xs[inside], ys[inside], line[inside], k[inside]
+        buff.buff[xs, ys] = Rasterizer.linesColors(colors, line, k, steps, doSmooth)
+        buff.markDirtyPixels(xs, ys)
+
+    @staticmethod
+    def drawPolyline(buff: Buff, vertices: np.ndarray, colors: np.ndarray, closed: bool = False,
+                     doSmooth: bool = True) -> None:
+        """
+        Draw a chain of lines through the vertices in one pass with drawLines. Every segment is drawn from the color
+        of its first vertex to the color of its second one.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param vertices: (N, 2) integer vertex coordinates
+        :type vertices: numpy.ndarray
+        :param colors: (N, 3) vertex colors, values should be in range [0, 1]
+        :type colors: numpy.ndarray
+        :param closed: also draw a segment from the last vertex back to the first one
+        :type closed: bool
+        :param doSmooth: Control flag of color smooth interpolation, segments take the color of their first vertex \
+        if False
+        :type doSmooth: bool
+        :rtype: None
+        """
+        vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 2)
+        colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        if len(vertices) < 2:
+            Rasterizer.drawPoints(buff, vertices, colors)
+            return
+        ends = np.roll(np.arange(len(vertices)), -1)
+        if not closed:
+            ends = ends[:-1]
+        starts = np.arange(len(ends))
+        Rasterizer.drawLines(buff, vertices[starts], vertices[ends], np.stack((colors[starts], colors[ends]), axis=1),
+                             doSmooth)
+
+    @staticmethod
+    def drawRectangle(buff: Buff, x1: int, y1: int, x2: int, y2: int, color) -> None:
+        """
+        Fill the rectangle between two corners, both included, with one slice assignment
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param x1: x of one corner
+        :type x1: int
+        :param y1: y of one corner
+        :type y1: int
+        :param x2: x of the opposite corner
+        :type x2: int
+        :param y2: y of the opposite corner
+        :type y2: int
+        :param color: fill color, values should be in range [0, 1]
+        :type color: ColorType or numpy.ndarray
+        :rtype: None
+        """
+        if isinstance(color, ColorType):
+            color = color.getRGB()
+        x0, x1 = max(min(x1, x2), 0), min(max(x1, x2) + 1, buff.width)
+        y0, y1 = max(min(y1, y2), 0), min(max(y1, y2) + 1, buff.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        Rasterizer._fillRegion(buff, x0, x1, y0, y1, color)
+        buff.markDirty(x0, x1, y0, y1)
+
+    @staticmethod
+    def _fillRegion(buff: Buff, x0: int, x1: int, y0: int, y1: int, color, mask: np.ndarray = None) -> None:
+        """
+        In class usage only. Write one color to a box of buff, or to the pixels of mask in it. The color is repeated
+        along the rows of the box in memory order first, a 3 element color broadcast over the whole box would be
+        copied 3 bytes at a time. Masked pixels are blended in with uint8 arithmetic, which wraps around so that
+        region + (color - region) * 1 is color, instead of a boolean index which writes pixel by pixel.
+
+        :param mask: boolean mask of the pixels to write, indexed [x - x0, y - y0], or [y - y0, x - x0] if buff is \
+        rowMajor. The whole box is written if None
+        :type mask: numpy.ndarray
+        """
+        region = buff.buff[x0:x1, y0:y1]
+        if buff.rowMajor:
+            region = region.transpose(1, 0, 2)
+        row = np.tile((np.asarray(color, dtype=np.float64) * 255).astype(np.uint8), (region.shape[1], 1))
+        if mask is None:
+            region[...] = row
+            return
+        delta = row - region
+        delta *= np.repeat(mask.view(np.uint8), 3, axis=1).reshape(region.shape)
+        region += delta
+
+    @staticmethod
+    def polygonMask(vertices: np.ndarray, width: int, height: int, fillRule: str = "evenodd", rowMajor: bool = False):
+        """
+        Pixels inside a polygon, by scanline. Every edge is intersected with the pixel rows it crosses, all edges at
+        once, and each crossing toggles the pixels from it to the right end of its row. A running sum along the rows
+        then turns the crossings into spans. Self-intersecting and concave polygons need nothing special, and the cost
+        does not depend on the order of the crossings in a row, so nothing is sorted.
+
+        Pixels are sampled at their integer coordinates. A row crosses an edge when it is at or above the lower end of
+        the edge and below the upper end, and a pixel is inside from the first x at or right of a crossing up to the
+        pixel before the next crossing. Polygons sharing an edge therefore never fill the same pixel twice.
+
+        :param vertices: (N, 2) vertex coordinates, the polygon is closed from the last vertex back to the first one
+        :type vertices: numpy.ndarray
+        :param width: width of the target buff
+        :type width: int
+        :param height: height of the target buff
+        :type height: int
+        :param fillRule: "evenodd" fills pixels with an odd number of crossings on their left, "nonzero" fills pixels \
+        the polygon winds around
+        :type fillRule: str
+        :param rowMajor: index the mask as [y - y0, x - x0], like the pixels of a rowMajor Buff
+        :type rowMajor: bool
+        :return: x0, x1, y0, y1 of the box of the polygon clipped to the buff, and a (x1 - x0, y1 - y0) boolean mask of \
+        the pixels inside, indexed [x - x0, y - y0]. None if no pixel is inside
+        :rtype: tuple or None
+        """
+        if fillRule not in ["evenodd", "nonzero"]:
+            raise ValueError("Unknown polygon fill rule: " + str(fillRule))
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        if len(vertices) < 3:
+            return None
+        x0, x1 = max(int(np.ceil(vertices[:, 0].min())), 0), min(int(np.ceil(vertices[:, 0].max())), width)
+        y0, y1 = max(int(np.ceil(vertices[:, 1].min())), 0), min(int(np.ceil(vertices[:, 1].max())), height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        xa, ya = vertices[:, 0], vertices[:, 1]
+        xb, yb = np.roll(xa, -1), np.roll(ya, -1)
+        # rows crossed by every edge, horizontal edges cross none
+        low = np.clip(np.ceil(np.minimum(ya, yb)), y0, y1).astype(np.int64)
+        high = np.clip(np.ceil(np.maximum(ya, yb)), y0, y1).astype(np.int64)
+        counts = high - low
+        edge = np.repeat(np.arange(len(vertices)), counts)
+        rows = low[edge] + np.arange(len(edge)) - np.repeat(np.cumsum(counts) - counts, counts)
+        crossX = xa[edge] + (rows - ya[edge]) * (xb[edge] - xa[edge]) / (yb[edge] - ya[edge])
+        columns = np.clip(np.ceil(crossX), x0, x1).astype(np.int64) - x0
+
+        # one toggle column past the right end of the box, for crossings right of it
+        boxWidth, boxHeight = x1 - x0 + 1, y1 - y0
+        if rowMajor:
+            index, shape, axis = (rows - y0) * boxWidth + columns, (boxHeight, boxWidth), 1
+        else:
+            index, shape, axis = columns * boxHeight + rows - y0, (boxWidth, boxHeight), 0
+        if fillRule == "evenodd":
+            # only the parity of the running sum matters, so it may wrap around in int8
+            toggles = np.bincount(index, minlength=boxWidth * boxHeight).astype(np.int8).reshape(shape)
+            mask = np.cumsum(toggles, axis=axis, dtype=np.int8) & 1 == 1
+        else:
+            toggles = np.bincount(index, np.sign(yb - ya)[edge], boxWidth * boxHeight).astype(np.int32).reshape(shape)
+            mask = np.cumsum(toggles, axis=axis, dtype=np.int32) != 0
+        return x0, x1, y0, y1, mask[:, :-1] if rowMajor else mask[:-1]
+
+    @staticmethod
+    def drawPolygon(buff: Buff, vertices: np.ndarray, color, fillRule: str = "evenodd") -> None:
+        """
+        Fill a convex or concave polygon with one color, see polygonMask for the pixels it covers
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param vertices: (N, 2) vertex coordinates, the polygon is closed from the last vertex back to the first one
+        :type vertices: numpy.ndarray
+        :param color: fill color, values should be in range [0, 1]
+        :type color: ColorType or numpy.ndarray
+        :param fillRule: "evenodd" or "nonzero"
+        :type fillRule: str
+        :rtype: None
+        """
+        if isinstance(color, ColorType):
+            color = color.getRGB()
+        covered = Rasterizer.polygonMask(vertices, buff.width, buff.height, fillRule, buff.rowMajor)
+        if covered is None:
+            return
+        x0, x1, y0, y1, mask = covered
+        Rasterizer._fillRegion(buff, x0, x1, y0, y1, color, mask)
+        buff.markDirty(x0, x1, y0, y1)
+
+    @staticmethod
+    def drawMask(buff: Buff, x0: int, x1: int, y0: int, y1: int, mask: np.ndarray, color) -> None:
+        """
+        Write one color to the pixels of a mask, like the ones from polygonMask or floodMask
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param mask: boolean mask of the box [x0, x1) x [y0, y1) in the memory order of buff, indexed \
+        [y - y0, x - x0] if buff is rowMajor, otherwise [x - x0, y - y0]
+        :type mask: numpy.ndarray
+        :param color: the color, values should be in range [0, 1]
+        :type color: ColorType or numpy.ndarray
+        :rtype: None
+        """
+        if isinstance(color, ColorType):
+            color = color.getRGB()
+        Rasterizer._fillRegion(buff, x0, x1, y0, y1, color, mask)
+        buff.markDirty(x0, x1, y0, y1)
+
+    @staticmethod
+    def floodMask(buff: Buff, x: int, y: int, tolerance: float = 0.0, connectivity: int = 4, boundary=None):
+        """
+        The region of pixels connected to x, y with the color of x, y, found by a scanline flood fill over spans.
+        A span is a run of matching pixels along a row of buff in memory order, so rows of a rowMajor Buff run along x
+        and the others along y. All spans are found at once from the changes along the rows, and for every span the
+        spans it touches in the row below form a range of the sorted spans, found with a binary search. Touching spans
+        are then joined into connected components all at once, by hooking every component onto the smallest one it
+        touches and jumping pointers to the roots, see _spanComponents. The number of Python steps grows with the
+        logarithm of the number of spans, so long winding corridors take no more steps than open areas.
+
+        :param buff: the buff to look at, it is not changed
+        :type buff: Buff
+        :param x: x of the seed pixel
+        :type x: int
+        :param y: y of the seed pixel
+        :type y: int
+        :param tolerance: largest difference in any channel from the seed color, in range [0, 1], of pixels in the \
+        region
+        :type tolerance: float
+        :param connectivity: 4 to connect pixels through their edges only, 8 to also connect them through corners
+        :type connectivity: int
+        :param boundary: fill up to pixels of this color instead, within tolerance, whatever the color of the seed
+        :type boundary: ColorType
+        :return: x0, x1, y0, y1 of the box of the region and a boolean mask of the region in it, in the memory order \
+        of buff, see drawMask. None if the seed is outside of buff or on the boundary
+        :rtype: tuple or None
+        """
+        if connectivity not in [4, 8]:
+            raise ValueError("Unknown flood fill connectivity: " + str(connectivity))
+        if x < 0 or x >= buff.width or y < 0 or y >= buff.height:
+            return None
+        pixels = buff.buff.transpose(1, 0, 2) if buff.rowMajor else buff.buff
+        seedRow, seedColumn = (y, x) if buff.rowMajor else (x, y)
+        if boundary is None:
+            reference = pixels[seedRow, seedColumn].astype(np.int64)
+        else:
+            reference = np.array(boundary.getRGB_8bit(), dtype=np.int64)
+        tolerance = int(round(tolerance * 255))
+        low = np.clip(reference - tolerance, 0, 255).astype(np.uint8)
+        high = np.clip(reference + tolerance, 0, 255).astype(np.uint8)
+        inRange = (pixels >= low) & (pixels <= high)
+        matching = inRange[:, :, 0] & inRange[:, :, 1] & inRange[:, :, 2]
+        if boundary is not None:
+            matching = ~matching
+        if not matching[seedRow, seedColumn]:
+            return None
+
+        # spans of every row, in row order, as [start, end)
+        rows, columns = matching.shape
+        changes = np.diff(np.pad(matching, ((0, 0), (1, 1))).view(np.int8), axis=1)
+        spanRows, starts = np.nonzero(changes == 1)
+        ends = np.nonzero(changes == -1)[1]
+        # sortable keys of span ends, row by row. Keys of neighbour rows never mix, because any column plus or minus
+        # one is less than rowKey away from the row
+        rowKey = columns + 2
+        startKeys = spanRows * rowKey + starts
+        endKeys = spanRows * rowKey + ends
+        reach = 1 if connectivity == 8 else 0
+        # spans j in the next row touching span i: start_j < end_i + reach and end_j > start_i - reach
+        first = np.searchsorted(endKeys, startKeys + rowKey - reach, "right")
+        counts = np.searchsorted(startKeys, endKeys + rowKey + reach, "left") - first
+        spans = np.repeat(np.arange(len(starts)), counts)
+        touching = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        roots = Rasterizer._spanComponents(len(starts), spans, touching)
+        seed = np.searchsorted(startKeys, seedRow * rowKey + seedColumn, "right") - 1
+        visited = roots == roots[seed]
+
+        spanRows, starts, ends = spanRows[visited], starts[visited], ends[visited]
+        rowMin, rowMax = int(spanRows.min()), int(spanRows.max()) + 1
+        columnMin, columnMax = int(starts.min()), int(ends.max())
+        # spans become a mask by a running sum over +1 at their starts and -1 at their ends
+        boxColumns = columnMax - columnMin + 1
+        size = (rowMax - rowMin) * boxColumns
+        toggles = (np.bincount((spanRows - rowMin) * boxColumns + starts - columnMin, minlength=size)
+                   - np.bincount((spanRows - rowMin) * boxColumns + ends - columnMin, minlength=size))
+        mask = np.cumsum(toggles.astype(np.int8).reshape(-1, boxColumns), axis=1, dtype=np.int8)[:, :-1] > 0
+        if buff.rowMajor:
+            return columnMin, columnMax, rowMin, rowMax, mask
+        return rowMin, rowMax, columnMin, columnMax, mask
+
+    @staticmethod
+    def _spanComponents(n: int, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+        In class usage only. Connected components of n spans joined by the pairs first[k], second[k], as the smallest
+        span of every component. Every round hooks the root of each pair onto the smaller root of the pair, and jumps
+        pointers until every span points to its root. Pairs inside one component are dropped, so rounds get cheaper.
+        """
+        parent = np.arange(n)
+        while len(first):
+            rootsFirst, rootsSecond = parent[first], parent[second]
+            joined = rootsFirst != rootsSecond
+            if not joined.any():
+                break
+            first, second = first[joined], second[joined]
+            rootsFirst, rootsSecond = rootsFirst[joined], rootsSecond[joined]
+            # roots only point to smaller roots, so no cycle is made whichever pair wins a root
+            parent[np.maximum(rootsFirst, rootsSecond)] = np.minimum(rootsFirst, rootsSecond)
+            while True:
+                grandparent = parent[parent]
+                if np.array_equal(grandparent, parent):
+                    break
+                parent = grandparent
+        return parent
+
+    @staticmethod
+    def floodFill(buff: Buff, x: int, y: int, color, tolerance: float = 0.0, connectivity: int = 4,
+                  boundary=None) -> int:
+        """
+        Fill the region of pixels connected to x, y with the color of x, y, see floodMask
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param color: fill color, values should be in range [0, 1]
+        :type color: ColorType or numpy.ndarray
+        :return: number of pixels filled
+        :rtype: int
+        """
+        region = Rasterizer.floodMask(buff, x, y, tolerance, connectivity, boundary)
+        if region is None:
+            return 0
+        x0, x1, y0, y1, mask = region
+        Rasterizer.drawMask(buff, x0, x1, y0, y1, mask, color)
+        return int(np.count_nonzero(mask))
+
+    @staticmethod
+    def drawTriangleScanline(buff: Buff, p1: Point, p2: Point, p3: Point, doSmooth: bool = True) -> None:
+        """
+        Scanline fill of a triangle. The outline points of all three edges are collected with Bresenham's algorithm,
+        then every row is filled by a line from its leftmost to its rightmost outline point. Colors are interpolated
+        along the edges first and then along the rows. For flat shading the first vertex color is used.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: First triangle vertex
+        :type p1: Point
+        :param p2: Second triangle vertex
+        :type p2: Point
+        :param p3: Third triangle vertex
+        :type p3: Point
+        :param doSmooth: Color smooth filling control flag
+        :type doSmooth: bool
+        :rtype: None
+        """
+        # draws out the outline of the triangle
+        Rasterizer.drawLine(buff, p1, p3, doSmooth)
+        Rasterizer.drawLine(buff, p2, p3, doSmooth)
+
+        # outline points of the edges p1-p2, p1-p3 and p2-p3, in this order. Rows outside of buff are clipped, but
+        # points left or right of buff are kept, because they are the ends of the row fills
+        edgeStarts = [p1.coords, p1.coords, p2.coords]
+        edgeEnds = [p2.coords, p3.coords, p3.coords]
+        first, last = Clipping.linesStepRanges(edgeStarts, edgeEnds, buff.width, buff.height, clipX=False)
+        xs, ys, edge, k, steps = Rasterizer.linesPixels(edgeStarts, edgeEnds, first, last)
+        inRows = (ys >= 0) & (ys < buff.height)
+        xs, ys, edge, k = xs[inRows], ys[inRows], edge[inRows], k[inRows]
+        if len(xs) == 0:
+            return
+        # leftmost and rightmost outline point of every row. The sort is stable, so on equal x the leftmost point is
+        # the first one collected and the rightmost point is the last one collected
+        order = np.lexsort((xs, ys))
+        rowYs = ys[order]
+        rowBreaks = np.flatnonzero(np.diff(rowYs)) + 1
+        first = order[np.concatenate(([0], rowBreaks))]
+        last = order[np.concatenate((rowBreaks - 1, [len(order) - 1]))]
+        filled = xs[first] != xs[last]
+        first = first[filled]
+        last = last[filled]
+
+        starts = np.stack((xs[first], ys[first]), axis=1)
+        ends = np.stack((xs[last], ys[last]), axis=1)
+        if doSmooth:
+            vertexColors = np.array([p1.color.getRGB(), p2.color.getRGB(), p3.color.getRGB()], dtype=np.float64)
+            edgeStart = vertexColors[[0, 0, 1]][edge]
+            edgeEnd = vertexColors[[1, 2, 2]][edge]
+            t = np.zeros(k.shape, dtype=np.float64)
+            np.divide(k, steps[edge], out=t, where=steps[edge] > 0)
+            t = t[:, None]
+            outlineColors = edgeStart * (1 - t) + edgeEnd * t
+            colors = np.stack((outlineColors[first], outlineColors[last]), axis=1)
+        else:
+            colors = np.tile(p1.color.getRGB(), (len(first), 1))
+        Rasterizer.drawLines(buff, starts, ends, colors, doSmooth)
+
+    @staticmethod
+    def triangleTiles(v1, v2, v3, width: int, height: int, tileSize: int = 8):
+        """
+        Find the pixels covered by a triangle with edge functions. For an edge from a to b, the edge function
+        E(x, y) = (bx - ax) * (y - ay) - (by - ay) * (x - ax) is linear, so its extreme values over a tile are at
+        the tile corners. The bounding box of the part of the triangle on width x height, from Clipping, is split into
+        tileSize x tileSize tiles: tiles fully outside an edge are skipped, tiles fully inside all edges are merged
+        into blocks along y, and only the remaining tiles are tested pixel by pixel. Pixels on an edge are covered.
+
+        :param v1: First triangle vertex coordinates
+        :type v1: tuple[int]
+        :param v2: Second triangle vertex coordinates
+        :type v2: tuple[int]
+        :param v3: Third triangle vertex coordinates
+        :type v3: tuple[int]
+        :param width: width of the target buff
+        :type width: int
+        :param height: height of the target buff
+        :type height: int
+        :param tileSize: size of the square tiles, usually 8 or 16
+        :type tileSize: int
+        :return: (M, 4) blocks [x0, x1, y0, y1) fully inside the triangle, x and y coordinates of the covered \
+        pixels in the partially covered tiles, the (3, 3) coefficients [a, b, c] of the edge functions \
+        E(x, y) = a * x + b * y + c, where row i belongs to the edge opposite to vertex i and is positive inside, \
+        and the doubled area of the triangle
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, int]
+        """
+        vertices = np.array([v1, v2, v3], dtype=np.int64).reshape(3, 2)
+        (x1, y1), (x2, y2), (x3, y3) = vertices.tolist()
+        area = (x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1)
+
+        # edge functions of the edges opposite to v1, v2 and v3, oriented to be positive inside
+        a = -(vertices[[2, 0, 1], 1] - vertices[[1, 2, 0], 1])
+        b = vertices[[2, 0, 1], 0] - vertices[[1, 2, 0], 0]
+        c = -(a * vertices[[1, 2, 0], 0] + b * vertices[[1, 2, 0], 1])
+        if area < 0:
+            a, b, c = -a, -b, -c
+        edges = np.stack((a, b, c), axis=1)
+
+        empty = np.zeros(0, dtype=np.int64)
+        bounds = Clipping.triangleBounds(*vertices.tolist(), width, height)
+        if area == 0 or bounds is None:
+            return np.zeros((0, 4), dtype=np.int64), empty, empty, edges, abs(area)
+        xMin, xMax, yMin, yMax = bounds
+
+        # classify tiles by the edge function values at their corners
+        tileXs = np.arange(xMin, xMax + 1, tileSize)
+        tileYs = np.arange(yMin, yMax + 1, tileSize)
+        far = tileSize - 1
+        outside = np.zeros((len(tileXs), len(tileYs)), dtype=bool)
+        inside = np.ones((len(tileXs), len(tileYs)), dtype=bool)
+        for ea, eb, ec in edges.tolist():
+            lowX = tileXs + (far if ea < 0 else 0)
+            lowY = tileYs + (far if eb < 0 else 0)
+            highX = tileXs + (far if ea > 0 else 0)
+            highY = tileYs + (far if eb > 0 else 0)
+            outside |= (ea * highX[:, None] + eb * highY[None, :] + ec) < 0
+            inside &= (ea * lowX[:, None] + eb * lowY[None, :] + ec) >= 0
+        partial = ~outside & ~inside
+
+        # runs of inside tiles in the same column of tiles become one block
+        padded = np.pad(inside, ((0, 0), (1, 1)))
+        runStarts = np.argwhere(padded[:, 1:-1] & ~padded[:, :-2])
+        runEnds = np.argwhere(padded[:, 1:-1] & ~padded[:, 2:])
+        blocks = np.stack((tileXs[runStarts[:, 0]],
+                           np.minimum(tileXs[runStarts[:, 0]] + tileSize, xMax + 1),
+                           tileYs[runStarts[:, 1]],
+                           np.minimum(tileYs[runEnds[:, 1]] + tileSize, yMax + 1)), axis=1)
+
+        # test every pixel of the partially covered tiles
+        partialX, partialY = np.nonzero(partial)
+        local = np.arange(tileSize)
+        xs = (tileXs[partialX][:, None, None] + local[None, :, None]).repeat(tileSize, axis=2).ravel()
+        ys = (tileYs[partialY][:, None, None] + local[None, None, :]).repeat(tileSize, axis=1).ravel()
+        covered = (xs <= xMax) & (ys <= yMax)
+        for ea, eb, ec in edges.tolist():
+            covered &= (ea * xs + eb * ys + ec) >= 0
+        return blocks, xs[covered], ys[covered], edges, abs(area)
+
+    @staticmethod
+    def trianglePixels(v1, v2, v3, width: int, height: int, tileSize: int = 8):
+        """
+        All pixels covered by a triangle, the blocks from triangleTiles are expanded to single pixels
+
+        :param v1: First triangle vertex coordinates
+        :type v1: tuple[int]
+        :param v2: Second triangle vertex coordinates
+        :type v2: tuple[int]
+        :param v3: Third triangle vertex coordinates
+        :type v3: tuple[int]
+        :param width: width of the target buff
+        :type width: int
+        :param height: height of the target buff
+        :type height: int
+        :param tileSize: size of the square tiles, usually 8 or 16
+        :type tileSize: int
+        :return: x and y coordinates of the covered pixels, the (3, 3) edge function coefficients and the doubled \
+        area of the triangle, see triangleTiles
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, int]
+        """
+        blocks, xs, ys, edges, area = Rasterizer.triangleTiles(v1, v2, v3, width, height, tileSize)
+        allXs = [xs]
+        allYs = [ys]
+        for x0, x1, y0, y1 in blocks.tolist():
+            blockXs, blockYs = np.mgrid[x0:x1, y0:y1]
+            allXs.append(blockXs.ravel())
+            allYs.append(blockYs.ravel())
+        return np.concatenate(allXs), np.concatenate(allYs), edges, area
+
+    @staticmethod
+    def triangleColorGradient(p1: Point, p2: Point, p3: Point, edges: np.ndarray, area: int) -> np.ndarray:
+        """
+        Barycentric color interpolation is affine in x and y, so the color at (x, y) is
+        gradient[0] * (x - x1) + gradient[1] * (y - y1) + gradient[2], where (x1, y1) are the coordinates of p1.
+        Colors are evaluated relative to p1, so they do not change with the position of the triangle on the canvas
+
+        :param p1: First triangle vertex
+        :type p1: Point
+        :param p2: Second triangle vertex
+        :type p2: Point
+        :param p3: Third triangle vertex
+        :type p3: Point
+        :param edges: (3, 3) edge function coefficients from triangleTiles
+        :type edges: numpy.ndarray
+        :param area: the doubled area of the triangle
+        :type area: int
+        :return: (3, 3) gradient, each row is an RGB color in range [0, 255]
+        :rtype: numpy.ndarray
+        """
+        vertexColors = np.array([p1.color.getRGB(), p2.color.getRGB(), p3.color.getRGB()], dtype=np.float64)
+        return Rasterizer._colorGradient(vertexColors, edges, area)
+
+    @staticmethod
+    def _colorGradient(vertexColors, edges, area):
+        """
+        In class usage only. triangleColorGradient from a (3, 3) array of vertex colors
+        """
+        return np.vstack((edges[:, :2].T @ vertexColors * (255 / area), vertexColors[0] * 255))
+
+    @staticmethod
+    def drawTriangleEdge(buff: Buff, p1: Point, p2: Point, p3: Point, doSmooth: bool = True,
+                         tileSize: int = 8) -> None:
+        """
+        Fill a triangle with edge functions evaluated over tiles of its bounding box, see triangleTiles. Blocks of fully
+        covered tiles are written with slice assignments, the rest with one indexed write. Smooth colors are
+        interpolated with barycentric coordinates, flat shading uses the first vertex color. A triangle with zero area
+        is drawn as its outline.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: First triangle vertex
+        :type p1: Point
+        :param p2: Second triangle vertex
+        :type p2: Point
+        :param p3: Third triangle vertex
+        :type p3: Point
+        :param doSmooth: Color smooth filling control flag
+        :type doSmooth: bool
+        :param tileSize: size of the square tiles, usually 8 or 16
+        :type tileSize: int
+        :rtype: None
+        """
+        coords = np.array([p1.coords, p2.coords, p3.coords], dtype=np.int64)
+        vertexColors = np.array([p1.color.getRGB(), p2.color.getRGB(), p3.color.getRGB()], dtype=np.float64)
+        Rasterizer._fillTriangleEdge(buff, coords, vertexColors, doSmooth, tileSize)
+
+    @staticmethod
+    def _fillTriangleEdge(buff, coords, vertexColors, doSmooth, tileSize):
+        """
+        In class usage only. drawTriangleEdge from a (3, 2) array of vertex coordinates and a (3, 3) array of colors
+        """
+        blocks, xs, ys, edges, area = Rasterizer.triangleTiles(coords[0], coords[1], coords[2],
+                                                               buff.width, buff.height, tileSize)
+        if area == 0:
+            Rasterizer.drawLines(buff, coords[:2], coords[1:], np.stack((vertexColors[:2], vertexColors[1:]), axis=1),
+                                 doSmooth)
+            return
+        # tiles never leave the bounding box of the triangle, which markDirty clips to buff
+        buff.markDirty(coords[:, 0].min(), coords[:, 0].max() + 1, coords[:, 1].min(), coords[:, 1].max() + 1)
+        if not doSmooth:
+            color = (vertexColors[0] * 255).astype(np.uint8)
+            for x0, x1, y0, y1 in blocks.tolist():
+                buff.buff[x0:x1, y0:y1] = color
+            buff.buff[xs, ys] = color
+            return
+
+        gradient = Rasterizer._colorGradient(vertexColors, edges, area)
+        ox, oy = coords[0].tolist()
+        for x0, x1, y0, y1 in blocks.tolist():
+            blockX = np.arange(x0 - ox, x1 - ox, dtype=np.float64)[:, None, None]
+            blockY = np.arange(y0 - oy, y1 - oy, dtype=np.float64)[None, :, None]
+            buff.buff[x0:x1, y0:y1] = (gradient[0] * blockX + gradient[1] * blockY + gradient[2]).astype(np.uint8)
+        buff.buff[xs, ys] = (gradient[0] * (xs - ox)[:, None] + gradient[1] * (ys - oy)[:, None]
+                             + gradient[2]).astype(np.uint8)
+
+    @staticmethod
+    def drawMesh(buff: Buff, vertices: np.ndarray, indices: np.ndarray, colors: np.ndarray, doSmooth: bool = True,
+                 chunkPixels: int = 1 << 22) -> None:
+        """
+        Rasterize an indexed triangle list in one call, with depth test against buff.depth. A pixel (x, y) is covered
+        by a triangle if it is inside or on all three edges. Depth and color are interpolated with barycentric
+        coordinates, and a fragment is only kept if it is strictly nearer than what buff.depth already holds, so the
+        result doesn't depend on the order of triangles except for exact depth ties, where the earlier one wins.
+
+        Fragments are generated from the bounding boxes of as many triangles as fit in chunkPixels and resolved with
+        vectorized compares, so the number of Python calls depends on the mesh size only through the chunk count.
+
+        :param buff: The buff to edit. Its depth buffer is created if it doesn't exist yet
+        :type buff: Buff
+        :param vertices: (N, 3) vertices in screen space, x and y in pixels and z as depth, smaller is nearer
+        :type vertices: numpy.ndarray
+        :param indices: (M, 3) vertex indices of the triangles
+        :type indices: numpy.ndarray
+        :param colors: (N, 3) vertex colors, values should be in range [0, 1]
+        :type colors: numpy.ndarray
+        :param doSmooth: Color smooth filling control flag. Triangles use their first vertex color if not set
+        :type doSmooth: bool
+        :param chunkPixels: maximum number of bounding box pixels processed together
+        :type chunkPixels: int
+        :rtype: None
+        """
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        if buff.depth is None:
+            buff.clearDepth()
+
+        triangles = vertices[indices]
+        tx = triangles[:, :, 0]
+        ty = triangles[:, :, 1]
+        area = (tx[:, 1] - tx[:, 0]) * (ty[:, 2] - ty[:, 0]) - (ty[:, 1] - ty[:, 0]) * (tx[:, 2] - tx[:, 0])
+        xMin = np.maximum(np.ceil(tx.min(axis=1)), 0).astype(np.int64)
+        xMax = np.minimum(np.floor(tx.max(axis=1)), buff.width - 1).astype(np.int64)
+        yMin = np.maximum(np.ceil(ty.min(axis=1)), 0).astype(np.int64)
+        yMax = np.minimum(np.floor(ty.max(axis=1)), buff.height - 1).astype(np.int64)
+        boxWidths = np.maximum(xMax - xMin + 1, 0)
+        boxHeights = np.maximum(yMax - yMin + 1, 0)
+        boxSizes = np.where(area != 0, boxWidths * boxHeights, 0)
+        visible = np.flatnonzero(boxSizes)
+        if len(visible) == 0:
+            return
+
+        # barycentric coordinate i is the edge function of the edge opposite to vertex i divided by the area,
+        # written as a * x + b * y + c per triangle. Coverage is tested before the division, so it is exact for
+        # integer vertices and pixels on an edge are always covered
+        coefficients = np.empty((len(triangles), 3, 3), dtype=np.float64)
+        for i, (j, k) in enumerate([(1, 2), (2, 0), (0, 1)]):
+            coefficients[:, i, 0] = -(ty[:, k] - ty[:, j])
+            coefficients[:, i, 1] = tx[:, k] - tx[:, j]
+            coefficients[:, i, 2] = -(coefficients[:, i, 0] * tx[:, j] + coefficients[:, i, 1] * ty[:, j])
+        coefficients *= np.sign(area)[:, None, None]
+        areaSizes = np.abs(area)
+
+        # start a new chunk every time the bounding box pixels add up to chunkPixels
+        chunkIds = (np.cumsum(boxSizes[visible]) - 1) // chunkPixels
+        chunkBreaks = np.flatnonzero(np.diff(chunkIds)) + 1
+        for chunk in np.split(visible, chunkBreaks):
+            sizes = boxSizes[chunk]
+            triangle = np.repeat(chunk, sizes)
+            local = np.arange(triangle.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            heights = boxHeights[triangle]
+            px = local // heights
+            py = local - px * heights
+            px += xMin[triangle]
+            py += yMin[triangle]
+
+            # test one edge at a time, so later edges are only evaluated for pixels inside the earlier ones
+            weights = []
+            for i in range(3):
+                weight = coefficients[triangle, i, 0] * px + coefficients[triangle, i, 1] * py \
+                    + coefficients[triangle, i, 2]
+                covered = weight >= 0
+                triangle, px, py, weight = triangle[covered], px[covered], py[covered], weight[covered]
+                weights = [w[covered] for w in weights] + [weight]
+            weights = np.stack(weights, axis=1) / areaSizes[triangle][:, None]
+
+            z = np.einsum("ij,ij->i", weights, triangles[triangle, :, 2]).astype(np.float32)
+            nearer = z < buff.depth[px, py]
+            triangle, px, py, weights, z = triangle[nearer], px[nearer], py[nearer], weights[nearer], z[nearer]
+            if triangle.size == 0:
+                continue
+
+            # nearest fragment of every pixel goes to the depth buffer, on a tie the earlier fragment wins
+            pixel = px * buff.height + py
+            depth = buff.depth.reshape(-1)
+            np.minimum.at(depth, pixel, z)
+            nearest = np.flatnonzero(z == depth[pixel])
+            first = np.full(depth.size, len(z), dtype=np.int64)
+            np.minimum.at(first, pixel[nearest], nearest)
+            winner = nearest[first[pixel[nearest]] == nearest]
+
+            px, py, triangle = px[winner], py[winner], triangle[winner]
+            if doSmooth:
+                fragmentColors = np.einsum("ij,ijk->ik", weights[winner], colors[indices[triangle]])
+            else:
+                fragmentColors = colors[indices[triangle, 0]]
+            buff.buff[px, py] = (fragmentColors * 255).astype(np.uint8)
+            buff.markDirtyPixels(px, py)
+
+    @staticmethod
+    def drawTriangles(buff: Buff, v1: np.ndarray, v2: np.ndarray, v3: np.ndarray, colors: np.ndarray,
+                      doSmooth: bool = True, tileSize: int = 8, meshPixels: int = 2048) -> None:
+        """
+        Fill many triangles on buff straight from arrays, with the same result as calling drawTriangleEdge for every
+        triangle in order. Consecutive triangles with a bounding box of at most meshPixels pixels are drawn together
+        by drawMesh, with later triangles given nearer depths so they win the pixels they share with earlier ones.
+        Depth is resolved in a temporary depth buffer over their bounding box, buff.depth is not used. Larger
+        triangles, and triangles with zero area, are filled one at a time like in drawTriangleEdge, where whole tiles
+        are written with slice assignments.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param v1: (N, 2) integer first vertices of the triangles
+        :type v1: numpy.ndarray
+        :param v2: (N, 2) integer second vertices
+        :type v2: numpy.ndarray
+        :param v3: (N, 2) integer third vertices
+        :type v3: numpy.ndarray
+        :param colors: (N, 3, 3) colors of the three vertices of every triangle, values should be in range [0, 1]
+        :type colors: numpy.ndarray
+        :param doSmooth: Color smooth filling control flag, triangles use their first vertex color if not set
+        :type doSmooth: bool
+        :param tileSize: size of the square tiles of large triangles, usually 8 or 16
+        :type tileSize: int
+        :param meshPixels: largest bounding box, in pixels, of a triangle drawn by drawMesh
+        :type meshPixels: int
+        :rtype: None
+        """
+        coords = np.stack((v1, v2, v3), axis=1).astype(np.int64)
+        colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3, 3)
+        n = len(coords)
+        if n == 0:
+            return
+        edge1 = coords[:, 1] - coords[:, 0]
+        edge2 = coords[:, 2] - coords[:, 0]
+        area = edge1[:, 0] * edge2[:, 1] - edge1[:, 1] * edge2[:, 0]
+        boxSizes = np.prod(coords.max(axis=1) - coords.min(axis=1) + 1, axis=1)
+        small = (area != 0) & (boxSizes <= meshPixels)
+        # runs of small triangles go to drawMesh together, every other triangle on its own
+        breaks = np.flatnonzero(small[1:] != small[:-1]) + 1
+        for start, stop in zip([0] + breaks.tolist(), breaks.tolist() + [n]):
+            if small[start]:
+                Rasterizer._drawTriangleRun(buff, coords[start:stop], colors[start:stop], doSmooth)
+                continue
+            for i in range(start, stop):
+                Rasterizer._fillTriangleEdge(buff, coords[i], colors[i], doSmooth, tileSize)
+
+    @staticmethod
+    def _drawTriangleRun(buff, coords, colors, doSmooth):
+        """
+        In class usage only. Triangles with nonzero area drawn in order by drawMesh on a view of their bounding box
+        """
+        x0, y0 = np.maximum(coords.reshape(-1, 2).min(axis=0), 0)
+        x1, y1 = np.minimum(coords.reshape(-1, 2).max(axis=0) + 1, buff.size)
+        if x0 >= x1 or y0 >= y1:
+            return
+        region = buff.view(int(x0), int(x1), int(y0), int(y1))
+        region.takeDirtyRects()
+        n = len(coords)
+        vertices = np.empty((n, 3, 3), dtype=np.float64)
+        vertices[:, :, :2] = coords - [x0, y0]
+        vertices[:, :, 2] = (n - np.arange(n))[:, None]
+        Rasterizer.drawMesh(region, vertices.reshape(-1, 3), np.arange(3 * n).reshape(n, 3), colors.reshape(-1, 3),
+                            doSmooth)
+        for rx0, rx1, ry0, ry1 in region.takeDirtyRects():
+            buff.markDirty(rx0 + x0, rx1 + x0, ry0 + y0, ry1 + y0)
+
+    @staticmethod
+    def textureCoords(point: Point, width: int, height: int):
+        """
+        Texture coordinates of a vertex, normalized to [0, 1] as Buff.sampleTexture expects. A vertex without texture
+        coordinates gets its position on a width x height canvas, so the texture is stretched over the canvas.
+
+        :param point: the vertex
+        :type point: Point
+        :param width: canvas width
+        :type width: int
+        :param height: canvas height
+        :type height: int
+        :rtype: tuple[float]
+        """
+        if point.texture is not None:
+            return tuple(point.texture)
+        return point.coords[0] / width, point.coords[1] / height
+
+    @staticmethod
+    def drawTriangleTexture(buff: Buff, p1: Point, p2: Point, p3: Point, texture: Buff, filterMode: str = "nearest",
+                            wrapMode: str = "repeat", tileSize: int = 8, textureCoords=None,
+                            doMipmap: bool = True) -> None:
+        """
+        Fill a triangle with a texture. Texture coordinates of all covered pixels are interpolated at once with
+        barycentric coordinates, and the texels are read from the texture in one batched lookup. Texture coordinates
+        are affine over the triangle, so a single mip level is chosen from their screen space derivatives.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: First triangle vertex
+        :type p1: Point
+        :param p2: Second triangle vertex
+        :type p2: Point
+        :param p3: Third triangle vertex
+        :type p3: Point
+        :param texture: the texture to sample from
+        :type texture: Buff
+        :param filterMode: texture filter, see Buff.sampleTexture
+        :type filterMode: str
+        :param wrapMode: texture wrap mode, see Buff.sampleTexture
+        :type wrapMode: str
+        :param tileSize: size of the square tiles, usually 8 or 16
+        :type tileSize: int
+        :param textureCoords: (3, 2) texture coordinates of the vertices. Taken from textureCoords of the vertices \
+        on buff if not given
+        :type textureCoords: numpy.ndarray
+        :param doMipmap: sample from the mip pyramid of texture when the triangle is minified
+        :type doMipmap: bool
+        :rtype: None
+        """
+        xs, ys, edges, area = Rasterizer.trianglePixels(p1.coords, p2.coords, p3.coords,
+                                                        buff.width, buff.height, tileSize)
+        if area == 0 or len(xs) == 0:
+            return
+        if textureCoords is None:
+            textureCoords = [Rasterizer.textureCoords(p, buff.width, buff.height) for p in (p1, p2, p3)]
+        # texture coordinates are affine in x and y, like the colors in triangleColorGradient, and relative to p1
+        textureCoords = np.asarray(textureCoords, dtype=np.float64)
+        gradient = edges[:, :2].T @ textureCoords / area
+        ox, oy = p1.coords
+        u = gradient[0, 0] * (xs - ox) + gradient[1, 0] * (ys - oy) + textureCoords[0, 0]
+        v = gradient[0, 1] * (xs - ox) + gradient[1, 1] * (ys - oy) + textureCoords[0, 1]
+        lod = None
+        if doMipmap:
+            lod = texture.mipmapLevel(gradient[0, 0], gradient[0, 1], gradient[1, 0], gradient[1, 1])
+        buff.buff[xs, ys] = texture.sampleTexture(u, v, filterMode, wrapMode, lod)
+        buff.markDirtyPixels(xs, ys)
+
+    @staticmethod
+    def supersample(buff: Buff, level: int, bounds, drawBand, bandPixels: int = 1 << 22) -> None:
+        """
+        Supersampling anti-aliasing over a region of buff. The region is processed in horizontal bands: every band is
+        upsampled level times in x and y into a temporary Buff, drawBand draws into it at the high resolution, and the
+        band is box-filtered back into buff with one reshape-mean. Memory is bounded by bandPixels high resolution
+        pixels instead of the whole upsampled frame.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param level: super sampling level, each pixel is sampled level x level times
+        :type level: int
+        :param bounds: region (xMin, xMax, yMin, yMax) of buff to process, bounds included
+        :type bounds: tuple[int]
+        :param drawBand: called as drawBand(bandBuff, xOffset, yOffset), where high resolution pixel (x, y) of the \
+        whole frame is at (x - xOffset, y - yOffset) of bandBuff. It must ignore pixels out of bandBuff
+        :type drawBand: function
+        :param bandPixels: maximum number of high resolution pixels of one band
+        :type bandPixels: int
+        :rtype: None
+        """
+        xMin, xMax, yMin, yMax = bounds
+        xMin = max(int(xMin), 0)
+        xMax = min(int(xMax), buff.width - 1)
+        yMin = max(int(yMin), 0)
+        yMax = min(int(yMax), buff.height - 1)
+        if xMin > xMax or yMin > yMax:
+            return
+        width = xMax - xMin + 1
+        rows = max(1, bandPixels // (width * level * level))
+        for y0 in range(yMin, yMax + 1, rows):
+            y1 = min(y0 + rows, yMax + 1)
+            region = buff.buff[xMin:xMax + 1, y0:y1]
+            band = Buff(width * level, (y1 - y0) * level)
+            band.buff = region.repeat(level, axis=0).repeat(level, axis=1)
+            drawBand(band, xMin * level, y0 * level)
+            filtered = band.buff.reshape(width, level, y1 - y0, level, 3).mean(axis=(1, 3))
+            region[...] = np.rint(filtered).astype(np.uint8)
+            buff.markDirty(xMin, xMax + 1, y0, y1)
+
+    @staticmethod
+    def drawLineSSAA(buff: Buff, p1: Point, p2: Point, doSmooth: bool = True, level: int = 4) -> None:
+        """
+        Draw an anti-aliased line with supersampling. At the high resolution the line is drawn level pixels thick,
+        so after filtering it keeps the weight of a one pixel wide line.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: One end point of the line
+        :type p1: Point
+        :param p2: Another end point of the line
+        :type p2: Point
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :param level: super sampling level
+        :type level: int
+        :rtype: None
+        """
+        if level <= 1:
+            Rasterizer.drawLine(buff, p1, p2, doSmooth)
+            return
+        (x1, y1), (x2, y2) = p1.coords, p2.coords
+        # pixel centers at the high resolution, clipped to buff with room for the thickness
+        ends = (x1 * level + level // 2, y1 * level + level // 2, x2 * level + level // 2, y2 * level + level // 2)
+        stepRange = Clipping.lineStepRange(*ends, buff.width * level, buff.height * level, level)
+        if stepRange is None:
+            return
+        xs, ys, steps = Rasterizer.linePixels(*ends, *stepRange)
+        colors = Rasterizer.lineColors(p1.color, p2.color, steps, doSmooth, *stepRange)
+        colors = np.broadcast_to(colors, (len(xs), 3))
+        thickness = np.arange(level) - level // 2
+        if abs(x2 - x1) >= abs(y2 - y1):
+            ys = (ys[:, None] + thickness).ravel()
+            xs = xs.repeat(level)
+        else:
+            xs = (xs[:, None] + thickness).ravel()
+            ys = ys.repeat(level)
+        colors = colors.repeat(level, axis=0)
+
+        def drawBand(band, xOffset, yOffset):
+            bandXs = xs - xOffset
+            bandYs = ys - yOffset
+            inBand = (bandXs >= 0) & (bandXs < band.width) & (bandYs >= 0) & (bandYs < band.height)
+            band.buff[bandXs[inBand], bandYs[inBand]] = colors[inBand]
+
+        Rasterizer.supersample(buff, level, ((xs.min() - level) // level, (xs.max() + level) // level,
+                                             (ys.min() - level) // level, (ys.max() + level) // level), drawBand)
+
+    @staticmethod
+    def lineWuPixels(x1: int, y1: int, x2: int, y2: int, first: int = 0, last: int = None):
+        """
+        Pixels and coverage of an anti-aliased line with Xiaolin Wu's algorithm. At every step along the major axis
+        the exact line passes between two pixels of the minor axis, and each of them is covered by one minus its
+        distance to the line. End points are integer, so they are on pixel centers and need no end gap weighting.
+        Only steps first to last are computed if they are given, like in linePixels.
+
+        :param x1: x coordinate of the start point
+        :type x1: int
+        :param y1: y coordinate of the start point
+        :type y1: int
+        :param x2: x coordinate of the end point
+        :type x2: int
+        :param y2: y coordinate of the end point
+        :type y2: int
+        :param first: first step to compute
+        :type first: int
+        :param last: last step to compute, the last step of the line if None
+        :type last: int
+        :return: x coordinates, y coordinates, coverage in (0, 1], the step index of every pixel and the number of \
+        steps of the line
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, int]
+        """
+        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+        steep = abs(y2 - y1) > abs(x2 - x1)
+        if steep:
+            x1, y1, x2, y2 = y1, x1, y2, x2
+        major = abs(x2 - x1)
+        k = np.arange(first, major + 1 if last is None else last + 1, dtype=np.int64)
+        gradient = (y2 - y1) / major if major > 0 else 0.0
+        # offsets from y1 do not depend on where the line is on the canvas
+        offset = gradient * k
+        lower = np.floor(offset)
+        upperCoverage = offset - lower
+        lower = y1 + lower.astype(np.int64)
+        majorCoords = x1 + np.sign(x2 - x1) * k
+
+        steps = np.concatenate((k, k))
+        xs = np.concatenate((majorCoords, majorCoords))
+        ys = np.concatenate((lower, lower + 1)).astype(np.int64)
+        coverage = np.concatenate((1 - upperCoverage, upperCoverage))
+        # on the pixel center exactly, the second pixel is not covered at all
+        covered = coverage > 0
+        xs, ys, coverage, steps = xs[covered], ys[covered], coverage[covered], steps[covered]
+        if steep:
+            xs, ys = ys, xs
+        return xs, ys, coverage, steps, major
+
+    @staticmethod
+    def drawLineWu(buff: Buff, p1: Point, p2: Point, doSmooth: bool = True) -> None:
+        """
+        Draw an anti-aliased line with Xiaolin Wu's algorithm. The line color is blended into buff with the coverage
+        of every pixel as alpha, all pixels of the line at once.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: One end point of the line
+        :type p1: Point
+        :param p2: Another end point of the line
+        :type p2: Point
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :rtype: None
+        """
+        stepRange = Clipping.lineStepRange(*p1.coords, *p2.coords, buff.width, buff.height)
+        if stepRange is None:
+            return
+        xs, ys, coverage, k, steps = Rasterizer.lineWuPixels(*p1.coords, *p2.coords, *stepRange)
+        inside = (xs >= 0) & (xs < buff.width) & (ys >= 0) & (ys < buff.height)
+        xs, ys, coverage, k = xs[inside], ys[inside], coverage[inside, None], k[inside]
+
+        start = np.array(p1.color.getRGB(), dtype=np.float64) * 255
+        if doSmooth and steps > 0:
+            t = (k / steps)[:, None]
+            colors = start * (1 - t) + np.array(p2.color.getRGB(), dtype=np.float64) * 255 * t
+        else:
+            colors = start
+        buff.buff[xs, ys] = np.rint(buff.buff[xs, ys] * (1 - coverage) + colors * coverage).astype(np.uint8)
+        buff.markDirtyPixels(xs, ys)
+
+    @staticmethod
+    def drawTriangleSSAA(buff: Buff, p1: Point, p2: Point, p3: Point, doSmooth: bool = True, level: int = 4,
+                         texture: Buff = None, filterMode: str = "nearest") -> None:
+        """
+        Draw an anti-aliased triangle with supersampling, each band is filled by drawTriangleEdge, or by
+        drawTriangleTexture if a texture is given. Every triangle is filtered on its own, so an edge shared by two
+        triangles is blended with what was below it twice.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: First triangle vertex
+        :type p1: Point
+        :param p2: Second triangle vertex
+        :type p2: Point
+        :param p3: Third triangle vertex
+        :type p3: Point
+        :param doSmooth: Color smooth filling control flag
+        :type doSmooth: bool
+        :param level: super sampling level
+        :type level: int
+        :param texture: texture to fill the triangle with, or None for color filling
+        :type texture: Buff
+        :param filterMode: texture filter, see Buff.sampleTexture
+        :type filterMode: str
+        :rtype: None
+        """
+        if texture is not None:
+            # texture coordinates must come from the canvas, not from the bands
+            textureCoords = [Rasterizer.textureCoords(p, buff.width, buff.height) for p in (p1, p2, p3)]
+        if level <= 1:
+            if texture is not None:
+                Rasterizer.drawTriangleTexture(buff, p1, p2, p3, texture, filterMode, textureCoords=textureCoords)
+            else:
+                Rasterizer.drawTriangleEdge(buff, p1, p2, p3, doSmooth)
+            return
+        vertices = [p1, p2, p3]
+        xs = [p.coords[0] for p in vertices]
+        ys = [p.coords[1] for p in vertices]
+        if texture is None and (xs[1] - xs[0]) * (ys[2] - ys[0]) == (ys[1] - ys[0]) * (xs[2] - xs[0]):
+            # zero area, draw the outline like drawTriangleEdge does
+            Rasterizer.drawLineSSAA(buff, p1, p2, doSmooth, level)
+            Rasterizer.drawLineSSAA(buff, p2, p3, doSmooth, level)
+            return
+
+        def drawBand(band, xOffset, yOffset):
+            bandVertices = [Point((p.coords[0] * level + level // 2 - xOffset,
+                                   p.coords[1] * level + level // 2 - yOffset), p.color) for p in vertices]
+            if texture is not None:
+                Rasterizer.drawTriangleTexture(band, *bandVertices, texture, filterMode, textureCoords=textureCoords)
+            else:
+                Rasterizer.drawTriangleEdge(band, *bandVertices, doSmooth)
+
+        # a pixel is covered if any of its samples, up to half a pixel away, is covered, so the triangle is clipped
+        # to the canvas grown by one pixel
+        bounds = Clipping.triangleBounds(*[p.coords for p in vertices], buff.width, buff.height, 1)
+        if bounds is not None:
+            xMin, xMax, yMin, yMax = bounds
+            Rasterizer.supersample(buff, level, (xMin - 1, xMax + 1, yMin - 1, yMax + 1), drawBand)
+
+    @staticmethod
+    def drawLineReference(buff: Buff, p1: Point, p2: Point, doSmooth: bool = True) -> None:
+        """
+        The original per-pixel Bresenham implementation of drawLine. Kept as the reference output for drawLine and
+        for benchmarking, don't use it for drawing.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: One end point of the line
+        :type p1: Point
+        :param p2: Another end point of the line
+        :type p2: Point
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :rtype: None
+        """
+        x1, y1 = p1.coords
+        x2, y2 = p2.coords
+
+        dx = abs(x2 - x1)
+        dy = abs(y2 - y1)
+        sx, sy = 0, 0
+        if x1 < x2:
+            sx = 1
+        if x1 > x2:
+            sx = -1
+        if y1 < y2:
+            sy = 1
+        if y1 > y2:
+            sy = -1
+        if dx > dy:
+            if sy == -1:
+                prev_p = dx - (2 * dy)
+            else:
+                prev_p = (2 * dy) - dx
+        else:
+            if sy == -1:
+                prev_p = dy - (2 * dx)
+            else:
+                prev_p = (2 * dx) - dy
+        inc_factor = 0
+        if sy == -1:
+            if prev_p > 0:
+                inc_factor = 0
+            else:
+                inc_factor = 1
+        else:
+            if prev_p > 0:
+                inc_factor = 1
+        steps = max(dx, dy)
+        if steps == 0:
+            c = p1.color
+            buff.buff[x1, y1] = (c.r * 255, c.g * 255, c.b * 255)
+            return
+        for i in range(steps + 1):
+            t = i / steps
+            c = p1.color
+            if doSmooth:
+                c = ColorType(p1.color.r * (1 - t) + p2.color.r * t,
+                              p1.color.g * (1 - t) + p2.color.g * t,
+                              p1.color.b * (1 - t) + p2.color.b * t)
+            Rasterizer._drawPointReference(buff, Point((x1, y1), c))
+            if dx == dy:
+                x1 += sx
+                y1 += sy
+            elif dx == 0:
+                y1 += sy
+            elif dy == 0:
+                x1 += sx
+            elif dx > dy:
+                x1 += sx
+                curr_p = prev_p
+                if sy == -1:
+                    curr_p = curr_p - (2 * dy) + (2 * dx * inc_factor)
+                    if curr_p > 0:
+                        inc_factor = 0
+                    else:
+                        inc_factor = 1
+                        y1 += sy
+                else:
+                    curr_p = curr_p + (2 * dy) - (2 * dx * inc_factor)
+                    if curr_p < 0:
+                        inc_factor = 0
+                    else:
+                        inc_factor = 1
+                        y1 += sy
+                prev_p = curr_p
+            else:
+                y1 += sy
+                curr_p = prev_p
+                if sy == -1:
+                    curr_p = curr_p - (2 * dx) + (2 * dy * inc_factor)
+                    if curr_p > 0:
+                        inc_factor = 0
+                    else:
+                        inc_factor = 1
+                        x1 += sx
+                else:
+                    curr_p = curr_p + (2 * dx) - (2 * dy * inc_factor)
+                    if curr_p < 0:
+                        inc_factor = 0
+                    else:
+                        inc_factor = 1
+                        x1 += sx
+                prev_p = curr_p
+
+    @staticmethod
+    def _drawPointReference(buff, point):
+        """
+        In class usage only, the same as Sketch.drawPoint
+        """
+        x, y = point.coords
+        c = point.color
+        buff.buff[x, y, 0] = c.r * 255
+        buff.buff[x, y, 1] = c.g * 255
+        buff.buff[x, y, 2] = c.b * 255
+
+
+if __name__ == "__main__":
+    import time
+
+    # Correctness: every direction and slope, including the tie-breaks where 2 * minor == major
+    check = Buff(41, 41)
+    expect = Buff(41, 41)
+    for ex in range(41):
+        for ey in range(41):
+            for start in [(20, 20), (0, 0), (40, 13)]:
+                a = Point(start, ColorType(0.9, 0.1, 0.3))
+                b = Point((ex, ey), ColorType(0.2, 0.7, 1))
+                check.clear()
+                expect.clear()
+                Rasterizer.drawLine(check, a, b, doSmooth=True)
+                Rasterizer.drawLineReference(expect, a, b, doSmooth=True)
+                assert np.array_equal(check.buff, expect.buff), (start, ex, ey)
+    print("drawLine matches drawLineReference")
+
+    # Benchmark: line lengths from 10 to 10,000 pixels
+    for length in [10, 100, 1000, 10000]:
+        w, h = length + 1, length // 3 + 1
+        a = Point((0, 0), ColorType(1, 0, 0))
+        b = Point((length, length // 3), ColorType(0, 0, 1))
+        repeat = max(1, 20000 // length)
+        results = []
+        for drawFunc in [Rasterizer.drawLineReference, Rasterizer.drawLine]:
+            target = Buff(w, h)
+            t1 = time.perf_counter()
+            for _ in range(repeat):
+                drawFunc(target, a, b, True)
+            results.append(((time.perf_counter() - t1) / repeat, target))
+        assert np.array_equal(results[0][1].buff, results[1][1].buff)
+        print("length {:>5}: reference {:9.3f} ms, vectorized {:7.3f} ms, speedup {:7.1f}x".format(
+            length, results[0][0] * 1000, results[1][0] * 1000, results[0][0] / results[1][0]))
+
+    # Batch lines: the same output as drawLine in a loop, for wireframe-like short segments and long random ones
+    rng = np.random.default_rng(480)
+    segments = 50000
+    for name, maxLength in [("short", 16), ("long", 500)]:
+        starts = rng.integers(0, 500, (segments, 2))
+        # keep a margin, lines can overshoot their end point by one pixel
+        ends = np.clip(starts + rng.integers(-maxLength, maxLength + 1, (segments, 2)), 1, 498)
+        colors = rng.random((segments, 2, 3))
+        points = [(Point(tuple(s), ColorType(*c[0])), Point(tuple(e), ColorType(*c[1])))
+                  for s, e, c in zip(starts.tolist(), ends.tolist(), colors.tolist())]
+        loopBuff = Buff(500, 500)
+        batchBuff = Buff(500, 500)
+        t1 = time.perf_counter()
+        for a, b in points:
+            Rasterizer.drawLine(loopBuff, a, b, True)
+        t2 = time.perf_counter()
+        Rasterizer.drawLines(batchBuff, starts, ends, colors, True)
+        t3 = time.perf_counter()
+        assert np.array_equal(loopBuff.buff, batchBuff.buff)
+        print("{} {} segments: drawLine loop {:.1f} ms, drawLines {:.1f} ms, speedup {:.1f}x".format(
+            segments, name, (t2 - t1) * 1000, (t3 - t2) * 1000, (t2 - t1) / (t3 - t2)))
+
+    # Batch triangles: the same output as drawTriangleEdge in a loop, with some triangles of zero area in the batch
+    triangles = 5000
+    for doSmooth in [True, False]:
+        corners = rng.integers(-50, 550, (3, triangles, 2))
+        corners[2, ::97] = corners[1, ::97]
+        colors = rng.random((triangles, 3, 3))
+        vertices = [[Point(tuple(v), ColorType(*c)) for v, c in zip(corners[i].tolist(), colors[:, i].tolist())]
+                    for i in range(3)]
+        loopBuff = Buff(500, 500)
+        batchBuff = Buff(500, 500)
+        t1 = time.perf_counter()
+        for a, b, c in zip(*vertices):
+            Rasterizer.drawTriangleEdge(loopBuff, a, b, c, doSmooth)
+        t2 = time.perf_counter()
+        Rasterizer.drawTriangles(batchBuff, corners[0], corners[1], corners[2], colors, doSmooth)
+        t3 = time.perf_counter()
+        assert np.array_equal(loopBuff.buff, batchBuff.buff)
+        print("{} triangles, doSmooth {}: drawTriangleEdge loop {:.1f} ms, drawTriangles {:.1f} ms".format(
+            triangles, doSmooth, (t2 - t1) * 1000, (t3 - t2) * 1000))
+
+    # Triangles: scanline fill against the tiled edge function fill
+    for name, size in [("small", 10), ("medium", 100), ("large", 1000)]:
+        corners = [(0, 0), (size, size // 3), (size // 4, size)]
+        a, b, c = [Point(v, ColorType(*rng.random(3))) for v in corners]
+        repeat = max(1, 2000 // size)
+        timings = []
+        for mode, drawFunc in [("scanline", lambda target: Rasterizer.drawTriangleScanline(target, a, b, c, True)),
+                               ("edge 8x8", lambda target: Rasterizer.drawTriangleEdge(target, a, b, c, True, 8)),
+                               ("edge 16x16", lambda target: Rasterizer.drawTriangleEdge(target, a, b, c, True, 16))]:
+            target = Buff(size + 1, size + 1)
+            t1 = time.perf_counter()
+            for _ in range(repeat):
+                drawFunc(target)
+            timings.append("{} {:.3f} ms".format(mode, (time.perf_counter() - t1) / repeat * 1000))
+        print("{} triangle: {}".format(name, ", ".join(timings)))
+
+    # Supersampling anti-aliasing cost per level
+    for level in [2, 4, 8]:
+        target = Buff(500, 500)
+        a = Point((20, 30), ColorType(1, 0, 0))
+        b = Point((480, 200), ColorType(0, 1, 0))
+        c = Point((150, 470), ColorType(0, 0, 1))
+        t1 = time.perf_counter()
+        Rasterizer.drawLineSSAA(target, a, b, True, level)
+        t2 = time.perf_counter()
+        Rasterizer.drawTriangleSSAA(target, a, b, c, True, level)
+        t3 = time.perf_counter()
+        print("SSAA level {}: line {:.2f} ms, triangle {:.2f} ms".format(level, (t2 - t1) * 1000, (t3 - t2) * 1000))
+
+    # Texture mapped triangles, a fan of 96 triangles like testCaseTriTexture01 at MAX_N_STEPS
+    texture = Buff(300, 158)
+    texture.setStaticBuffArray(rng.integers(0, 256, (300, 158, 3), dtype=np.uint8))
+    fan = []
+    for i in range(96):
+        theta = 2 * np.pi * i / 96
+        delta = 2 * np.pi / 96
+        fan.append([Point((250, 250)),
+                    Point((int(250 + np.sin(theta) * 225), int(250 + np.cos(theta) * 225))),
+                    Point((int(250 + np.sin(theta + delta) * 225), int(250 + np.cos(theta + delta) * 225)))])
+    for filterMode in ["nearest", "bilinear"]:
+        target = Buff(500, 500)
+        t1 = time.perf_counter()
+        for triangle in fan:
+            Rasterizer.drawTriangleTexture(target, *triangle, texture, filterMode)
+        print("texture fan of 96 triangles, {}: {:.1f} ms".format(filterMode, (time.perf_counter() - t1) * 1000))
+
+    # Minified texture: a 16x16 quad showing the whole texture, point sampled from level 0 and from the mip pyramid
+    quad = [Point((0, 0)), Point((16, 0)), Point((16, 16)), Point((0, 16))]
+    quadCoords = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    for doMipmap in [False, True]:
+        frames = []
+        for shift in range(8):
+            # shift the texture by a fraction of a screen pixel every frame
+            coords = [(s + shift / 128, t) for s, t in quadCoords]
+            target = Buff(16, 16)
+            for i, j, k in [(0, 1, 2), (0, 2, 3)]:
+                Rasterizer.drawTriangleTexture(target, quad[i], quad[j], quad[k], texture,
+                                               textureCoords=[coords[i], coords[j], coords[k]], doMipmap=doMipmap)
+            frames.append(target.buff.astype(np.float64))
+        print("minified texture, doMipmap {}: mean change between frames {:.1f}".format(
+            doMipmap, np.mean(np.abs(np.diff(frames, axis=0)))))
+
+    # Zoomed in geometry: the same fan and triangle at 1x and at 1000x around the center, the cost follows the part
+    # that is on the canvas
+    for zoom in [1, 1000]:
+        target = Buff(500, 500)
+        ends = [(int(250 + np.sin(a) * 225 * zoom), int(250 + np.cos(a) * 225 * zoom))
+                for a in np.linspace(0, 2 * np.pi, 256, endpoint=False)]
+        t1 = time.perf_counter()
+        for end in ends:
+            Rasterizer.drawLine(target, Point((250, 250), ColorType(1, 1, 1)), Point(end, ColorType(1, 0, 0)))
+        t2 = time.perf_counter()
+        corners = [Point((int(250 + (x - 250) * zoom), int(250 + (y - 250) * zoom)), ColorType(*rng.random(3)))
+                   for x, y in [(20, 20), (480, 60), (200, 470)]]
+        Rasterizer.drawTriangleScanline(target, *corners)
+        t3 = time.perf_counter()
+        Rasterizer.drawTriangleEdge(target, *corners)
+        t4 = time.perf_counter()
+        print("zoom {:4d}: line fan {:.1f} ms, triangle scanline {:.1f} ms, edge {:.1f} ms".format(
+            zoom, (t2 - t1) * 1000, (t3 - t2) * 1000, (t4 - t3) * 1000))
+
+    # Anti-aliased lines: Wu's algorithm against supersampling, error measured against supersampling at level 16
+    lineEnds = [(int(100 + np.sin(a) * 90), int(100 + np.cos(a) * 90))
+                for a in np.linspace(0, np.pi, 24, endpoint=False)]
+    lineColor = ColorType(1, 0.8, 0.3)
+
+    def drawFan(drawOne):
+        target = Buff(200, 200)
+        t1 = time.perf_counter()
+        for end in lineEnds:
+            drawOne(target, Point((200 - end[0], 200 - end[1]), lineColor), Point(end, lineColor))
+        return target.buff.astype(np.float64), time.perf_counter() - t1
+
+    reference, _ = drawFan(lambda b, p, q: Rasterizer.drawLineSSAA(b, p, q, True, 16))
+    image, seconds = drawFan(Rasterizer.drawLineWu)
+    print("AA line fan, Wu: {:.2f} ms, mean error {:.2f}".format(seconds * 1000, np.abs(image - reference).mean()))
+    for level in [2, 4, 8]:
+        image, seconds = drawFan(lambda b, p, q: Rasterizer.drawLineSSAA(b, p, q, True, level))
+        print("AA line fan, SSAA level {}: {:.2f} ms, mean error {:.2f}".format(
+            level, seconds * 1000, np.abs(image - reference).mean()))
+
+    # Concave polygons with thousands of vertices, and flood fills of an open, a maze-like, a noisy and a serpentine 4
+    # megapixel region. The serpentine is one corridor winding across the spans, a chain of 2 million spans of 1 pixel
+    rng = np.random.default_rng(0)
+    target = Buff(2048, 2048)
+    for n in [1000, 10000]:
+        angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        radii = 600 + 300 * np.sin(7 * angles) + rng.uniform(0, 20, n)
+        star = np.stack((1024 + radii * np.cos(angles), 1024 + radii * np.sin(angles)), axis=1)
+        t1 = time.perf_counter()
+        Rasterizer.drawPolygon(target, star, (1, 0, 0))
+        print("concave polygon of {} vertices: {:.1f} ms".format(n, (time.perf_counter() - t1) * 1000))
+    xs, ys = np.mgrid[0:2048, 0:2048]
+    rings = np.hypot(xs - 1024, ys - 1024).astype(int) % 20 == 0
+    rings &= (np.arctan2(ys - 1024, xs - 1024) * 40).astype(int) % 7 != 0
+    serpentine = np.zeros((2048, 2048), dtype=bool)
+    serpentine[:, 1::2] = True
+    serpentine[2047, 1::4] = False
+    serpentine[0, 3::4] = False
+    for name, walls in [("open", None), ("rings", rings), ("20% noise", rng.random((2048, 2048)) < 0.2),
+                        ("serpentine", serpentine)]:
+        target.clear()
+        if walls is not None:
+            target.buff[walls] = 255
+        t1 = time.perf_counter()
+        filled = Rasterizer.floodFill(target, 1024, 1030, (0, 1, 0))
+        print("flood fill, {}: {} pixels in {:.1f} ms".format(name, filled, (time.perf_counter() - t1) * 1000))
@@ -0,0 +1,644 @@
+"""
+Drawing methods and test cases of Sketch, with no dependency on wxPython or OpenGL. Sketch adds the display window and
+the mouse and keyboard interrupts on top of it, and HeadlessSketch renders the test cases into a Buff without a display.
+First version Created on 10/18/2026
+"""
+
+import os
+
+import math
+import numpy as np
+
+from Buff import Buff
+from Point import Point
+from ColorType import ColorType
+from PointBatch import PointBatch
+from Rasterizer import Rasterizer
+from CommandList import CommandList
+
+try:
+    # From pip package "Pillow"
+    from PIL import Image
+except Exception:
+    print("Need to install PIL package. Pip package name is Pillow")
+    raise ImportError
+
+
+class SketchBase:
+    """
+    Drawing methods work on any Buff given to them. Test cases draw on self.buff, which has to be set by the subclass.
+
+    Class Variable Explanation:
+
+    * debug(int): Define debug level for log printing
+
+        * 0 for stable version, minimum log is printed
+        * 1 will print general logs for lines and triangles
+        * 2 will print more details and do some type checking, which might be helpful in debugging
+
+    * texture(Buff): loaded texture in Buff instance
+    * random_color(bool): Control flag of random color generation of point.
+    * doTexture(bool): Control flag of doing texture mapping
+    * doSmooth(bool): Control flag of doing smooth
+    * doAA(bool): Control flag of doing anti-aliasing
+    * doAAlevel(int): anti-alising super sampling level
+    * lineAAMode(str): anti-aliasing of lines, "wu" (Xiaolin Wu's algorithm) or "ssaa" (super sampling)
+    * triangleMode(str): triangle fill engine, "scanline" or "edge" (tiled edge functions)
+    * tileSize(int): tile size of the "edge" triangle fill engine
+    * textureFilter(str): texture filter of texture mapping, "nearest" or "bilinear"
+    * doMipmap(bool): Control flag of sampling minified textures from the mip pyramid
+    * commandCache(dict): recorded test cases by test case index, n_steps and buff size
+    * maxCachedCommandLists(int): size limit of commandCache, the oldest recording is dropped first
+    * layers(LayerStack): layers composited into buff, test cases go to layer "scene". None to draw on buff directly
+    * fillTolerance(float): largest channel difference from the seed color of pixels flood filled, in range [0, 1]
+    * fillConnectivity(int): 4 or 8, flood fill through pixel edges only or also through corners
+
+    Method Instruction:
+
+    * loadTestCases: fill test_case_list
+    * loadTexture: load texture_file_path into texture
+    * drawPoint: method to draw a point
+    * drawLine: method to draw a line
+    * drawLines: method to draw many lines in one call
+    * drawTriangle: method to draw a triangle with filling and smoothing
+    * drawPolyline, drawPolygon, drawRectangle: methods to draw a chain of lines, a filled polygon or rectangle
+    * drawMesh: method to draw an indexed triangle list with depth test
+    * recordTestCase: record the draw calls of a test case into a CommandList
+    * showTestCase: draw the current test case on buff from its recorded draw calls
+    * drawOnLayer: draw recorded draw calls on one of the layers and composite them into buff
+    * floodFill: fill the region of pixels connected to a point with its color
+    * floodFillOnLayer: flood fill a region of buff as displayed, on one of the layers
+
+    drawPoint, drawLine and drawTriangle also accept PointBatch instead of Point, and draw one primitive per entry.
+    Given a CommandList instead of a Buff, drawPoint, drawLine, drawLines and drawTriangle record the call into it.
+    """
+
+    buff = None
+
+    debug = 0
+    texture_file_path = "./pattern.jpg"
+    texture = None
+
+    # control flags
+    randomColor = False
+    doTexture = False
+    doSmooth = False
+    doAA = False
+    doAAlevel = 4
+    lineAAMode = "wu"
+    triangleMode = "scanline"
+    tileSize = 8
+    textureFilter = "nearest"
+    doMipmap = True
+    commandCache = None
+    maxCachedCommandLists = 32
+    layers = None
+    fillTolerance = 0.0
+    fillConnectivity = 4
+
+    # test case status
+    MIN_N_STEPS = 6
+    MAX_N_STEPS = 192
+    n_steps = 12  # For test case only
+    test_case_index = 0
+    test_case_list = []  # If you need more test case, write them as a method and add it to list
+
+    def loadTestCases(self):
+        """
+        Fill test_case_list with the test cases, every one of them accepts one argument, n_steps
+        """
+        self.test_case_list = [lambda _: self.clear(),
+                               self.testCaseLine01,
+                               self.testCaseLine02,
+                               self.testCaseTri01,
+                               self.testCaseTri02,
+                               self.testCaseTriTexture01]  # method at here must accept one argument, n_steps
+
+    def loadTexture(self):
+        """
+        Load texture file at texture_file_path to Buff
+        """
+        # Try to read texture file
+        if os.path.isfile(self.texture_file_path):
+            # Read image and make it to an ndarray
+            texture_image = Image.open(self.texture_file_path)
+            texture_array = np.array(texture_image).astype(np.uint8)
+            # Because imported image is upside down, reverse it
+            texture_array = np.flip(texture_array, axis=0)
+            # Store texture image in our Buff format
+            self.texture = Buff(texture_array.shape[1], texture_array.shape[0])
+            self.texture.setStaticBuffArray(np.transpose(texture_array, (1, 0, 2)))
+            if self.debug > 0:
+                print("Texture Loaded with shape: ", texture_array.shape)
+                print("Texture Buff have size: ", self.texture.size)
+        else:
+            raise ImportError("Cannot import texture file")
+
+    def clear(self):
+        """
+        clear buff, and all layers if layers are used
+        """
+        if self.layers is None:
+            self.buff.clear()
+            return
+        self.layers.clear()
+        self.layers.composite()
+
+    def recordTestCase(self, index: int, n_steps: int) -> CommandList:
+        """
+        Run a test case with a CommandList of the size of buff in place of buff, so its draw calls are recorded
+        instead of drawn
+
+        :param index: index of the test case in test_case_list
+        :type index: int
+        :param n_steps: n_steps passed to the test case
+        :type n_steps: int
+        :rtype: CommandList
+        """
+        buff = self.buff
+        self.buff = CommandList(buff.width, buff.height)
+        try:
+            self.test_case_list[index](n_steps)
+            return self.buff
+        finally:
+            self.buff = buff
+
+    def showTestCase(self):
+        """
+        Clear buff and draw test case test_case_index with n_steps on it. The draw calls of a test case are recorded
+        once for every n_steps and buff size and kept in commandCache, then replayed with the current anti-aliasing
+        flags, so changing those only rasterizes the test case again. With layers, only layer "scene" is cleared and
+        drawn again, the other layers are kept.
+        """
+        if self.commandCache is None:
+            self.commandCache = {}
+        key = (self.test_case_index, self.n_steps, self.buff.width, self.buff.height)
+        commands = self.commandCache.pop(key, None)
+        if commands is None:
+            commands = self.recordTestCase(self.test_case_index, self.n_steps)
+        self.commandCache[key] = commands
+        if len(self.commandCache) > self.maxCachedCommandLists:
+            del self.commandCache[next(iter(self.commandCache))]
+        if self.layers is None:
+            self.clear()
+            commands.replay(self, self.buff, doAA=self.doAA, doAAlevel=self.doAAlevel)
+            return
+        self.layers.clear("scene")
+        self.drawOnLayer("scene", commands)
+
+    def drawOnLayer(self, name: str, commands: CommandList) -> None:
+        """
+        Draw recorded draw calls over layer name of layers with the current anti-aliasing flags, and composite the
+        rectangles they changed into buff. Without layers they are drawn on buff.
+
+        :param name: layer name
+        :type name: str
+        :param commands: the draw calls
+        :type commands: CommandList
+        :rtype: None
+        """
+        if self.layers is None:
+            commands.replay(self, self.buff, doAA=self.doAA, doAAlevel=self.doAAlevel)
+            return
+        self.layers.draw(name, self, commands, doAA=self.doAA, doAAlevel=self.doAAlevel)
+        self.layers.composite()
+
+    def floodFill(self, buff, point, tolerance=None, connectivity=None, boundary=None):
+        """
+        Fill the region of pixels connected to point which have its color in buff, with the color of point. Rows of
+        the region are filled span by span, see Rasterizer.floodMask.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param point: the seed pixel and the fill color
+        :type point: Point
+        :param tolerance: largest channel difference from the seed color, in range [0, 1]. fillTolerance if None
+        :type tolerance: float
+        :param connectivity: 4 or 8. fillConnectivity if None
+        :type connectivity: int
+        :param boundary: fill up to pixels of this color instead of pixels of another color than the seed
+        :type boundary: ColorType
+        :return: number of pixels filled
+        :rtype: int
+        """
+        if isinstance(buff, CommandList):
+            # the region depends on what is drawn before it
+            raise TypeError("Flood fill cannot be recorded into a CommandList")
+        if tolerance is None:
+            tolerance = self.fillTolerance
+        if connectivity is None:
+            connectivity = self.fillConnectivity
+        x, y = point.coords
+        return Rasterizer.floodFill(buff, x, y, point.color, tolerance, connectivity, boundary)
+
+    def floodFillOnLayer(self, name: str, point: Point) -> int:
+        """
+        Flood fill the region around point in buff as it is displayed, with all layers composited, and draw the fill
+        on layer name of layers. Without layers the fill is drawn on buff.
+
+        :param name: layer name
+        :type name: str
+        :param point: the seed pixel and the fill color
+        :type point: Point
+        :return: number of pixels filled
+        :rtype: int
+        """
+        if self.layers is None:
+            return self.floodFill(self.buff, point)
+        x, y = point.coords
+        region = Rasterizer.floodMask(self.buff, x, y, self.fillTolerance, self.fillConnectivity)
+        if region is None:
+            return 0
+        self.layers.drawMask(name, *region, point.color)
+        self.layers.composite()
+        return int(np.count_nonzero(region[4]))
+
+    def queryTextureBuffPoint(self, texture: Buff, x: int, y: int) -> Point:
+        """
+        Query a point at texture buff, should only be used in texture buff query
+
+        :param texture: The texture buff you want to query from
+        :type texture: Buff
+        :param x: The query point x coordinate
+        :type x: int
+        :param y: The query point y coordinate
+        :type y: int
+        :rtype: Point
+        """
+        if self.debug > 1:
+            if x != min(max(0, int(x)), texture.width - 1):
+                print("Warning: Texture Query x coordinate outbound")
+            if y != min(max(0, int(y)), texture.height - 1):
+                print("Warning: Texture Query y coordinate outbound")
+        return Point((x, y), ColorType(*(texture.getPixel(x, y) / 255)))
+
+    @staticmethod
+    def drawPoint(buff, point):
+        """
+        Draw a point on buff, points outside of buff are not drawn
+
+        :param buff: The buff to draw point on, or a CommandList to record it
+        :type buff: Buff
+        :param point: A point to draw on buff, or a batch of points
+        :type point: Point or PointBatch
+        :rtype: None
+        """
+        if isinstance(buff, CommandList):
+            buff.addPoints(point)
+            return
+        if isinstance(point, PointBatch):
+            Rasterizer.drawPoints(buff, point.coords, point.colors)
+            return
+        x, y = point.coords
+        if x < 0 or x >= buff.width or y < 0 or y >= buff.height:
+            # clipped, negative indices would wrap around to the other side of buff
+            return
+        c = point.color
+        # because we have already specified buff.buff has data type uint8, type conversion will be done in numpy
+        buff.buff[x, y, 0] = c.r * 255
+        buff.buff[x, y, 1] = c.g * 255
+        buff.buff[x, y, 2] = c.b * 255
+        buff.markDirty(x, x + 1, y, y + 1)
+
+    def drawLine(self, buff, p1, p2, doSmooth=True, doAA=False, doAAlevel=4):
+        """
+        Draw a line between p1 and p2 on buff
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: One end point of the line, or the first end points of a batch of lines
+        :type p1: Point or PointBatch
+        :param p2: Another end point of the line, or the other end points of a batch of lines
+        :type p2: Point or PointBatch
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :param doAA: Control flag of doing anti-aliasing
+        :type doAA: bool
+        :param doAAlevel: anti-aliasing super sampling level, used when lineAAMode is "ssaa"
+        :type doAAlevel: int
+        :rtype: None
+        """
+        ##### TODO 1: Use Bresenham algorithm to draw a line between p1 and p2 on buff.
+        # Requirements:
+        #   1. Only integer is allowed in interpolate point coordinates between p1 and p2
+        #   2. Float number is allowed in interpolate point color
+
+        if isinstance(buff, CommandList):
+            buff.addLines(p1, p2, doSmooth, doAA, doAAlevel)
+            return
+        if isinstance(p1, PointBatch):
+            if doAA:
+                for i in range(len(p1)):
+                    self.drawLine(buff, p1[i], p2[i], doSmooth, doAA, doAAlevel)
+            else:
+                Rasterizer.drawLines(buff, p1.coords, p2.coords, np.stack((p1.colors, p2.colors), axis=1), doSmooth)
+            return
+        if doAA and self.lineAAMode == "wu":
+            # coverage of the two pixels nearest to the line at every step, blended into buff
+            Rasterizer.drawLineWu(buff, p1, p2, doSmooth)
+            return
+        if doAA and self.lineAAMode == "ssaa":
+            # supersampled at doAAlevel times the resolution, and filtered down in bands
+            Rasterizer.drawLineSSAA(buff, p1, p2, doSmooth, doAAlevel)
+            return
+        if doAA:
+            raise ValueError("Unknown line anti-aliasing mode: " + str(self.lineAAMode))
+        # Bresenham's algorithm evaluated for all pixels at once, see Rasterizer.linePixels.
+        # The per-pixel version is kept as Rasterizer.drawLineReference
+        Rasterizer.drawLine(buff, p1, p2, doSmooth)
+
+    def drawLines(self, buff, starts, ends, colors, doSmooth=True):
+        """
+        Draw many lines on buff in one call. Pixels of all lines are computed together and written to buff in one
+        pass, the result is the same as calling drawLine for each line in order.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param starts: (N, 2) integer start points of the lines
+        :type starts: numpy.ndarray or list
+        :param ends: (N, 2) integer end points of the lines
+        :type ends: numpy.ndarray or list
+        :param colors: (N, 2, 3) start and end colors of every line, or (N, 3) for a single color per line. \
+        Values should be in range [0, 1]
+        :type colors: numpy.ndarray or list
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :rtype: None
+        """
+        if isinstance(buff, CommandList):
+            buff.addLineArrays(starts, ends, colors, doSmooth, self.doAAlevel)
+            return
+        Rasterizer.drawLines(buff, starts, ends, colors, doSmooth)
+
+    def drawTriangle(self, buff, p1, p2, p3, doSmooth=True, doAA=False, doAAlevel=4, doTexture=False, mode=None):
+        """
+        draw Triangle to buff. apply smooth color filling if doSmooth set to true, otherwise fill with first point color
+        if doAA is true, apply anti-aliasing to triangle based on doAAlevel given.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param p1: First triangle vertex, or first vertices of a batch of triangles
+        :param p2: Second triangle vertex, or second vertices of a batch of triangles
+        :param p3: Third triangle vertex, or third vertices of a batch of triangles
+        :type p1: Point or PointBatch
+        :type p2: Point or PointBatch
+        :type p3: Point or PointBatch
+        :param doSmooth: Color smooth filling control flag
+        :type doSmooth: bool
+        :param doAA: Anti-aliasing control flag
+        :type doAA: bool
+        :param doAAlevel: Anti-aliasing super sampling level
+        :type doAAlevel: int
+        :param doTexture: Draw triangle with texture control flag
+        :type doTexture: bool
+        :param mode: Fill engine, "scanline" or "edge". Use triangleMode if not given
+        :type mode: str
+        :rtype: None
+        """
+        ##### TODO 2: Write a triangle rendering function, which support smooth bilinear interpolation of the vertex color
+        ##### TODO 3(For CS680 Students): Implement texture-mapped fill of triangle. Texture is stored in self.texture
+        # Requirements:
+        #   1. For flat shading of the triangle, use the first vertex color.
+        #   2. Polygon scan fill algorithm and the use of barycentric coordinate are not allowed in this function
+        #   3. You should be able to support both flat shading and smooth shading, which is controlled by doSmooth
+        #   4. For texture-mapped fill of triangles, it should be controlled by doTexture flag.
+
+        if isinstance(buff, CommandList):
+            buff.addTriangles(p1, p2, p3, doSmooth, doAA, doAAlevel, doTexture)
+            return
+        if mode is None:
+            mode = self.triangleMode
+        if isinstance(p1, PointBatch):
+            if not doAA and not doTexture and mode == "edge":
+                # filled straight from the arrays of the batch, with the same pixels as the loop below
+                Rasterizer.drawTriangles(buff, p1.coords, p2.coords, p3.coords,
+                                         np.stack((p1.colors, p2.colors, p3.colors), axis=1), doSmooth, self.tileSize)
+                return
+            for i in range(len(p1)):
+                self.drawTriangle(buff, p1[i], p2[i], p3[i], doSmooth, doAA, doAAlevel, doTexture, mode)
+            return
+        texture = self.texture if doTexture else None
+        if doAA:
+            # supersampling fills the high resolution bands with the edge function engine
+            Rasterizer.drawTriangleSSAA(buff, p1, p2, p3, doSmooth, doAAlevel, texture, self.textureFilter)
+        elif texture is not None:
+            # texture coordinates of all covered pixels interpolated at once, then one batched texel lookup. Vertices
+            # without texture coordinates are mapped by their position on the canvas
+            Rasterizer.drawTriangleTexture(buff, p1, p2, p3, texture, self.textureFilter, tileSize=self.tileSize,
+                                           doMipmap=self.doMipmap)
+        elif mode == "scanline":
+            # outline points collected with Bresenham's algorithm, then each row filled from its leftmost to its
+            # rightmost outline point
+            Rasterizer.drawTriangleScanline(buff, p1, p2, p3, doSmooth)
+        elif mode == "edge":
+            Rasterizer.drawTriangleEdge(buff, p1, p2, p3, doSmooth, self.tileSize)
+        else:
+            raise ValueError("Unknown triangle fill mode: " + str(mode))
+
+    def drawMesh(self, buff, vertices, indices, colors, doSmooth=True):
+        """
+        Draw an indexed triangle list on buff in one call. Visibility is resolved per pixel with the depth buffer kept
+        in buff.depth, which is reset by buff.clear() or buff.clearDepth().
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param vertices: (N, 3) vertices, x and y in pixels and z as depth, smaller is nearer
+        :type vertices: numpy.ndarray
+        :param indices: (M, 3) vertex indices of the triangles
+        :type indices: numpy.ndarray
+        :param colors: (N, 3) vertex colors, values should be in range [0, 1]
+        :type colors: numpy.ndarray
+        :param doSmooth: Color smooth filling control flag
+        :type doSmooth: bool
+        :rtype: None
+        """
+        Rasterizer.drawMesh(buff, vertices, indices, colors, doSmooth)
+
+    def drawPolyline(self, buff, points, closed=False, doSmooth=True):
+        """
+        Draw lines through the points in order, all segments rasterized together by drawLines
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param points: vertices of the polyline
+        :type points: list[Point] or PointBatch
+        :param closed: also draw a line from the last point back to the first one
+        :type closed: bool
+        :param doSmooth: Control flag of color smooth interpolation
+        :type doSmooth: bool
+        :rtype: None
+        """
+        if not isinstance(points, PointBatch):
+            points = PointBatch.fromPoints(points)
+        if isinstance(buff, CommandList):
+            ends = np.roll(np.arange(len(points)), -1)[:len(points) if closed else -1]
+            starts = np.arange(len(ends))
+            buff.addLineArrays(points.coords[starts], points.coords[ends],
+                               np.stack((points.colors[starts], points.colors[ends]), axis=1), doSmooth,
+                               self.doAAlevel)
+            return
+        Rasterizer.drawPolyline(buff, points.coords, points.colors, closed, doSmooth)
+
+    def drawPolygon(self, buff, points, fillRule="evenodd"):
+        """
+        Fill a convex or concave polygon with the color of its first vertex. Rows of the polygon are filled span by
+        span with an even-odd or nonzero scanline rule, see Rasterizer.polygonMask.
+
+        :param buff: The buff to edit
+        :type buff: Buff
+        :param points: vertices of the polygon in order, it is closed from the last vertex back to the first one
+        :type points: list[Point] or PointBatch
+        :param fillRule: "evenodd" or "nonzero"
+        :type fillRule: str
+        :rtype: None
+        """
+        if isinstance(buff, CommandList):
+            # commands store up to three vertices, a polygon can have any number of them
+            raise TypeError("Polygons cannot be recorded into a CommandList")
+        if not isinstance(points, PointBatch):
+            points = PointBatch.fromPoints(points)
+        if len(points) == 0:
+            return
+        Rasterizer.drawPolygon(buff, points.coords, points.colors[0], fillRule)
+
+    # drawRectangle for lab 1
+    def drawRectangle(self, buff, p1, p2, doSmooth=True, doAA=False, doAAlevel=4):
+        """
+        Fill the rectangle with corners p1 and p2, both included, with the color of p1 in one slice assignment
+
+        :param buff: The buff to edit, or a CommandList to record it
+        :type buff: Buff
+        :param p1: One corner of the rectangle
+        :type p1: Point
+        :param p2: The opposite corner of the rectangle
+        :type p2: Point
+        :rtype: None
+        """
+        if isinstance(buff, CommandList):
+            buff.addRectangles(p1, p2)
+            return
+        x1, y1 = p1.coords
+        x2, y2 = p2.coords
+        Rasterizer.drawRectangle(buff, x1, y1, x2, y2, p1.color)
+    # test for lines lines in all directions
+    def testCaseLine01(self, n_steps):
+        center_x = int(self.buff.width / 2)
+        center_y = int(self.buff.height / 2)
+        radius = int(min(self.buff.width, self.buff.height) * 0.45)
+
+        # all lines of the fan are collected first and rasterized together
+        v0 = [center_x, center_y]
+        starts, ends, colors = [], [], []
+        for step in range(0, n_steps):
+            theta = math.pi * step / n_steps
+            v1 = [center_x + int(math.sin(theta) * radius), center_y + int(math.cos(theta) * radius)]
+            v2 = [center_x - int(math.sin(theta) * radius), center_y - int(math.cos(theta) * radius)]
+            c1 = (0, 0, (1 - step / n_steps))
+            c2 = (0, (1 - step / n_steps), 0)
+            starts += [v2, v0]
+            ends += [v0, v1]
+            colors += [(c2, (1, 1, 0)), ((1, 1, 0), c1)]
+        self.drawLines(self.buff, starts, ends, colors, doSmooth=True)
+
+    # test for lines: drawing circle and petal 
+    def testCaseLine02(self, n_steps):
+        n_steps = 2 * n_steps
+        d_theta = 2 * math.pi / n_steps
+        d_petal = 12 * math.pi / n_steps
+        cx = int(self.buff.width / 2)
+        cy = int(self.buff.height / 2)
+        radius = (0.75 * min(cx, cy))
+        p = radius * 0.25
+
+        # Outer petals
+        for i in range(n_steps + 2):
+            self.drawLine(self.buff,
+                          Point((math.floor(0.5 + radius * math.sin(d_theta * i) + p * math.sin(d_petal * i)) + cx,
+                                 math.floor(0.5 + radius * math.cos(d_theta * i) + p * math.cos(d_petal * i)) + cy),
+                                ColorType(1, (128 + math.sin(d_theta * i * 5) * 127) / 255,
+                                          (128 + math.cos(d_theta * i * 5) * 127) / 255)),
+                          Point((math.floor(
+                              0.5 + radius * math.sin(d_theta * (i + 1)) + p * math.sin(d_petal * (i + 1))) + cx,
+                                 math.floor(0.5 + radius * math.cos(d_theta * (i + 1)) + p * math.cos(
+                                     d_petal * (i + 1))) + cy),
+                                ColorType(1, (128 + math.sin(d_theta * 5 * (i + 1)) * 127) / 255,
+                                          (128 + math.cos(d_theta * 5 * (i + 1)) * 127) / 255)),
+                          doSmooth=True, doAA=self.doAA, doAAlevel=self.doAAlevel)
+
+        # Draw circle
+        for i in range(n_steps + 1):
+            v0 = Point((math.floor(0.5 * radius * math.sin(d_theta * i)) + cx,
+                        math.floor(0.5 * radius * math.cos(d_theta * i)) + cy), ColorType(1, 97. / 255, 0))
+            v1 = Point((math.floor(0.5 * radius * math.sin(d_theta * (i + 1))) + cx,
+                        math.floor(0.5 * radius * math.cos(d_theta * (i + 1))) + cy), ColorType(1, 97. / 255, 0))
+            self.drawLine(self.buff, v0, v1, doSmooth=True, doAA=self.doAA, doAAlevel=self.doAAlevel)
+
+    # test for smooth filling triangle
+    def testCaseTri01(self, n_steps):
+        n_steps = int(n_steps / 2)
+        delta = 2 * math.pi / n_steps
+        radius = int(min(self.buff.width, self.buff.height) * 0.45)
+        cx = int(self.buff.width / 2)
+        cy = int(self.buff.height / 2)
+        theta = 0
+
+        for _ in range(n_steps):
+            theta += delta
+            v0 = Point((cx, cy), ColorType(1, 1, 1))
+            v1 = Point((int(cx + math.sin(theta) * radius), int(cy + math.cos(theta) * radius)),
+                       ColorType((127. + 127. * math.sin(theta)) / 255,
+                                 (127. + 127. * math.sin(theta + 2 * math.pi / 3)) / 255,
+                                 (127. + 127. * math.sin(theta + 4 * math.pi / 3)) / 255))
+            v2 = Point((int(cx + math.sin(theta + delta) * radius), int(cy + math.cos(theta + delta) * radius)),
+                       ColorType((127. + 127. * math.sin(theta + delta)) / 255,
+                                 (127. + 127. * math.sin(theta + delta + 2 * math.pi / 3)) / 255,
+                                 (127. + 127. * math.sin(theta + delta + 4 * math.pi / 3)) / 255))
+            self.drawTriangle(self.buff, v1, v0, v2, False, self.doAA, self.doAAlevel)
+
+    def testCaseTri02(self, n_steps):
+        # Test case for no smooth color filling triangle
+        n_steps = int(n_steps / 2)
+        delta = 2 * math.pi / n_steps
+        radius = int(min(self.buff.width, self.buff.height) * 0.45)
+        cx = int(self.buff.width / 2)
+        cy = int(self.buff.height / 2)
+        theta = 0
+
+        for _ in range(n_steps):
+            theta += delta
+            v0 = Point((cx, cy), ColorType(1, 1, 1))
+            v1 = Point((int(cx + math.sin(theta) * radius), int(cy + math.cos(theta) * radius)),
+                       ColorType((127. + 127. * math.sin(theta)) / 255,
+                                 (127. + 127. * math.sin(theta + 2 * math.pi / 3)) / 255,
+                                 (127. + 127. * math.sin(theta + 4 * math.pi / 3)) / 255))
+            v2 = Point((int(cx + math.sin(theta + delta) * radius), int(cy + math.cos(theta + delta) * radius)),
+                       ColorType((127. + 127. * math.sin(theta + delta)) / 255,
+                                 (127. + 127. * math.sin(theta + delta + 2 * math.pi / 3)) / 255,
+                                 (127. + 127. * math.sin(theta + delta + 4 * math.pi / 3)) / 255))
+            self.drawTriangle(self.buff, v0, v1, v2, True, self.doAA, self.doAAlevel)
+
+    def testCaseTriTexture01(self, n_steps):
+        # Test case for no smooth color filling triangle
+        n_steps = int(n_steps / 2)
+        delta = 2 * math.pi / n_steps
+        radius = int(min(self.buff.width, self.buff.height) * 0.45)
+        cx = int(self.buff.width / 2)
+        cy = int(self.buff.height / 2)
+        theta = 0
+
+        triangleList = []
+        for _ in range(n_steps):
+            theta += delta
+            v0 = Point((cx, cy), ColorType(1, 1, 1))
+            v1 = Point((int(cx + math.sin(theta) * radius), int(cy + math.cos(theta) * radius)),
+                       ColorType((127. + 127. * math.sin(theta)) / 255,
+                                 (127. + 127. * math.sin(theta + 2 * math.pi / 3)) / 255,
+                                 (127. + 127. * math.sin(theta + 4 * math.pi / 3)) / 255))
+            v2 = Point((int(cx + math.sin(theta + delta) * radius), int(cy + math.cos(theta + delta) * radius)),
+                       ColorType((127. + 127. * math.sin(theta + delta)) / 255,
+                                 (127. + 127. * math.sin(theta + delta + 2 * math.pi / 3)) / 255,
+                                 (127. + 127. * math.sin(theta + delta + 4 * math.pi / 3)) / 255))
+            triangleList.append([v0, v1, v2])
+
+        for t in triangleList:
+            self.drawTriangle(self.buff, *t, doTexture=True)
@@ -11,7 +11,6 @@ from Displayable import Displayable
 from GLBuffer import VAO, VBO, EBO
 import numpy as np
 import ColorType
-from collada import *
 
 try:
     import OpenGL
@@ -39,7 +38,80 @@ except ImportError:
     raise ImportError("Required dependency PyOpenGL not present")
 
 
+class SharedMesh:
+    """
+    Geometry of one mesh on the graphic card: a VAO, a VBO and an EBO. The vertices are uploaded unscaled, and the
+    vertex colors are left unused, because scale and color are uniforms set for every draw. It keeps no reference to
+    its shader program, which keeps its shared meshes, so both are freed together when the program is dropped.
+    """
+    vao = None
+    vbo = None
+    ebo = None
+
+    vertices = None
+    indices = None
+
+    initialized = False
+
+    def __init__(self, shaderProg, vertexData, indexData):
+        """
+        :param shaderProg: compiled shader program
+        :type shaderProg: GLProgram
+        :param vertexData: 11 floats per vertex: position, normal, color and texture coordinates
+        :type vertexData: numpy.ndarray
+        :param indexData: 3 vertex indices per triangle
+        :type indexData: numpy.ndarray
+        """
+        shaderProg.use()
+
+        self.vao = VAO()
+        self.vbo = VBO()  # vbo can only be initiate with glProgram activated
+        self.ebo = EBO()
+
+        self.vertices = vertexData
+        self.indices = indexData
+        self.initialized = False
+
+    def initialize(self, shaderProg):
+        """
+        Upload the buffers, only the first time it is called. Remember to bind VAO before this initialization. If VAO
+        is not bind, program might throw an error in systems that don't enable a default VAO after GLProgram compilation
+
+        :param shaderProg: the shader program the mesh was created with
+        :type shaderProg: GLProgram
+        """
+        if self.initialized:
+            return
+        self.vao.bind()
+        self.vbo.setBuffer(self.vertices, 11)
+        self.ebo.setBuffer(self.indices)
+
+        self.vbo.setAttribPointer(shaderProg.getAttribLocation("vertexPos"),
+                                  stride=11, offset=0, attribSize=3)
+        self.vbo.setAttribPointer(shaderProg.getAttribLocation("vertexNormal"),
+                                  stride=11, offset=3, attribSize=3) # unused
+        self.vbo.setAttribPointer(shaderProg.getAttribLocation("vertexColor"),
+                                  stride=11, offset=6, attribSize=3) # unused
+        self.vbo.setAttribPointer(shaderProg.getAttribLocation("vertexTexture"),
+                                  stride=11, offset=9, attribSize=2) # unused
+
+        self.vao.unbind()
+        self.initialized = True
+
+    def draw(self):
+        self.vao.bind()
+        self.ebo.draw()
+        self.vao.unbind()
+
+
 class DisplayableMesh(Displayable):
+    """
+    A mesh with its own scale and color. Meshes created with the same meshKey and shader program draw the same
+    SharedMesh, kept in shaderProg.meshes, so the graphic card holds one copy of every distinct mesh however many
+    components use it. The shared meshes live as long as their program, which is compiled again with every new GL
+    context.
+    """
+    mesh = None
     vao = None
     vbo = None
     ebo = None
@@ -48,66 +120,51 @@ class DisplayableMesh(Displayable):
     vertices = None  # array to store vertex information
     indices = None  # stores triangle indices to vertices
 
+    scale = None
     defaultColor = None
 
-    def __init__(self, shaderProg, scale, vertexData, indexData, color=ColorType.BLUE):
+    def __init__(self, shaderProg, scale, vertexData, indexData, color=ColorType.BLUE, meshKey=None):
         """
         :param shaderProg: compiled shader program
         :type shaderProg: GLProgram
         :param scale: set of three scale factors to be applied to each vertex
         :type scale: list or tuple
-        :param filename: .dae file to import
-        :type filename: string
-        :param color: vertex color to be applied uniformly
+        :param vertexData: 11 floats per vertex: position, normal, color and texture coordinates
+        :type vertexData: numpy.ndarray
+        :param indexData: 3 vertex indices per triangle
+        :type indexData: numpy.ndarray
+        :param color: color to be applied uniformly
         :type color: ColorType
+        :param meshKey: name of the geometry, like the path of its asset, to share it with other meshes. The geometry
+            is not shared if None
+        :type meshKey: str
         """
         super(DisplayableMesh, self).__init__()
         assert(len(scale) == 3)
 
         self.defaultColor = np.array(color.getRGB())
-
+        self.scale = np.array(scale, dtype=np.float32)
         self.shaderProg = shaderProg
-        self.shaderProg.use()
 
-        self.vao = VAO()
-        self.vbo = VBO()  # vbo can only be initiate with glProgram activated
-        self.ebo = EBO()
-
-        self.indices = indexData
-        self.vertices = vertexData
-
-        for i in range(len(self.vertices) // 11):
-            i = i * 11
-            self.vertices[i] = self.vertices[i] * scale[0]
-            self.vertices[i + 1] = self.vertices[i + 1] * scale[1]
-            self.vertices[i + 2] = self.vertices[i + 2] * scale[2]
-            self.vertices[i + 5] = self.defaultColor[0]
-            self.vertices[i + 6] = self.defaultColor[1]
-            self.vertices[i + 7] = self.defaultColor[2]
+        if meshKey is None:
+            self.mesh = SharedMesh(shaderProg, vertexData, indexData)
+        else:
+            if meshKey not in shaderProg.meshes:
+                shaderProg.meshes[meshKey] = SharedMesh(shaderProg, vertexData, indexData)
+            self.mesh = shaderProg.meshes[meshKey]
+        self.vao = self.mesh.vao
+        self.vbo = self.mesh.vbo
+        self.ebo = self.mesh.ebo
+        self.vertices = self.mesh.vertices
+        self.indices = self.mesh.indices
 
     def draw(self):
-        self.vao.bind()
-        self.ebo.draw()
-        self.vao.unbind()
+        # the color is set by Component.draw
+        self.shaderProg.setVec3("meshScale", self.scale)
+        self.mesh.draw()
 
     def initialize(self):
         """
-        Remember to bind VAO before this initialization. If VAO is not bind, program might throw an error
-        in systems that don't enable a default VAO after GLProgram compilation
+        Upload the geometry if no other mesh sharing it did yet
         """
-        self.vao.bind()
-        self.vbo.setBuffer(self.vertices, 11)
-        self.ebo.setBuffer(self.indices)
-        
-        self.vbo.setAttribPointer(self.shaderProg.getAttribLocation("vertexPos"),
-                                  stride=11, offset=0, attribSize=3)
-        self.vbo.setAttribPointer(self.shaderProg.getAttribLocation("vertexNormal"),
-                                  stride=11, offset=3, attribSize=3) # unused
-        self.vbo.setAttribPointer(self.shaderProg.getAttribLocation("vertexColor"),
-                                  stride=11, offset=6, attribSize=3)
-        self.vbo.setAttribPointer(self.shaderProg.getAttribLocation("vertexTexture"),
-                                  stride=11, offset=9, attribSize=2) # unused
-
-
-        self.vao.unbind()
-
+        self.mesh.initialize(self.shaderProg)
@@ -53,6 +53,7 @@ class GLProgram:
     vertexShaderSource = None
     fragmentShaderSource = None
     attribs = None
+    meshes = None  # SharedMesh of every meshKey drawn with this program, see DisplayableMesh
 
     vs = None  # vertex shader
     fs = None  # Fragment shader
@@ -64,6 +65,7 @@ class GLProgram:
         self.program = gl.glCreateProgram()
 
         self.ready = False
+        self.meshes = {}
 
         # define attribs name and corresponding method to set it
         self.attribs = {
@@ -81,7 +83,8 @@ class GLProgram:
             "vertexJoints": "joint",
             "vertexJointWeights" : "jw",
 
-            "currentColor": "cColor"
+            "currentColor": "cColor",
+            "meshScale": "mScale"
         }
 
         self.vertexShaderSource = self.genVertexShaderSource()
@@ -121,11 +124,13 @@ class GLProgram:
         uniform mat4 {self.attribs["projectionMat"]};
         uniform mat4 {self.attribs["viewMat"]};
         uniform mat4 {self.attribs["modelMat"]};
+        uniform vec3 {self.attribs["meshScale"]};
         
         void main()
         {{
-            gl_Position = {self.attribs["projectionMat"]} * {self.attribs["viewMat"]} * {self.attribs["modelMat"]} * vec4({self.attribs["vertexPos"]}, 1.0);
-            vPos = vec3({self.attribs["modelMat"]} * vec4({self.attribs["vertexPos"]}, 1.0));
+            vec4 scaledPos = vec4({self.attribs["vertexPos"]} * {self.attribs["meshScale"]}, 1.0);
+            gl_Position = {self.attribs["projectionMat"]} * {self.attribs["viewMat"]} * {self.attribs["modelMat"]} * scaledPos;
+            vPos = vec3({self.attribs["modelMat"]} * scaledPos);
             vColor = {self.attribs["vertexColor"]};
             vNormal = normalize(transpose(inverse({self.attribs["modelMat"]})) * vec4({self.attribs["vertexNormal"]}, 0.0) ).xyz;
             vTexture = {self.attribs["vertexTexture"]};
@@ -219,6 +224,8 @@ class GLProgram:
             raise Exception(info)
 
         self.ready = True
+        # meshes set their own scale, anything else is drawn unscaled
+        self.setVec3("meshScale", np.ones(3, dtype=np.float32))
 
     def use(self):
         """
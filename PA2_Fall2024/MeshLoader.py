@@ -0,0 +1,128 @@
+"""
+Load the triangle meshes of .dae assets into the vertex and index arrays used by DisplayableMesh.
+First version on 10/18/2026
+
+Every asset is parsed at most once per process, later loads return the same arrays. The arrays are also saved next to
+the asset in a sidecar file, asset path + ".npz", together with a hash of the asset content, so later launches read
+them back without parsing XML or importing pycollada. A sidecar is only used while its hash matches the asset.
+"""
+
+import hashlib
+import os
+import time
+
+import numpy as np
+
+
+class MeshLoader:
+    """
+    Vertices are float64 arrays of 11 floats per vertex: position, normal, color and texture coordinates, of which
+    only the position is read from the asset. Indices are int32 arrays of 3 vertex indices per triangle, flattened.
+    Returned arrays are shared and read only, copy them before changing them.
+    """
+
+    # bump this when the layout of the arrays changes, so older sidecars are parsed again
+    formatVersion = 1
+    vertexSize = 11
+    cache = {}
+
+    @staticmethod
+    def load(filename: str, useSidecar: bool = True):
+        """
+        Vertex and index arrays of the first triangle list in a .dae file
+
+        :param filename: path of the .dae file
+        :type filename: str
+        :param useSidecar: read and write the .npz sidecar of the asset
+        :type useSidecar: bool
+        :return: vertices and indices
+        :rtype: tuple[numpy.ndarray]
+        """
+        path = os.path.abspath(filename)
+        if path in MeshLoader.cache:
+            return MeshLoader.cache[path]
+
+        with open(path, "rb") as f:
+            content = f.read()
+        key = "{}:{}".format(MeshLoader.formatVersion, hashlib.sha1(content).hexdigest())
+        data = MeshLoader._readSidecar(path + ".npz", key) if useSidecar else None
+        if data is None:
+            data = MeshLoader.parse(path)
+            if useSidecar:
+                MeshLoader._writeSidecar(path + ".npz", key, *data)
+        for array in data:
+            array.flags.writeable = False
+        MeshLoader.cache[path] = data
+        return data
+
+    @staticmethod
+    def parse(filename: str):
+        """
+        Parse a .dae file with pycollada and build its arrays in one pass, without the memo or the sidecar
+
+        :param filename: path of the .dae file
+        :type filename: str
+        :return: vertices and indices
+        :rtype: tuple[numpy.ndarray]
+        """
+        # only needed when no sidecar can be used
+        from collada import Collada
+
+        triangles = Collada(filename).geometries[0].primitives[0]
+        positions = np.asarray(triangles.vertex, dtype=np.float64)
+        vertices = np.zeros((len(positions), MeshLoader.vertexSize), dtype=np.float64)
+        vertices[:, :3] = positions
+        indices = np.asarray(triangles.vertex_index, dtype=np.int32).reshape(-1)
+        return vertices.reshape(-1), indices
+
+    @staticmethod
+    def _readSidecar(sidecar, key):
+        """
+        In class usage only. The arrays in sidecar if it was written for key, otherwise None
+        """
+        try:
+            with np.load(sidecar) as data:
+                if str(data["key"]) != key:
+                    return None
+                return data["vertices"], data["indices"]
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _writeSidecar(sidecar, key, vertices, indices):
+        """
+        In class usage only. Write to a temporary file first, so a sidecar is never seen half written
+        """
+        temporary = "{}.{}.tmp".format(sidecar, os.getpid())
+        try:
+            with open(temporary, "wb") as f:
+                np.savez(f, key=np.array(key), vertices=vertices, indices=indices)
+            os.replace(temporary, sidecar)
+        except OSError:
+            # the assets may be read only, the mesh is parsed again next launch then
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+
+if __name__ == "__main__":
+    import glob
+
+    assets = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "*.dae")))
+    for filename in assets:
+        if os.path.exists(filename + ".npz"):
+            os.remove(filename + ".npz")
+
+    def loadAll():
+        t1 = time.perf_counter()
+        for filename in assets:
+            MeshLoader.load(filename)
+        return (time.perf_counter() - t1) * 1000
+
+    print("first launch, parse and write sidecars: {:.2f} ms".format(loadAll()))
+    print("same process, memo: {:.3f} ms".format(loadAll()))
+    MeshLoader.cache.clear()
+    print("later launch, read sidecars: {:.2f} ms".format(loadAll()))
+    for filename in assets:
+        vertices, indices = MeshLoader.load(filename)
+        print("{}: {} vertices, {} triangles".format(os.path.basename(filename),
+                                                    len(vertices) // MeshLoader.vertexSize, len(indices) // 3))
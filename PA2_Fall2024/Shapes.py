@@ -4,47 +4,19 @@ Implements four geometric primitives (Sphere, Cube, Cone, Cylinder) using the Di
 Modified by Daniel Scrivener 09/2023
 """
 
-from collada import *
 from DisplayableMesh import DisplayableMesh
 from Component import Component
+from MeshLoader import MeshLoader
 import GLUtility
 import ColorType
 import numpy as np
 
-def getVertexData(filename):
-
-    colladaData = Collada(filename)
-
-    # generate vertices from model data
-    # also generate indices
-
-    geo = colladaData.geometries[0]
-    tridata = geo.primitives[0]
-    trilist = list(tridata)
-
-    # construct vertex list
-    vertices = np.array([])
-    
-    for vert in tridata.vertex:
-        vert = np.concatenate((vert, [0.,0.,0.]), axis=0) # empty normals
-        vert = np.concatenate((vert, [0.,0.,0.]), axis=0) # color
-        vert = np.concatenate((vert, [0.,0.]), axis=0) # empty UV
-        vertices = np.append(vertices, vert)
-
-    # construct indices
-    indices = np.array([])
-
-    for tri in trilist:
-        indices = np.append(indices, tri.indices)
-
-    return (vertices, indices)
-
 class Shape(Component):
     vertexData = None
     indexData = None
     mesh = None
 
-    def __init__(self, position, shaderProg, size, vertexData, indexData, color=ColorType.YELLOW):
+    def __init__(self, position, shaderProg, size, vertexData, indexData, color=ColorType.YELLOW, meshKey=None):
         """
         :param position: location of the object
         :type position: Point
@@ -59,16 +31,18 @@ class Shape(Component):
         :param limb: sets the rotation behavior of the object. if true, rotations happen "at the joint" \
             rather than the object's center
         :type limb: boolean
+        :param meshKey: shapes with the same meshKey share their geometry on the graphic card, see DisplayableMesh
+        :type meshKey: string
         """
-        self.mesh = DisplayableMesh(shaderProg, size, vertexData, indexData, color)
+        self.mesh = DisplayableMesh(shaderProg, size, vertexData, indexData, color, meshKey)
         super(Shape, self).__init__(position, self.mesh)
 
 class Cone(Shape):
 
     pathname = "assets/cone0.dae"
     pathnameLP = "assets/coneLP.dae"
-    data = getVertexData(pathname)
-    dataLP = getVertexData(pathnameLP)
+    data = MeshLoader.load(pathname)
+    dataLP = MeshLoader.load(pathnameLP)
     vertices = data[0]
     verticesLP = dataLP[0]
     indices = data[1]
@@ -86,9 +60,9 @@ class Cone(Shape):
         :type color: ColorType
         """
         if lowPoly:
-            super(Cone, self).__init__(position, shaderProg, size, self.verticesLP.copy(), self.indicesLP.copy(), color)
+            super(Cone, self).__init__(position, shaderProg, size, self.verticesLP, self.indicesLP, color, self.pathnameLP)
         else:
-            super(Cone, self).__init__(position, shaderProg, size, self.vertices.copy(), self.indices.copy(), color)
+            super(Cone, self).__init__(position, shaderProg, size, self.vertices, self.indices, color, self.pathname)
 
         # translate object by -z extent of the new component so that rotations occur @ the joint
         # rather than around the object's true center
@@ -105,7 +79,7 @@ class Cone(Shape):
 class Cube(Shape):
 
     pathname = "assets/cube0.dae"
-    data = getVertexData(pathname)
+    data = MeshLoader.load(pathname)
     vertices = data[0]
     indices = data[1]
 
@@ -120,7 +94,7 @@ class Cube(Shape):
         :param color: vertex color to be applied uniformly
         :type color: ColorType
         """
-        super(Cube, self).__init__(position, shaderProg, size, self.vertices.copy(), self.indices.copy(), color)
+        super(Cube, self).__init__(position, shaderProg, size, self.vertices, self.indices, color, self.pathname)
         # translate object by -z extent of the new component so that rotations occur @ the joint
         # rather than around the object's true center
         glutility = GLUtility.GLUtility()
@@ -137,8 +111,8 @@ class Cylinder(Shape):
 
     pathname = "assets/cylinder0.dae"
     pathnameLP = "assets/cylinderLP.dae"
-    data = getVertexData(pathname)
-    dataLP = getVertexData(pathnameLP)
+    data = MeshLoader.load(pathname)
+    dataLP = MeshLoader.load(pathnameLP)
     vertices = data[0]
     verticesLP = dataLP[0]
     indices = data[1]
@@ -156,9 +130,9 @@ class Cylinder(Shape):
         :type color: ColorType
         """
         if lowPoly:
-            super(Cylinder, self).__init__(position, shaderProg, size, self.verticesLP.copy(), self.indicesLP.copy(), color)
+            super(Cylinder, self).__init__(position, shaderProg, size, self.verticesLP, self.indicesLP, color, self.pathnameLP)
         else:
-            super(Cylinder, self).__init__(position, shaderProg, size, self.vertices.copy(), self.indices.copy(), color)
+            super(Cylinder, self).__init__(position, shaderProg, size, self.vertices, self.indices, color, self.pathname)
         # translate object by -z extent of the new component so that rotations occur @ the joint
         # rather than around the object's true center
         glutility = GLUtility.GLUtility()
@@ -175,8 +149,8 @@ class Sphere(Shape):
 
     pathname = "assets/sphere0.dae"
     pathnameLP = "assets/sphereLP.dae"
-    data = getVertexData(pathname)
-    dataLP = getVertexData(pathnameLP)
+    data = MeshLoader.load(pathname)
+    dataLP = MeshLoader.load(pathnameLP)
     vertices = data[0]
     verticesLP = dataLP[0]
     indices = data[1]
@@ -198,9 +172,9 @@ class Sphere(Shape):
         :type limb: boolean
         """
         if lowPoly:
-            super(Sphere, self).__init__(position, shaderProg, size, self.verticesLP.copy(), self.indicesLP.copy(), color)
+            super(Sphere, self).__init__(position, shaderProg, size, self.verticesLP, self.indicesLP, color, self.pathnameLP)
         else:
-            super(Sphere, self).__init__(position, shaderProg, size, self.vertices.copy(), self.indices.copy(), color)
+            super(Sphere, self).__init__(position, shaderProg, size, self.vertices, self.indices, color, self.pathname)
         # translate object by -z extent of the new component so that rotations occur @ the joint
         # rather than around the object's true center   
         glutility = GLUtility.GLUtility()